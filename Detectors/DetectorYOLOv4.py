@@ -46,11 +46,14 @@ class DetectorYOLOv4(Detector):
         dataPath,
         name="YOLOv4",
         imageStrategy=None,
+        batchSize: int = 1,
     ):
         """
         Constructor
         """
         Detector.__init__(self, id=0, gpuid=0, name=name)
+        # Network batch size used by DetectBatch
+        self.batchSize = max(1, batchSize)
         # Store yolo configuartion paths
         self.config = {
             "Config": cfgPath,
@@ -119,6 +122,11 @@ class DetectorYOLOv4(Detector):
         """Returns directory name of config file."""
         return os.path.basename(os.path.dirname(self.config["Config"]))
 
+    @property
+    def model_files(self) -> list[str]:
+        """Returns paths of files defining model (config, weights, names)."""
+        return [self.config["Config"], self.config["Weights"], self.config["Names"]]
+
     @property
     def details_str(self) -> str:
         return f"{self.__class__.__name__} / {self.config_dirname} {self.netWidth}x{self.netHeight} / C{len(self.classes)}"
@@ -157,7 +165,10 @@ class DetectorYOLOv4(Detector):
 
         # YOLO net, labels, cfg
         self.net, self.classes, self.colors = darknet.load_network(
-            self.config["Config"], self.config["Names"], self.config["Weights"]
+            self.config["Config"],
+            self.config["Names"],
+            self.config["Weights"],
+            batch_size=self.batchSize,
         )
 
         # Get network  input (width and height)
@@ -168,9 +179,10 @@ class DetectorYOLOv4(Detector):
         self.__validateLabels()
 
         logging.info(
-            "(DetectorYOLOv4) Created %ux%u network with %u classes.",
+            "(DetectorYOLOv4) Created %ux%ux%u network with %u classes.",
             self.netWidth,
             self.netHeight,
+            self.batchSize,
             len(self.classes),
         )
 
@@ -565,17 +577,101 @@ class DetectorYOLOv4(Detector):
 
         # Change box coordinates to rectangle
         if boxRelative is True:
-            h, w = boundaryHeight, boundaryWidth
-            for i, d in enumerate(detections):
-                className, confidence, box = d
-                # Correct (-x, -y) value to fit inside box
-                x1, y1, x2, y2 = box
-                x1 = max(0, min(x1, w))
-                x2 = max(0, min(x2, w))
-                y1 = max(0, min(y1, h))
-                y2 = max(0, min(y2, h))
-                box = x1, y1, x2, y2
-                # Change to relative
-                detections[i] = (className, confidence, ToRelative(box, w, h))
+            detections = self.ToRelativeDetections(
+                detections, boundaryWidth, boundaryHeight
+            )
 
         return detections
+
+    def DetectBatch(
+        self,
+        frames: list[np.array],
+        confidence: float = 0.5,
+        nms_thresh: float = 0.45,
+        boxRelative: bool = False,
+        nmsMethod: NmsMethod = NmsMethod.Nms,
+        image_strategy: ImageStrategy = ImageStrategy.Rescale,
+    ) -> list[list]:
+        """Detect objects in given frames with batched forward passes."""
+        # Check : Batch supports only rescale strategies, otherwise frame by frame
+        if (self.batchSize <= 1) or (
+            image_strategy not in (ImageStrategy.Rescale, ImageStrategy.RescaleNearest)
+        ):
+            return Detector.DetectBatch(
+                self,
+                frames,
+                confidence=confidence,
+                nms_thresh=nms_thresh,
+                boxRelative=boxRelative,
+                nmsMethod=nmsMethod,
+                image_strategy=image_strategy,
+            )
+
+        interpolation = cv2.INTER_LINEAR
+        if image_strategy == ImageStrategy.RescaleNearest:
+            interpolation = cv2.INTER_NEAREST
+
+        results = []
+        for start in range(0, len(frames), self.batchSize):
+            part = frames[start : start + self.batchSize]
+
+            # Batch : Frames resized to network, rest padded with zeroes
+            batch = np.zeros(
+                (self.batchSize, self.netHeight, self.netWidth, 3), dtype=np.uint8
+            )
+            sizes = [(self.netWidth, self.netHeight)] * self.batchSize
+            for index, frame in enumerate(part):
+                if (frame.shape[1] != self.netWidth) or (
+                    frame.shape[0] != self.netHeight
+                ):
+                    frame = cv2.resize(
+                        frame,
+                        (self.netWidth, self.netHeight),
+                        interpolation=interpolation,
+                    )
+                batch[index] = frame
+                sizes[index] = (part[index].shape[1], part[index].shape[0])
+
+            # Detect objects : Single forward pass of batch
+            batchResults = darknet.detect_batch(
+                self.net, self.classes, batch, sizes, thresh=confidence
+            )
+
+            for frame, (boxes, scores, classids) in zip(part, batchResults):
+                # Ensemble detections
+                boxes, scores, classids = self.EnsembleBoxes(
+                    boxes,
+                    scores,
+                    classids,
+                    nmsMethod=nmsMethod,
+                    iou_thresh=nms_thresh,
+                    conf_thresh=confidence,
+                )
+
+                # Convert to detections
+                detections = self.ToDetections(boxes, scores, classids)
+                if boxRelative is True:
+                    detections = self.ToRelativeDetections(
+                        detections, frame.shape[1], frame.shape[0]
+                    )
+
+                results.append(detections)
+
+        return results
+
+    @staticmethod
+    def ToRelativeDetections(detections: list, w: int, h: int) -> list:
+        """Change detections boxes to relative, fitted inside (w, h)."""
+        relative = []
+        for className, confidence, box in detections:
+            # Correct (-x, -y) value to fit inside box
+            x1, y1, x2, y2 = box
+            x1 = max(0, min(x1, w))
+            x2 = max(0, min(x2, w))
+            y1 = max(0, min(y1, h))
+            y2 = max(0, min(y2, h))
+            box = x1, y1, x2, y2
+            # Change to relative
+            relative.append((className, confidence, ToRelative(box, w, h)))
+
+        return relative
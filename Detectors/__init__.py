@@ -59,7 +59,9 @@ def ListDetectors(path: Optional[str] = None) -> list[tuple[str, str, str]]:
     return detectors
 
 
-def CreateDetector(detectorID: int = 0, gpuID: int = 0, path: str = None):
+def CreateDetector(
+    detectorID: int = 0, gpuID: int = 0, path: str = None, batchSize: int = 1
+):
     """Creates detector."""
     detectors = ListDetectors(path)
     if detectorID >= len(detectors):
@@ -69,7 +71,7 @@ def CreateDetector(detectorID: int = 0, gpuID: int = 0, path: str = None):
         from Detectors.DetectorYOLOv4 import DetectorYOLOv4
 
         cfgPath, weightPath, metaPath, namesPath = detectors[detectorID]
-        return DetectorYOLOv4(cfgPath, weightPath, metaPath)
+        return DetectorYOLOv4(cfgPath, weightPath, metaPath, batchSize=batchSize)
     else:
         from Detectors.detector_yolov4_cvdnn import DetectorCVDNN
 
@@ -11,6 +11,7 @@ import numpy as np
 
 from Detectors.common.image_strategy import ImageStrategy
 from Gui.drawing import DrawDetections
+from helpers.hashing import GetFileHash
 from helpers.ensemble_boxes_nms import nms, soft_nms
 from helpers.ensemble_boxes_nmw import non_maximum_weighted
 from helpers.ensemble_boxes_wbf import weighted_boxes_fusion
@@ -44,6 +45,8 @@ class Detector:
         self.classes = []
         # Colors of labels
         self.colors = []
+        # Number of frames detected at once by DetectBatch
+        self.batchSize = 1
 
         logging.debug("(Detector) Created %u.%s!", self.id, self.name)
 
@@ -51,6 +54,17 @@ class Detector:
     def details_str(self) -> str:
         return f"{self.__class__.__name__}"
 
+    @property
+    def model_files(self) -> list[str]:
+        """Returns paths of files defining model (config, weights, names)."""
+        return []
+
+    @property
+    def signature(self) -> str:
+        """Returns signature of model, changes with content of model files."""
+        hashes = [GetFileHash(path) for path in self.model_files]
+        return f"{self.__class__.__name__}:{self.name}:{hashes}:{self.classes}"
+
     def Init(self):
         """Init call with other arguments."""
         # Default implementation
@@ -75,6 +89,28 @@ class Detector:
         """Detect objects in given image"""
         return []
 
+    def DetectBatch(
+        self,
+        frames: list[np.array],
+        confidence: float = 0.5,
+        nms_thresh: float = 0.45,
+        boxRelative: bool = False,
+        nmsMethod: NmsMethod = NmsMethod.Nms,
+        image_strategy: ImageStrategy = ImageStrategy.Rescale,
+    ) -> list[list]:
+        """Detect objects in given frames, default frame by frame."""
+        return [
+            self.Detect(
+                frame,
+                confidence=confidence,
+                nms_thresh=nms_thresh,
+                boxRelative=boxRelative,
+                nmsMethod=nmsMethod,
+                image_strategy=image_strategy,
+            )
+            for frame in frames
+        ]
+
     @staticmethod
     def EnsembleBoxes(
         boxes,
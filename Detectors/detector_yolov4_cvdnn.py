@@ -84,6 +84,16 @@ class DetectorCVDNN(Detector):
     def __del__(self):
         """Destructor."""
 
+    @property
+    def model_files(self) -> list[str]:
+        """Returns paths of files defining model (config, weights, names)."""
+        return [self.cfg_path, self.weights_path, self.names_path]
+
+    @property
+    def signature(self) -> str:
+        """Returns signature of model, with network input size."""
+        return f"{super().signature}:{self.netWidth}x{self.netHeight}"
+
     def is_initialized(self) -> bool:
         """Return True if detector is initialized."""
         return self.net is not None
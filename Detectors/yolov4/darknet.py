@@ -238,6 +238,48 @@ def detect_image(network, class_names, image, imwidth=0, imheight=0,
     return rects, scores, classids
 
 
+def detect_batch(network, class_names, images, sizes,
+                 thresh=.5, hier_thresh=.5):
+    """
+        Returns list of (rects, scores, classids) for batch of images
+        already resized to network size (batch, height, width, channels),
+        boxes are scaled to original images sizes list of (width, height).
+    """
+    batch_size, height, width, channels = images.shape
+
+    # Batch : HWC uint8 images to CHW float 0..1 data
+    data = np.ascontiguousarray(images.transpose(0, 3, 1, 2), dtype=np.float32)
+    data /= 255.0
+    image = IMAGE(width, height, channels, data.ctypes.data_as(POINTER(c_float)))
+
+    # Get detections : Relative boxes, single forward pass
+    set_batch_network(network, batch_size)
+    batch_detections = network_predict_batch(network, image, batch_size,
+                                             width, height, thresh,
+                                             hier_thresh, None, 1, 0)
+
+    results = []
+    for index, (imwidth, imheight) in enumerate(sizes):
+        num = batch_detections[index].num
+        detections = batch_detections[index].dets
+
+        # Boxes : Relative to original image size
+        for j in range(num):
+            bbox = detections[j].bbox
+            bbox.x, bbox.w = bbox.x * imwidth, bbox.w * imwidth
+            bbox.y, bbox.h = bbox.y * imheight, bbox.h * imheight
+
+        # Postprocess : Filter 0% confidences and reformat
+        rects, classids, scores = postprocess_detections(detections,
+                                                         class_names,
+                                                         num,
+                                                         confidence=0.1)
+        results.append((rects, scores, classids))
+
+    free_batch_detections(batch_detections, batch_size)
+    return results
+
+
 hasGPU = True
 if os.name == 'nt':
     cwd = os.path.dirname(__file__)
@@ -373,3 +415,6 @@ network_predict_batch = lib.network_predict_batch
 network_predict_batch.argtypes = [c_void_p, IMAGE, c_int, c_int, c_int,
                                   c_float, c_float, POINTER(c_int), c_int, c_int]
 network_predict_batch.restype = POINTER(DETNUMPAIR)
+
+set_batch_network = lib.set_batch_network
+set_batch_network.argtypes = [c_void_p, c_int]
@@ -0,0 +1,357 @@
+"""
+ BoxesTableModel.py models of annotations and detections tables, one row
+ for every box of file entries.
+
+ - Rows are kept only in arrays (file row, box index, sort keys), no
+   Python objects per box, scales to millions of boxes,
+ - cells of row are created only when row is shown (same table items
+   as were set in QTableWidget before),
+ - sort keys (class, confidence, size, ratio, area, HSV) are precomputed
+   when files are added, used by KeysSortProxyModel,
+ - removed or changed file entries drop or set only rows of their boxes,
+   keys of other boxes are not computed again,
+ - image crop tooltip is created only on hover.
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QTableWidgetItem
+
+from engine.annote import Annote
+from Gui.models.ItemsTableModel import ItemsTableModel
+from Gui.widgets.EvalTableWidgetItem import EvaluationTableWidgetItem
+from Gui.widgets.FloatTableWidgetItem import FloatTableWidgetItem
+from Gui.widgets.HsvTableWidgetItem import HsvTableWidgetItem
+from Gui.widgets.ImageTableWidgetItem import ImageTableWidgetItem
+from Gui.widgets.PercentTableWidgetItem import PercentTableWidgetItem
+from Gui.widgets.RectTableWidgetItem import RectTableWidgetItem
+from helpers.visuals import Visuals
+
+# Sort key of box index, added to file rank
+IndexBits = 20
+
+
+class BoxesTableModel(ItemsTableModel):
+    """Table model of annotations boxes of file entries."""
+
+    # File entry key of boxes list
+    entriesKey: str = "Annotations"
+    # Image crop files prefix
+    imagePrefix: str = "annotate"
+    # Columns labels
+    labels: tuple[str, ...] = (
+        "File/ID",
+        "Cat",
+        "Conf",
+        "Eval",
+        "Size",
+        "Ratio",
+        "Area",
+        "Hue",
+        "Saturation",
+        "Brightness",
+    )
+
+    def __init__(self, parent=None, cacheRows: int = 512):
+        """Constructor."""
+        super().__init__(parent, cacheRows)
+        # File entries of boxes
+        self.files: list[dict] = []
+        # File ID -> file row
+        self._rowOfID: dict[int, int] = {}
+        # Changed when file rows are removed or changed, drops filters cache
+        self._filesVersion = 0
+        # Rows count
+        self._count = 0
+        # Row -> file row, box index
+        self._fileRows = np.zeros(0, dtype=np.int32)
+        self._indexes = np.zeros(0, dtype=np.int32)
+        # Row -> sort keys, float32 for millions of rows
+        self._keys = np.zeros((0, len(self.labels)), dtype=np.float32)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Returns number of boxes."""
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Returns data of cell, created when row is shown."""
+        if not index.isValid():
+            return None
+
+        # Data : File ID and box index of every cell
+        if role == Qt.UserRole:
+            row = index.row()
+            fileEntry = self.files[self._fileRows[row]]
+            return (fileEntry["ID"], int(self._indexes[row]))
+
+        # Tooltip : Image crop, created on hover
+        if (role == Qt.ToolTipRole) and (index.column() == 0):
+            return self.Item(index).generate_tooltip()
+
+        return super().data(index, role)
+
+    def RowItems(self, row: int) -> list[QTableWidgetItem]:
+        """Returns table items of row."""
+        fileEntry = self.files[self._fileRows[row]]
+        index = int(self._indexes[row])
+        annotation: Annote = fileEntry[self.entriesKey][index]
+        visuals: Visuals = fileEntry["Visuals"]
+
+        return [
+            # Filename + Image
+            ImageTableWidgetItem(
+                imagePath=fileEntry["Path"],
+                text=f"{fileEntry['Name']}_{index}",
+                image_crop=annotation.xyxy_px(visuals.width, visuals.height),
+                image_prefix=self.imagePrefix,
+                fontSize=14,
+                fontColor=QColor("#009970"),
+                fontUnderline=True,
+            ),
+            # Category
+            QTableWidgetItem(str(annotation.className)),
+            *self.ConfidenceItems(annotation),
+            # Size
+            RectTableWidgetItem(
+                annotation.width_px(visuals.width),
+                annotation.height_px(visuals.height),
+                decimals=2,
+            ),
+            # Ratio w/h
+            FloatTableWidgetItem(annotation.ratio, decimals=2),
+            # Area
+            FloatTableWidgetItem(
+                annotation.area_px(visuals.width, visuals.height), decimals=2
+            ),
+            # Hue column
+            HsvTableWidgetItem(hue=annotation.hue, value=annotation.hue),
+            # Saturation column
+            HsvTableWidgetItem(
+                hue=300,
+                saturation=annotation.saturation,
+                brightness=255,
+                value=annotation.saturation,
+            ),
+            # Brightness column
+            HsvTableWidgetItem(
+                saturation=0,
+                brightness=annotation.brightness,
+                value=annotation.brightness,
+            ),
+        ]
+
+    @staticmethod
+    def ConfidenceItems(annotation: Annote) -> list[QTableWidgetItem]:
+        """Returns confidence columns items of box."""
+        return [
+            # Confidence of evaluation
+            PercentTableWidgetItem(annotation.evaluation_confidence, is_color=True),
+            # Evaluation
+            EvaluationTableWidgetItem(annotation.evalution),
+        ]
+
+    @staticmethod
+    def ConfidenceKeys(annotation: Annote) -> list[float]:
+        """Returns confidence columns sort keys of box."""
+        return [annotation.evaluation_confidence, annotation.evalution.value]
+
+    def BoxKeys(self, visuals: Visuals, annotation: Annote) -> list[float]:
+        """Returns numeric sort keys of box row, same order as items."""
+        width = annotation.width_px(visuals.width)
+        height = annotation.height_px(visuals.height)
+        return [
+            0.0,
+            annotation.classNumber,
+            *self.ConfidenceKeys(annotation),
+            width * height,
+            annotation.ratio,
+            annotation.area_px(visuals.width, visuals.height),
+            annotation.hue,
+            annotation.saturation,
+            annotation.brightness,
+        ]
+
+    def FileAt(self, row: int) -> Optional[dict]:
+        """Returns file entry of row box."""
+        if 0 <= row < self._count:
+            return self.files[self._fileRows[row]]
+
+        return None
+
+    def SortKeys(self, column: int) -> np.ndarray:
+        """Returns sort keys of column for all rows."""
+        if column == 0:
+            # Name : Rank of file name, then box index
+            names = np.array([fileEntry["Name"] for fileEntry in self.files])
+            ranks = np.empty(len(names), dtype=np.int64)
+            ranks[np.argsort(names, kind="stable")] = np.arange(len(names))
+            fileRanks = ranks[self._fileRows[: self._count]]
+            return (fileRanks << IndexBits) + self._indexes[: self._count]
+
+        return self._keys[: self._count, column]
+
+    def FilesFilter(
+        self, predicate: Callable[[dict], bool]
+    ) -> Callable[[np.ndarray], np.ndarray]:
+        """Returns rows filter accepting boxes of file entries accepted by
+        predicate, predicate is evaluated once for every file entry."""
+        accepted: list[bool] = []
+        version = self._filesVersion
+
+        def Accepts(rows: np.ndarray) -> np.ndarray:
+            """Returns mask of accepted rows."""
+            nonlocal version
+            # Check : File rows removed or changed, evaluate all again
+            if version != self._filesVersion:
+                accepted.clear()
+                version = self._filesVersion
+
+            for fileEntry in self.files[len(accepted) :]:
+                accepted.append(bool(predicate(fileEntry)))
+
+            return np.asarray(accepted, dtype=bool)[self._fileRows[rows]]
+
+        return Accepts
+
+    def SetFiles(self, files: list[dict]) -> None:
+        """Set file entries of all rows."""
+        self.beginResetModel()
+        self.files = []
+        self._rowOfID = {}
+        self._count = 0
+        self._fileRows = np.zeros(0, dtype=np.int32)
+        self._indexes = np.zeros(0, dtype=np.int32)
+        self._keys = np.zeros((0, len(self.labels)), dtype=np.float32)
+        self.ClearItems()
+        self.__append(files or [])
+        self.endResetModel()
+
+    def AppendFiles(self, files: list[dict]) -> None:
+        """Append rows of file entries boxes at the end."""
+        count = sum(len(fileEntry[self.entriesKey]) for fileEntry in files)
+        if count == 0:
+            self.__append(files)
+            return
+
+        start = self._count
+        self.beginInsertRows(QModelIndex(), start, start + count - 1)
+        self.__append(files)
+        self.endInsertRows()
+
+    def RemoveFiles(self, files: list[dict]) -> None:
+        """Remove rows of file entries boxes."""
+        fileRows = [
+            row for f in files if (row := self._rowOfID.get(f["ID"])) is not None
+        ]
+        if len(fileRows) == 0:
+            return
+
+        self.beginResetModel()
+        removed = np.zeros(len(self.files), dtype=bool)
+        removed[fileRows] = True
+        # Rows : Keep boxes of other files, file rows moved down
+        kept = ~removed[self._fileRows[: self._count]]
+        fileRowsMoved = (np.cumsum(~removed) - 1).astype(np.int32)
+        self._fileRows = fileRowsMoved[self._fileRows[: self._count][kept]]
+        self._indexes = self._indexes[: self._count][kept]
+        self._keys = self._keys[: self._count][kept]
+        self._count = len(self._fileRows)
+
+        self.files = [f for f, isRemoved in zip(self.files, removed) if not isRemoved]
+        self._rowOfID = {f["ID"]: row for row, f in enumerate(self.files)}
+        self._filesVersion += 1
+        self.ClearItems()
+        self.endResetModel()
+
+    def UpdateFile(self, fileEntry: dict) -> None:
+        """Update rows of changed file entry boxes, boxes count may change."""
+        fileRow = self._rowOfID.get(fileEntry["ID"])
+        if fileRow is None:
+            return
+
+        self.beginResetModel()
+        # Rows : Drop old boxes of file, new boxes appended at the end
+        kept = self._fileRows[: self._count] != fileRow
+        self._fileRows = self._fileRows[: self._count][kept]
+        self._indexes = self._indexes[: self._count][kept]
+        self._keys = self._keys[: self._count][kept]
+        self._count = len(self._fileRows)
+        self.__grow(self._count + len(fileEntry[self.entriesKey]))
+        self._count += self.__setBoxes(self._count, fileRow, fileEntry)
+
+        self.files[fileRow] = fileEntry
+        self._filesVersion += 1
+        self.ClearItems()
+        self.endResetModel()
+
+    def __grow(self, count: int) -> None:
+        """Grow arrays by doubling to hold count rows."""
+        if count > len(self._keys):
+            size = max(count, 2 * len(self._keys))
+            self._fileRows = np.resize(self._fileRows, size)
+            self._indexes = np.resize(self._indexes, size)
+            keys = np.zeros((size, len(self.labels)), dtype=np.float32)
+            keys[: self._count] = self._keys[: self._count]
+            self._keys = keys
+
+    def __setBoxes(self, row: int, fileRow: int, fileEntry: dict) -> int:
+        """Set rows of file entry boxes from row, precompute sort keys,
+        returns number of boxes."""
+        visuals: Visuals = fileEntry["Visuals"]
+        annotations: list[Annote] = fileEntry[self.entriesKey]
+        rows = slice(row, row + len(annotations))
+        self._fileRows[rows] = fileRow
+        self._indexes[rows] = np.arange(len(annotations))
+        if len(annotations):
+            self._keys[rows] = [
+                self.BoxKeys(visuals, annotation) for annotation in annotations
+            ]
+
+        return len(annotations)
+
+    def __append(self, files: list[dict]) -> None:
+        """Append file entries boxes."""
+        self.__grow(
+            self._count + sum(len(fileEntry[self.entriesKey]) for fileEntry in files)
+        )
+        row = self._count
+        for fileRow, fileEntry in enumerate(files, len(self.files)):
+            self._rowOfID[fileEntry["ID"]] = fileRow
+            row += self.__setBoxes(row, fileRow, fileEntry)
+
+        self.files.extend(files)
+        self._count = row
+
+
+class DetectionsTableModel(BoxesTableModel):
+    """Table model of detections boxes of file entries."""
+
+    # File entry key of boxes list
+    entriesKey: str = "Detections"
+    # Image crop files prefix
+    imagePrefix: str = "det"
+    # Columns labels
+    labels: tuple[str, ...] = (
+        "File/ID",
+        "Cat",
+        "Conf",
+        "Size",
+        "Ratio",
+        "Area",
+        "Hue",
+        "Saturation",
+        "Brightness",
+    )
+
+    @staticmethod
+    def ConfidenceItems(annotation: Annote) -> list[QTableWidgetItem]:
+        """Returns confidence columns items of box."""
+        return [PercentTableWidgetItem(annotation.confidence, is_color=True)]
+
+    @staticmethod
+    def ConfidenceKeys(annotation: Annote) -> list[float]:
+        """Returns confidence columns sort keys of box."""
+        return [annotation.confidence]
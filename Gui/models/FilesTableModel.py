@@ -0,0 +1,307 @@
+"""
+ FilesTableModel.py model of images table, reading lazily from file
+ entries.
+
+ - Cells of row are created only when row is shown (same table items
+   as were set in QTableWidget before),
+ - sort keys of all rows are precomputed when rows are added/changed,
+   used by KeysSortProxyModel,
+ - name tooltip shows stored thumbnail of image, if generated.
+"""
+
+import base64
+from typing import Optional
+
+import numpy as np
+from PyQt5.QtCore import QModelIndex, Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QTableWidgetItem
+
+from engine.thumbnails import ThumbnailLevels, ThumbnailStore
+from Gui.models.ItemsTableModel import ItemsTableModel
+from Gui.widgets.AnnotationsTableWidgetItem import AnnotationsTableWidgetItem
+from Gui.widgets.BoolTableWidgetItem import BoolTableWidgetItem
+from Gui.widgets.FloatTableWidgetItem import FloatTableWidgetItem
+from Gui.widgets.HsvTableWidgetItem import HsvTableWidgetItem
+from Gui.widgets.ImageTableWidgetItem import ImageTableWidgetItem
+from Gui.widgets.ImhashTableWidgetItem import ImhashTableWidgetItem
+from Gui.widgets.PercentTableWidgetItem import PercentTableWidgetItem
+from Gui.widgets.RectTableWidgetItem import RectTableWidgetItem
+from Gui.widgets.StatTableWidgetItem import StatTableWidgetItem
+
+
+def FileItems(fileEntry: dict) -> list[QTableWidgetItem]:
+    """Returns table items of file entry row."""
+    # Check : Invalid metrics
+    if "Metrics" not in fileEntry:
+        return []
+    # Metrics
+    metrics = fileEntry["Metrics"]
+    # Get visuals
+    visuals = fileEntry["Visuals"]
+
+    return [
+        # Filename + Image : Color
+        ImageTableWidgetItem(
+            imagePath=fileEntry["Path"],
+            text=fileEntry["Name"],
+            data=str(fileEntry["ID"]),
+            fontSize=14,
+            fontColor=QColor("#009970"),
+            fontUnderline=True,
+        ),
+        # width, height
+        RectTableWidgetItem(visuals.width, visuals.height, decimals=0),
+        # IsAnnotation column
+        BoolTableWidgetItem(fileEntry["IsAnnotation"]),
+        # IsValidation dataset column
+        BoolTableWidgetItem(fileEntry["IsValidation"]),
+        # Correct [%]
+        PercentTableWidgetItem(metrics.correct, is_color=True),
+        # Annotation classes
+        AnnotationsTableWidgetItem(fileEntry["Annotations"]),
+        # Timestamp from now
+        StatTableWidgetItem(fileEntry["Datetime"]),
+        # Hue column
+        HsvTableWidgetItem(hue=visuals.hue, value=visuals.hue),
+        # Saturation column
+        HsvTableWidgetItem(
+            hue=300,
+            saturation=visuals.saturation,
+            brightness=255,
+            value=visuals.saturation,
+        ),
+        # Brightness column
+        HsvTableWidgetItem(
+            saturation=0, brightness=visuals.brightness, value=visuals.brightness
+        ),
+        # Image hash column
+        ImhashTableWidgetItem(
+            visuals.dhash, visuals.isDuplicate, visuals.duplicateGroup
+        ),
+        # Average width, height, size
+        RectTableWidgetItem(metrics.AvgWidth, metrics.AvgHeight),
+        # New detections [j]
+        FloatTableWidgetItem(metrics.new_detections, decimals=0),
+        # Correct boxes [%]
+        PercentTableWidgetItem(metrics.correct_bboxes),
+        # Precision column
+        PercentTableWidgetItem(100 * metrics.precision, is_color=True),
+        # Recall column
+        PercentTableWidgetItem(100 * metrics.recall, is_color=True),
+        # Errors column
+        FloatTableWidgetItem(fileEntry["Errors"], decimals=0),
+        # Confidence of matches
+        PercentTableWidgetItem(metrics.matches_confidence, is_color=True),
+        # Detector worst case confidence
+        PercentTableWidgetItem(metrics.detections_confidence_min, is_color=True),
+    ]
+
+
+def FileKeys(fileEntry: dict) -> list[float]:
+    """Returns numeric sort keys of file entry row, same order as items."""
+    # Check : Invalid metrics
+    if "Metrics" not in fileEntry:
+        return [0.0] * len(FilesTableModel.labels)
+    metrics = fileEntry["Metrics"]
+    visuals = fileEntry["Visuals"]
+
+    # Image hash : Duplicates clusters first, as ImhashTableWidgetItem
+    imhash = visuals.dhash
+    if visuals.duplicateGroup >= 0:
+        imhash = -(visuals.duplicateGroup + 1)
+    elif visuals.isDuplicate:
+        imhash = -visuals.dhash
+
+    return [
+        0.0,
+        visuals.width * visuals.height,
+        fileEntry["IsAnnotation"],
+        fileEntry["IsValidation"],
+        metrics.correct,
+        len(fileEntry["Annotations"]),
+        fileEntry["Datetime"],
+        visuals.hue,
+        visuals.saturation,
+        visuals.brightness,
+        imhash,
+        metrics.AvgWidth * metrics.AvgHeight,
+        metrics.new_detections,
+        metrics.correct_bboxes,
+        100 * metrics.precision,
+        100 * metrics.recall,
+        fileEntry["Errors"],
+        metrics.matches_confidence,
+        metrics.detections_confidence_min,
+    ]
+
+
+class FilesTableModel(ItemsTableModel):
+    """Table model of file entries."""
+
+    # Columns labels
+    labels: tuple[str, ...] = (
+        "Name",
+        "ImSize",
+        "Annotated",
+        "Validation",
+        "Correct",
+        "Classes",
+        "Time",
+        "Hue",
+        "Saturation",
+        "Brightness",
+        "ImHash",
+        "Size",
+        "New dets",
+        "CorrectBbox",
+        "Precision",
+        "Recall",
+        "Errors",
+        "Match.Confidence",
+        "Det.WorstConfidence",
+    )
+
+    def __init__(
+        self,
+        parent=None,
+        cacheRows: int = 512,
+        thumbnails: Optional[ThumbnailStore] = None,
+    ):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        cacheRows : int
+            Maximal number of rows with created cells.
+        thumbnails : ThumbnailStore
+            Thumbnails of images shown in name tooltip.
+        """
+        super().__init__(parent, cacheRows)
+        self.thumbnails = thumbnails
+        # File entries of rows
+        self.files: list[dict] = []
+        # File ID -> row
+        self._rowOfID: dict[int, int] = {}
+        # Sort keys : Names and numeric keys array, growing
+        self._names: list[str] = []
+        self._keys = np.zeros((0, len(self.labels)), dtype=np.float64)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Returns number of files."""
+        return 0 if parent.isValid() else len(self.files)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Returns data of cell, created when row is shown."""
+        if not index.isValid():
+            return None
+
+        fileEntry = self.files[index.row()]
+        # Data : File ID of every cell
+        if role == Qt.UserRole:
+            return fileEntry["ID"]
+        # Tooltip : File ID of every cell, name with thumbnail
+        if role == Qt.ToolTipRole:
+            if (index.column() == 0) and (self.thumbnails is not None):
+                data = self.thumbnails.Get(fileEntry["Path"], ThumbnailLevels[-1])
+                if data is not None:
+                    encoded = base64.b64encode(data).decode("ascii")
+                    return (
+                        f"<img src='data:image/jpeg;base64,{encoded}'>"
+                        + f"<br>{fileEntry['ID']}"
+                    )
+
+            return str(fileEntry["ID"])
+
+        return super().data(index, role)
+
+    def RowItems(self, row: int) -> list[QTableWidgetItem]:
+        """Returns table items of row."""
+        return FileItems(self.files[row])
+
+    def SortKeys(self, column: int) -> np.ndarray:
+        """Returns sort keys of column for all rows."""
+        if column == 0:
+            return np.array(self._names)
+
+        return self._keys[: len(self.files), column]
+
+    def FileAt(self, row: int) -> Optional[dict]:
+        """Returns file entry of row."""
+        if 0 <= row < len(self.files):
+            return self.files[row]
+
+        return None
+
+    def RowOfID(self, fileID: int) -> Optional[int]:
+        """Returns row of file ID."""
+        return self._rowOfID.get(fileID)
+
+    def SetFiles(self, files: Optional[list[dict]]) -> None:
+        """Set file entries of all rows."""
+        self.beginResetModel()
+        self.files = []
+        self._rowOfID = {}
+        self._names = []
+        self._keys = np.zeros((0, len(self.labels)), dtype=np.float64)
+        self.ClearItems()
+        self.__append(files or [])
+        self.endResetModel()
+
+    def AppendFiles(self, files: list[dict]) -> None:
+        """Append file entries rows at the end."""
+        if len(files) == 0:
+            return
+
+        start = len(self.files)
+        self.beginInsertRows(QModelIndex(), start, start + len(files) - 1)
+        self.__append(files)
+        self.endInsertRows()
+
+    def RemoveFiles(self, files: list[dict]) -> None:
+        """Remove rows of file entries."""
+        rows = [row for f in files if (row := self._rowOfID.get(f["ID"])) is not None]
+        if len(rows) == 0:
+            return
+
+        # Rows : Removed in one pass, single reset of sorted proxy
+        self.beginResetModel()
+        kept = np.ones(len(self.files), dtype=bool)
+        kept[rows] = False
+        self.files = [f for f, isKept in zip(self.files, kept) if isKept]
+        self._names = [name for name, isKept in zip(self._names, kept) if isKept]
+        self._keys = self._keys[: len(kept)][kept]
+        self._rowOfID = {f["ID"]: row for row, f in enumerate(self.files)}
+        self.ClearItems()
+        self.endResetModel()
+
+    def UpdateFile(self, fileEntry: dict) -> None:
+        """Update row of changed file entry."""
+        row = self._rowOfID.get(fileEntry["ID"])
+        if row is None:
+            return
+
+        self.files[row] = fileEntry
+        self._names[row] = fileEntry["Name"]
+        self._keys[row] = FileKeys(fileEntry)
+        self.ClearItems(row)
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, len(self.labels) - 1)
+        )
+
+    def __append(self, files: list[dict]) -> None:
+        """Append file entries, precompute sort keys."""
+        start = len(self.files)
+        count = start + len(files)
+        # Keys : Grow array by doubling
+        if count > len(self._keys):
+            keys = np.zeros((max(count, 2 * len(self._keys)), len(self.labels)))
+            keys[:start] = self._keys[:start]
+            self._keys = keys
+
+        for row, fileEntry in enumerate(files, start):
+            self._rowOfID[fileEntry["ID"]] = row
+            self._names.append(fileEntry["Name"])
+            self._keys[row] = FileKeys(fileEntry)
+        self.files.extend(files)
@@ -0,0 +1,85 @@
+"""
+ ItemsTableModel.py base of table models, creating table items of row
+ lazily.
+
+ - Cells of row are created only when row is shown, kept in bounded
+   LRU of rows, so memory is constant per shown row,
+ - subclasses provide rows count and RowItems(row).
+"""
+
+from collections import OrderedDict
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import QTableWidgetItem
+
+
+class ItemsTableModel(QAbstractTableModel):
+    """Table model of lazily created table items."""
+
+    # Columns labels
+    labels: tuple[str, ...] = ()
+
+    def __init__(self, parent=None, cacheRows: int = 512):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        cacheRows : int
+            Maximal number of rows with created cells.
+        """
+        super().__init__(parent)
+        self.cacheRows = cacheRows
+        # Row -> created cells
+        self._cells: OrderedDict[int, list[QTableWidgetItem]] = OrderedDict()
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Returns number of columns."""
+        return 0 if parent.isValid() else len(self.labels)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        """Returns columns labels."""
+        if (role != Qt.DisplayRole) or (orientation != Qt.Horizontal):
+            return None
+
+        _translate = QtCore.QCoreApplication.translate
+        return _translate(type(self).__name__, self.labels[section])
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        """Returns data of cell, created when row is shown."""
+        item = self.Item(index)
+        if item is None:
+            return None
+
+        return item.data(role)
+
+    def Item(self, index: QModelIndex):
+        """Returns table item of cell, None if not exists."""
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        cells = self._cells.get(row)
+        if cells is None:
+            cells = self._cells[row] = self.RowItems(row)
+            while len(self._cells) > self.cacheRows:
+                self._cells.popitem(last=False)
+        else:
+            self._cells.move_to_end(row)
+
+        if index.column() >= len(cells):
+            return None
+
+        return cells[index.column()]
+
+    def RowItems(self, row: int) -> list[QTableWidgetItem]:
+        """Returns table items of row, subclasses create cells of row."""
+        return []
+
+    def ClearItems(self, row: int = None) -> None:
+        """Drop created cells of row, all rows if None."""
+        if row is None:
+            self._cells.clear()
+        else:
+            self._cells.pop(row, None)
@@ -0,0 +1,268 @@
+"""
+ KeysSortProxyModel.py sorts and filters rows of table model by
+ precomputed keys.
+
+ - Source model provides SortKeys(column) array of sort keys of all rows,
+   sorting is single numpy argsort, without per-row Python comparisons,
+ - filter predicate of source row is evaluated once, when it is set or
+   row is added/changed, result is kept in mask. Rows filter gets array
+   of source rows and returns mask at once, for millions of rows,
+ - appended rows are sorted alone and merged into sorted rows,
+ - rows mapping is kept in arrays, mapping of row is O(1).
+"""
+
+from typing import Callable, Optional
+
+import numpy as np
+from PyQt5.QtCore import QAbstractProxyModel, QModelIndex, Qt
+
+
+class KeysSortProxyModel(QAbstractProxyModel):
+    """Sort and filter proxy model over precomputed keys."""
+
+    def __init__(self, parent=None):
+        """Constructor."""
+        super().__init__(parent)
+        # Proxy row -> source row
+        self._rows = np.zeros(0, dtype=np.int64)
+        # Source row -> proxy row, -1 if filtered out
+        self._proxyRows = np.zeros(0, dtype=np.int64)
+        # Source row -> accepted by filter
+        self._mask = np.zeros(0, dtype=bool)
+        # Filter of source rows array, returns accepted mask
+        self._filter: Optional[Callable[[np.ndarray], np.ndarray]] = None
+        # Sorting column, -1 not sorted
+        self._sortColumn = -1
+        self._sortOrder = Qt.AscendingOrder
+
+    def setSourceModel(self, model) -> None:
+        """Set source model and follow its changes."""
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.modelAboutToBeReset.disconnect(self.beginResetModel)
+            previous.modelReset.disconnect(self.__sourceReset)
+            previous.rowsInserted.disconnect(self.__sourceRowsInserted)
+            previous.rowsAboutToBeRemoved.disconnect(self.beginResetModel)
+            previous.rowsRemoved.disconnect(self.__sourceReset)
+            previous.dataChanged.disconnect(self.__sourceDataChanged)
+
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self.__sourceReset)
+        model.rowsInserted.connect(self.__sourceRowsInserted)
+        model.rowsAboutToBeRemoved.connect(self.beginResetModel)
+        model.rowsRemoved.connect(self.__sourceReset)
+        model.dataChanged.connect(self.__sourceDataChanged)
+        self.__rebuild()
+        self.endResetModel()
+
+    def SetFilter(self, predicate: Optional[Callable[[int], bool]]) -> None:
+        """Set filter predicate of source row, None accepts all rows."""
+        if predicate is None:
+            self.SetRowsFilter(None)
+            return
+
+        self.SetRowsFilter(
+            lambda rows: np.fromiter(
+                (bool(predicate(int(row))) for row in rows),
+                dtype=bool,
+                count=len(rows),
+            )
+        )
+
+    def SetRowsFilter(
+        self, predicate: Optional[Callable[[np.ndarray], np.ndarray]]
+    ) -> None:
+        """Set filter of source rows array, None accepts all rows."""
+        self.beginResetModel()
+        self._filter = predicate
+        self.__rebuild()
+        self.endResetModel()
+
+    # ----- Qt model interface -----
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Returns number of accepted rows."""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Returns number of source columns."""
+        model = self.sourceModel()
+        return 0 if (model is None) or parent.isValid() else model.columnCount()
+
+    def index(
+        self, row: int, column: int, parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+        """Returns index of proxy cell."""
+        if parent.isValid() or not (0 <= row < len(self._rows)):
+            return QModelIndex()
+        if not (0 <= column < self.columnCount()):
+            return QModelIndex()
+
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        """Flat table, no parents."""
+        return QModelIndex()
+
+    def mapToSource(self, proxyIndex: QModelIndex) -> QModelIndex:
+        """Returns source index of proxy index."""
+        model = self.sourceModel()
+        if (model is None) or (not proxyIndex.isValid()):
+            return QModelIndex()
+        if not (0 <= proxyIndex.row() < len(self._rows)):
+            return QModelIndex()
+
+        return model.index(int(self._rows[proxyIndex.row()]), proxyIndex.column())
+
+    def mapFromSource(self, sourceIndex: QModelIndex) -> QModelIndex:
+        """Returns proxy index of source index, invalid if filtered out."""
+        if not sourceIndex.isValid():
+            return QModelIndex()
+        row = sourceIndex.row()
+        if not (0 <= row < len(self._proxyRows)) or (self._proxyRows[row] < 0):
+            return QModelIndex()
+
+        return self.createIndex(int(self._proxyRows[row]), sourceIndex.column())
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        """Returns source header, rows are numbered in proxy order."""
+        model = self.sourceModel()
+        if model is None:
+            return None
+        if orientation == Qt.Horizontal:
+            return model.headerData(section, orientation, role)
+        if role == Qt.DisplayRole:
+            return section + 1
+
+        return None
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        """Sort rows by source keys of column."""
+        self._sortColumn = column
+        self._sortOrder = order
+        self.__relayout()
+
+    # ----- Source model changes -----
+
+    def __sourceReset(self) -> None:
+        """Source model reset or rows removed."""
+        self.__rebuild()
+        self.endResetModel()
+
+    def __sourceRowsInserted(self, parent: QModelIndex, first: int, last: int):
+        """Source rows appended : Filter and insert, then sort again."""
+        rows = np.arange(first, last + 1, dtype=np.int64)
+        accepted = self.__accepts(rows)
+        self._mask = np.insert(self._mask, first, accepted)
+        self._proxyRows = np.insert(self._proxyRows, first, -1)
+        self._rows[self._rows >= first] += len(rows)
+
+        added = rows[accepted]
+        if len(added):
+            rowsBefore = self._rows
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            self._rows = np.concatenate((self._rows, added))
+            self.__updateProxyRows()
+            self.endInsertRows()
+
+            # Sort : Merge sorted appended rows, not all rows again
+            if self._sortColumn >= 0:
+                self.__relayout(self.__merged(rowsBefore, added))
+        else:
+            self.__updateProxyRows()
+
+    def __sourceDataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex):
+        """Source rows changed : Filter again, forward change, sort again."""
+        rows = np.arange(topLeft.row(), bottomRight.row() + 1, dtype=np.int64)
+        accepted = self.__accepts(rows)
+        if np.any(accepted != self._mask[rows]):
+            self.beginResetModel()
+            self.__rebuild()
+            self.endResetModel()
+            return
+
+        for row in rows[accepted]:
+            proxyRow = int(self._proxyRows[row])
+            self.dataChanged.emit(
+                self.index(proxyRow, topLeft.column()),
+                self.index(proxyRow, bottomRight.column()),
+            )
+
+        if self._sortColumn >= 0:
+            self.__relayout()
+
+    # ----- Rows mapping -----
+
+    def __accepts(self, rows: np.ndarray) -> np.ndarray:
+        """Returns filter mask of source rows."""
+        if self._filter is None:
+            return np.ones(len(rows), dtype=bool)
+
+        return np.asarray(self._filter(rows), dtype=bool)
+
+    def __sorted(self, rows: np.ndarray) -> np.ndarray:
+        """Returns source rows in sorting order."""
+        model = self.sourceModel()
+        if (self._sortColumn < 0) or (model is None) or (len(rows) == 0):
+            return rows
+
+        keys = np.asarray(model.SortKeys(self._sortColumn))[rows]
+        order = np.argsort(keys, kind="stable")
+        if self._sortOrder == Qt.DescendingOrder:
+            order = order[::-1]
+        return rows[order]
+
+    def __merged(self, rows: np.ndarray, added: np.ndarray) -> np.ndarray:
+        """Returns sorted rows with added rows merged in sorting order."""
+        keys = np.asarray(self.sourceModel().SortKeys(self._sortColumn))
+        added = self.__sorted(added)
+        current = keys[rows]
+        if self._sortOrder == Qt.DescendingOrder:
+            positions = len(rows) - np.searchsorted(
+                current[::-1], keys[added], side="left"
+            )
+        else:
+            positions = np.searchsorted(current, keys[added], side="right")
+
+        return np.insert(rows, positions, added)
+
+    def __updateProxyRows(self) -> None:
+        """Update source row -> proxy row mapping."""
+        self._proxyRows = np.full(len(self._mask), -1, dtype=np.int64)
+        self._proxyRows[self._rows] = np.arange(len(self._rows), dtype=np.int64)
+
+    def __rebuild(self) -> None:
+        """Filter and sort all source rows."""
+        model = self.sourceModel()
+        count = model.rowCount() if model is not None else 0
+        self._mask = self.__accepts(np.arange(count, dtype=np.int64))
+        self._rows = self.__sorted(np.flatnonzero(self._mask).astype(np.int64))
+        self.__updateProxyRows()
+
+    def __relayout(self, rows: Optional[np.ndarray] = None) -> None:
+        """Sort again or set sorted rows, keep persistent indexes."""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [
+            (int(self._rows[index.row()]), index.column())
+            if 0 <= index.row() < len(self._rows)
+            else None
+            for index in persistent
+        ]
+
+        self._rows = self.__sorted(self._rows) if rows is None else rows
+        self.__updateProxyRows()
+
+        self.changePersistentIndexList(
+            persistent,
+            [
+                self.createIndex(int(self._proxyRows[source[0]]), source[1])
+                if source is not None
+                else QModelIndex()
+                for source in sources
+            ],
+        )
+        self.layoutChanged.emit()
@@ -1,15 +1,16 @@
 """
  ImageTableWidgetItem.py with images buffer cropped creation.
+
+ - Tooltip is generated on hover only, from shared crops cache.
 """
 
-from collections import deque
-import logging
-import os
+import base64
 from typing import Optional
 
 from PyQt5 import QtCore, QtWidgets
 from PyQt5.QtGui import QColor
-import cv2
+
+from engine.crop_cache import CropCache
 
 
 class ImageTableWidgetItem(QtWidgets.QTableWidgetItem):
@@ -21,10 +22,8 @@ class ImageTableWidgetItem(QtWidgets.QTableWidgetItem):
     image_crop: tuple[float, float, float, float]
     # Image prefix
     image_prefix: str
-    # Cache dir
-    cache_dir: str = "temp"
-    # Image cropped cache
-    cache = deque(maxlen=100)
+    # Image crops cache, shared by all items
+    crops: CropCache = CropCache()
 
     def __init__(
         self,
@@ -64,48 +63,17 @@ class ImageTableWidgetItem(QtWidgets.QTableWidgetItem):
             font.setUnderline(True)
             self.setFont(font)
 
-        # Tooltip : Autoset if no cropping
-        if self.image_crop is None:
-            self.setToolTip(self.generate_tooltip())
-
     def generate_tooltip(self, max_width: int = 640) -> str:
         """Generate tooltip for image"""
         # Check : Image path
         if self.image_path is None or len(self.image_path) == 0:
             return ""
 
-        # Check : No crop
-        if self.image_crop is None:
-            return f"<img src='{self.image_path}' width='{max_width}'>"
-
-        # Cropped image : Generate hash
-        x1, y1, x2, y2 = self.image_crop
-        cache_key = (self.image_path, self.image_prefix, x1, y1, x2, y2)
-        cached_file_path = os.path.join(self.cache_dir, f"{hash(cache_key)}.png")
-
-        # Check : Hashed image not exists
-        if cached_file_path not in self.cache:
-            # Read image, crop and save temp/temp.png
-            try:
-                image = cv2.imread(self.image_path)
-                x1, y1, x2, y2 = self.image_crop
-                image_cropped = image[y1:y2, x1:x2]
-                cv2.imwrite(cached_file_path, image_cropped)
-            except Exception as e:
-                logging.error(f"Error cropping image: {e}")
-                return ""
-
-            # Cache : Append
-            self.cache.append(cached_file_path)
-
-            # Cache : Remove oldest
-            if len(self.cache) > self.cache.maxlen:
-                oldest_file = self.cache.popleft()
-                if os.path.exists(oldest_file):
-                    os.remove(oldest_file)
-
-        # Calculate max width
-        cropped_max_width = min(max_width, x2 - x1)
-
-        # Tooltip : Return
-        return f"<img src='{cached_file_path}' width='{cropped_max_width}'>"
+        # Cropped image : Encoded thumbnail, cached
+        data = self.crops.Get(self.image_path, self.image_crop, max_width)
+        if data is None:
+            return ""
+
+        # Tooltip : Return, image embedded
+        encoded = base64.b64encode(data).decode("ascii")
+        return f"<img src='data:image/jpeg;base64,{encoded}'>"
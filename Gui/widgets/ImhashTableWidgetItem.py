@@ -12,7 +12,12 @@ class ImhashTableWidgetItem(QtWidgets.QTableWidgetItem):
     # Float value
     value: float = 0
 
-    def __init__(self, image_similarity: float = 0.0, is_duplicated: bool = False):
+    def __init__(
+        self,
+        image_similarity: float = 0.0,
+        is_duplicated: bool = False,
+        duplicate_group: int = -1,
+    ):
         """ """
         super().__init__()
         # Set variables
@@ -29,7 +34,17 @@ class ImhashTableWidgetItem(QtWidgets.QTableWidgetItem):
         # Foreground color : Set black
         self.setForeground(QColor(0, 0, 0))
 
-        if is_duplicated:
+        if duplicate_group >= 0:
+            # Background color : Set red duplicate, orange first image of cluster
+            if is_duplicated:
+                self.setBackground(QColor(255, 0, 0))
+            else:
+                self.setBackground(QColor(255, 165, 0))
+            # Sorting : Images of cluster together
+            self.value = -(duplicate_group + 1)
+            self.setData(QtCore.Qt.UserRole, self.value)
+            self.setText(f"[D{duplicate_group}]{image_hash_str}")
+        elif is_duplicated:
             # Background color : Set red
             self.setBackground(QColor(255, 0, 0))
             self.setData(QtCore.Qt.UserRole, -image_similarity)
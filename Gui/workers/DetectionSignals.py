@@ -0,0 +1,13 @@
+"""
+ DetectionSignals.py delivers results of background detection worker
+ to GUI thread.
+"""
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class DetectionSignals(QObject):
+    """Signals of background detection worker."""
+
+    # Detections finished : (requestID, (filepath, detections))
+    signalDetected = pyqtSignal(int, object, name="Detected")
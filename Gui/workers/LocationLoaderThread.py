@@ -0,0 +1,85 @@
+"""
+ LocationLoaderThread.py loads location file entries in background
+ and emits them to GUI in chunks.
+"""
+
+import logging
+import time
+from typing import Iterator
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class LocationLoaderThread(QThread):
+    """Background loader of location file entries."""
+
+    # Chunk of file entries loaded
+    signalChunk = pyqtSignal(list, name="Chunk")
+    # Loading failed, error message, emitted before signalLoaded
+    signalFailed = pyqtSignal(str, name="Failed")
+    # Loading finished, True if cancelled
+    signalLoaded = pyqtSignal(bool, name="Loaded")
+
+    def __init__(
+        self,
+        entries: Iterator[dict],
+        chunk_size: int = 256,
+        chunk_interval: float = 0.25,
+        parent=None,
+    ):
+        """
+        Constructor.
+
+        Parameters
+        ----------
+        entries : Iterator[dict]
+            Generator of file entries, consumed in this thread.
+        chunk_size : int
+            Maximal number of file entries in chunk.
+        chunk_interval : float
+            Maximal interval [s] between emitted chunks.
+        """
+        super().__init__(parent)
+        self.entries = entries
+        self.chunk_size = chunk_size
+        self.chunk_interval = chunk_interval
+
+    def run(self):
+        """Consume file entries and emit chunks."""
+        chunk: list[dict] = []
+        emitted = time.monotonic()
+        isCancelled = False
+        isFirst = True
+        try:
+            for fileEntry in self.entries:
+                # Check : Cancel requested
+                if self.isInterruptionRequested():
+                    isCancelled = True
+                    break
+
+                chunk.append(fileEntry)
+
+                # Chunk : First entry at once, then by size or interval
+                if (
+                    isFirst
+                    or (len(chunk) >= self.chunk_size)
+                    or (time.monotonic() - emitted >= self.chunk_interval)
+                ):
+                    self.signalChunk.emit(chunk)
+                    chunk = []
+                    emitted = time.monotonic()
+                    isFirst = False
+
+        except Exception as e:
+            logging.error("(LocationLoaderThread) Loading failed! %s", e)
+            self.signalFailed.emit(str(e))
+
+        finally:
+            # Generator : Close, release scanner workers and index
+            self.entries.close()
+
+        # Chunk : Rest of entries
+        if len(chunk):
+            self.signalChunk.emit(chunk)
+
+        self.signalLoaded.emit(isCancelled)
@@ -10,7 +10,7 @@ import shutil
 import sys
 from copy import copy
 from datetime import datetime
-from PyQt5.QtWidgets import QTableWidgetItem
+from typing import Optional
 
 from Detectors.common.Detector import NmsMethod
 from Detectors.common.image_strategy import ImageStrategy
@@ -18,6 +18,11 @@ from engine.annote import GetClasses
 from engine.annote_enums import AnnotatorType
 from engine.annoter import Annoter, DetectorSelected
 from engine.session import Session
+from engine.watcher import DirectoryWatcher
+from Gui.models.BoxesTableModel import BoxesTableModel, DetectionsTableModel
+from Gui.models.FilesTableModel import FilesTableModel
+from Gui.workers.DetectionSignals import DetectionSignals
+from Gui.workers.LocationLoaderThread import LocationLoaderThread
 from helpers.files import ChangeExtension, FixPath
 from MainWindow_ui import Ui_MainWindow
 from PyQt5 import QtCore
@@ -29,14 +34,15 @@ from PyQt5.QtWidgets import (
     QListWidgetItem,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
+    QPushButton,
 )
 from ViewerEditorImage import ViewerEditorImage
 from views.ViewAnnotations import ViewAnnotations
 from views.ViewDetections import ViewDetections
 from views.ViewFilters import ViewFilters
-from views.ViewImagesSummary import ViewImagesSummary
+from views.ViewImagesSummary import Summary, ViewImagesSummary
 from views.ViewImagesTable import ViewImagesTable
-from views.ViewImagesTableRow import ViewImagesTableRow
 
 
 class MainWindowGui(Ui_MainWindow):
@@ -67,6 +73,8 @@ class MainWindowGui(Ui_MainWindow):
         self.keysOffset = 0
         # Keys length
         self.keysSize = 12
+        # Watcher of opened directory changes
+        self.watcher: Optional[DirectoryWatcher] = None
 
         # UI - creation
         self.App = QApplication(sys.argv)
@@ -81,6 +89,60 @@ class MainWindowGui(Ui_MainWindow):
         # --------------------------
         self.system_settings = QtCore.QSettings(self.App)
 
+        # Location loader : Progress and cancel in status bar
+        self.loader: Optional[LocationLoaderThread] = None
+        self.loaderSummary: Optional[Summary] = None
+        self.loaderProgressBar = QProgressBar(self.window)
+        self.loaderProgressBar.setFormat("Loading %v/%m files")
+        self.loaderProgressBar.hide()
+        self.loaderCancelButton = QPushButton("Cancel", self.window)
+        self.loaderCancelButton.hide()
+        self.ui.statusbar.addPermanentWidget(self.loaderProgressBar)
+        self.ui.statusbar.addPermanentWidget(self.loaderCancelButton)
+
+        # Watcher timer : Polls opened directory changes
+        self.watcherTimer = QtCore.QTimer(self.window)
+        self.watcherTimer.setInterval(1000)
+        self.watcherTimer.timeout.connect(self.CallbackWatcherTimeout)
+
+        # Images table : Model of file entries, sorted/filtered by proxy
+        self.filesModel = FilesTableModel(
+            self.window, thumbnails=self.annoter.thumbnails
+        )
+        self.filesProxy = ViewImagesTable.Setup(
+            self.ui.fileSelectorTableWidget, self.filesModel
+        )
+        # Annotations, detections tables : Models of boxes, sorted/filtered
+        self.annotationsModel = BoxesTableModel(self.window)
+        self.annotationsProxy = ViewAnnotations.Setup(
+            self.ui.tableAnnotations, self.annotationsModel
+        )
+        self.detectionsModel = DetectionsTableModel(self.window)
+        self.detectionsProxy = ViewDetections.Setup(
+            self.ui.tableDetections, self.detectionsModel
+        )
+
+        # Thumbnails : Visible rows images generated first, after scrolling
+        self.thumbnailsTimer = QtCore.QTimer(self.window)
+        self.thumbnailsTimer.setSingleShot(True)
+        self.thumbnailsTimer.setInterval(100)
+        self.thumbnailsTimer.timeout.connect(self.ThumbnailsPrioritize)
+        for table in (
+            self.ui.fileSelectorTableWidget,
+            self.ui.tableAnnotations,
+            self.ui.tableDetections,
+        ):
+            table.verticalScrollBar().valueChanged.connect(self.thumbnailsTimer.start)
+            table.model().layoutChanged.connect(self.thumbnailsTimer.start)
+            table.model().modelReset.connect(self.thumbnailsTimer.start)
+
+        # Detection worker : Detector runs in background, results merged here
+        self.detectionSignals = DetectionSignals(self.window)
+        self.detectionSignals.signalDetected.connect(self.CallbackDetected)
+        self.annoter.detection_worker.callback = (
+            self.detectionSignals.signalDetected.emit
+        )
+
         # Setup all
         self.SetupCallbacks()
         self.SetupDefault()
@@ -154,42 +216,103 @@ class MainWindowGui(Ui_MainWindow):
 
     def ImageIDToRowNumber(self, imageID: int):
         """Image number to row index."""
-        # Found index
-        foundIndex = None
-
-        # Check : Row count == 0
-        if self.ui.fileSelectorTableWidget.rowCount() == 0:
+        # Find rowIndex of imageNumber : Model row, then sorted/filtered row
+        row = self.filesModel.RowOfID(imageID)
+        if row is None:
             return None
 
-        # Find rowIndex of imageNumber
-        for rowIndex in range(self.ui.fileSelectorTableWidget.rowCount()):
-            item = self.ui.fileSelectorTableWidget.item(rowIndex, 0)
-            if item is None:
-                continue
-
-            if int(item.toolTip()) == imageID:
-                foundIndex = rowIndex
-                break
+        index = self.filesProxy.mapFromSource(self.filesModel.index(row, 0))
+        if not index.isValid():
+            return None
 
-        return foundIndex
+        return index.row()
 
     def RowNumberToImageID(self, rowIndex: int):
         """Row index to image number."""
         # Check : Return 0 if rows == 0
-        if self.ui.fileSelectorTableWidget.rowCount() == 0:
+        if self.filesProxy.rowCount() == 0:
             return 0
 
         # Find rowIndex of imageNumber
-        item = self.ui.fileSelectorTableWidget.item(rowIndex, 0)
-        if item is not None:
-            return int(item.toolTip())
+        index = self.filesProxy.index(rowIndex, 0)
+        if index.isValid():
+            return index.data(QtCore.Qt.UserRole)
 
         # Otherwise : Return row zero image number
-        item = self.ui.fileSelectorTableWidget.item(0, 0)
-        if item is not None:
-            return int(item.toolTip())
+        return self.filesProxy.index(0, 0).data(QtCore.Qt.UserRole)
+
+    def ThumbnailsPrioritize(self) -> None:
+        """Generate thumbnails of images in visible tables rows first."""
+        imagepaths = {}
+        for table, model, proxy in (
+            (self.ui.fileSelectorTableWidget, self.filesModel, self.filesProxy),
+            (self.ui.tableAnnotations, self.annotationsModel, self.annotationsProxy),
+            (self.ui.tableDetections, self.detectionsModel, self.detectionsProxy),
+        ):
+            if not table.isVisible():
+                continue
+
+            for row in ViewImagesTable.VisibleRows(table):
+                fileEntry = model.FileAt(proxy.mapToSource(proxy.index(row, 0)).row())
+                if fileEntry is not None:
+                    imagepaths[fileEntry["Path"]] = True
+
+        if len(imagepaths):
+            self.annoter.thumbnail_generator.Prioritize(list(imagepaths))
+
+    def TablesFilter(self) -> None:
+        """Filter tables rows by selected classes."""
+        annotationsClassnames = self.FilterClassesGet()
+        detectionsClassnames = self.FilterDetectionClassesGet()
+        if (len(annotationsClassnames) == 0) and (len(detectionsClassnames) == 0):
+            self.filesProxy.SetFilter(None)
+            self.annotationsProxy.SetRowsFilter(None)
+            self.detectionsProxy.SetRowsFilter(None)
+            return
+
+        def IsMatching(fileEntry: dict) -> bool:
+            """True if file entry matches selected classes."""
+            return Annoter.IsFileEntryMatching(
+                fileEntry, annotationsClassnames, detectionsClassnames
+            )
+
+        self.filesProxy.SetFilter(lambda row: IsMatching(self.filesModel.files[row]))
+        # Boxes tables : Boxes of matching files, file evaluated once
+        self.annotationsProxy.SetRowsFilter(
+            self.annotationsModel.FilesFilter(IsMatching)
+        )
+        self.detectionsProxy.SetRowsFilter(self.detectionsModel.FilesFilter(IsMatching))
+
+    def SummaryView(self, recount: bool = True) -> None:
+        """View images summary, counted incrementally if classes are not
+        filtered, filtered files are counted again only if recount."""
+        annotationsClassnames = self.FilterClassesGet()
+        detectionsClassnames = self.FilterDetectionClassesGet()
+        if (len(annotationsClassnames) == 0) and (len(detectionsClassnames) == 0):
+            ViewImagesSummary.ViewSummary(
+                self.ui.fileSummaryLabel, self.annoter.summary
+            )
+        elif recount:
+            files = self.annoter.GetFiles(
+                filter_annotations_classnames=annotationsClassnames,
+                filter_detections_classnames=detectionsClassnames,
+            )
+            ViewImagesSummary.View(self.ui.fileSummaryLabel, files)
+
+    def PrefetchTableNeighbours(self) -> None:
+        """Prefetch images of table rows around current image."""
+        rowCount = self.filesProxy.rowCount()
+        rowIndex = self.ImageIDToRowNumber(self.annoter.GetFileID())
+        if rowIndex is None:
+            return
+
+        # Rows : Nearest first, wrapped as next/previous navigation
+        fileIDs = []
+        for distance in range(1, self.annoter.prefetch_depth + 1):
+            for row in (rowIndex + distance, rowIndex - distance):
+                fileIDs.append(self.RowNumberToImageID(row % rowCount))
 
-        return 0
+        self.annoter.Prefetch(fileIDs)
 
     def SetupCallbacks(self):
         """Setup only once after init."""
@@ -204,17 +327,15 @@ class MainWindowGui(Ui_MainWindow):
         )
 
         # Images table : Setup
-        self.ui.fileSelectorTableWidget.itemClicked.connect(
-            lambda item: self.CallbackFileSelectorItemClicked(item, from_data=False)
+        self.ui.fileSelectorTableWidget.clicked.connect(
+            self.CallbackFileSelectorItemClicked
         )
 
         # Annotations table : Setup
-        self.ui.tableAnnotations.itemClicked.connect(
-            self.CallbackFileAnnotationSelected
-        )
+        self.ui.tableAnnotations.clicked.connect(self.CallbackFileAnnotationSelected)
 
         # Detections table : Setup
-        self.ui.tableDetections.itemClicked.connect(self.CallbackFileAnnotationSelected)
+        self.ui.tableDetections.clicked.connect(self.CallbackFileAnnotationSelected)
 
         # Detector : Callbacks for sliders, method
         self.ui.detectorConfidenceSlider.valueChanged.connect(
@@ -236,6 +357,9 @@ class MainWindowGui(Ui_MainWindow):
         # Paint size slider
         self.ui.paintSizeSlider.valueChanged.connect(self.CallbackPaintSizeSlider)
 
+        # Location loader : Cancel
+        self.loaderCancelButton.clicked.connect(lambda: self.LocationLoadCancel())
+
         # Menu handling
         self.ui.actionZamknijProgram.triggered.connect(self.CallbackClose)
         self.ui.actionZapisz.triggered.connect(self.CallbackSaveFileAnnotationsButton)
@@ -420,15 +544,13 @@ class MainWindowGui(Ui_MainWindow):
         # )
 
         # # Images table : Setup
-        # ViewImagesTable.View(self.ui.fileSelectorTableWidget, files)
+        # self.filesModel.SetFiles(files)
 
         # # Images summary : Setup
         # ViewImagesSummary.View(self.ui.fileSummaryLabel, files)
 
-    def Setup(self, table_refresh: bool = False):
-        """Setup again UI."""
-        filename = self.annoter.GetFilename()
-        imageWidth, imageHeight, imageBytes = self.annoter.GetImageSize()
+    def SetupProgress(self):
+        """Setup annotated files progress bar and file number label."""
         imageNumber = self.annoter.GetFileIndex()
         imageID = self.annoter.GetFileID()
         imageCount = self.annoter.GetFilesCount()
@@ -447,6 +569,19 @@ class MainWindowGui(Ui_MainWindow):
             "ID%u (%u/%u)" % (imageID, imageNumber, imageCount)
         )
 
+    def Setup(self, table_refresh: bool = False, image_refresh: bool = True):
+        """Setup again UI."""
+        filename = self.annoter.GetFilename()
+        imageWidth, imageHeight, imageBytes = self.annoter.GetImageSize()
+        imageID = self.annoter.GetFileID()
+
+        # Setup progress bar and file number
+        self.SetupProgress()
+
+        # Images summary : Updated by incremental counters, without recount
+        if not table_refresh:
+            self.SummaryView(recount=False)
+
         # Setup file info
         self.ui.fileLabel.setText(
             f"[{imageWidth}px x {imageHeight}x x {imageBytes}B] {imageID}/{filename}"
@@ -460,11 +595,11 @@ class MainWindowGui(Ui_MainWindow):
         rowIndex = self.ImageIDToRowNumber(imageID)
 
         if (fileEntry is not None) and (rowIndex is not None):
-            self.ui.fileSelectorTableWidget.setSortingEnabled(False)
-            ViewImagesTableRow.View(
-                self.ui.fileSelectorTableWidget, rowIndex, fileEntry, isSelected=True
-            )
-            self.ui.fileSelectorTableWidget.setSortingEnabled(True)
+            self.filesModel.UpdateFile(fileEntry)
+            # Row : Sorted again, find and select
+            rowIndex = self.ImageIDToRowNumber(imageID)
+            if rowIndex is not None:
+                self.ui.fileSelectorTableWidget.selectRow(rowIndex)
 
         # Paint size slider
         self.ui.paintLabel.setText("Paint size %u" % self.ui.paintSizeSlider.value())
@@ -475,31 +610,42 @@ class MainWindowGui(Ui_MainWindow):
 
         # Setup viewer/editor
         self.ui.viewerEditor.SetAnnoter(self.annoter)
-        self.ui.viewerEditor.SetImage(self.annoter.GetImage())
+        if image_refresh:
+            self.ui.viewerEditor.SetImage(self.annoter.GetImage())
 
         # Table : Refresh
         if table_refresh:
-            files = self.annoter.GetFiles(
-                filter_annotations_classnames=self.FilterClassesGet(),
-                filter_detections_classnames=self.FilterDetectionClassesGet(),
-            )
-
-            # Images table : Setup
-            ViewImagesTable.View(self.ui.fileSelectorTableWidget, files)
+            # Tables : Setup, rows filtered by proxies
+            self.filesModel.SetFiles(self.annoter.files)
+            self.annotationsModel.SetFiles(self.annoter.files)
+            self.detectionsModel.SetFiles(self.annoter.files)
+            self.TablesFilter()
+            ViewImagesTable.Resize(self.ui.fileSelectorTableWidget)
+            ViewAnnotations.Resize(self.ui.tableAnnotations)
+            ViewDetections.Resize(self.ui.tableDetections)
 
             # Images summary : Setup
-            ViewImagesSummary.View(self.ui.fileSummaryLabel, files)
-
-            # Annotations summary : Setup
-            ViewAnnotations.View(self.ui.tableAnnotations, files)
-
-            # Detections summary : Setup
-            ViewDetections.View(self.ui.tableDetections, files)
+            self.SummaryView()
 
     def Run(self):
         """Run gui window thread and return exit code."""
         self.window.show()
-        return self.App.exec_()
+        result = self.App.exec_()
+        self.LocationLoadCancel(wait=True)
+        # Dataset : Save not saved validation changes
+        self.annoter.dataset_validation.flush(force=True)
+        # Detection worker : Drop requests, stop background thread
+        self.annoter.detection_worker.Close()
+        # Prefetcher : Stop background threads
+        self.annoter.prefetcher.Close()
+        # Writer : Write and fsync queued annotations files
+        self.annoter.writer.Close()
+        # Detection cache : Commit cached detections
+        self.annoter.detection_cache.Close()
+        # Thumbnails : Stop background threads, commit generated
+        self.annoter.thumbnail_generator.Close()
+        self.annoter.thumbnails.Close()
+        return result
 
     def FilterClassesGet(self) -> list[str]:
         """Get classes filter from every button from
@@ -535,7 +681,11 @@ class MainWindowGui(Ui_MainWindow):
 
     def CallbackFilterClassesClicked(self, label: str):
         """Callback for filter classes button clicked."""
-        self.Setup(table_refresh=True)
+        # Tables : Filter rows only, models are not rebuilt
+        self.TablesFilter()
+
+        # Images summary : Setup
+        self.SummaryView()
 
     def CallbackImageScalingTextChanged(self, text):
         """Callback when image scaling text changed."""
@@ -572,25 +722,24 @@ class MainWindowGui(Ui_MainWindow):
         """Current labels row changed."""
         self.ui.viewerEditor.SetClassNumber(index)
 
-    def CallbackFileSelectorItemClicked(
-        self, item: QTableWidgetItem, from_data: bool = False
-    ):
+    def CallbackFileSelectorItemClicked(self, index: QtCore.QModelIndex):
         """When file selector item was clicked."""
         # Read current file number
-        if not from_data:
-            fileID = int(item.toolTip())
-        else:
-            fileID = item.data(QtCore.Qt.UserRole)
+        fileID = index.data(QtCore.Qt.UserRole)
+        if fileID is None:
+            return
 
         # Update annoter
         self.annoter.SetImageID(fileID)
         # Setup UI again
         self.Setup()
+        # Prefetch : Neighbours of selected image
+        self.PrefetchTableNeighbours()
 
-    def CallbackFileAnnotationSelected(self, item: QTableWidgetItem):
+    def CallbackFileAnnotationSelected(self, index: QtCore.QModelIndex):
         """When annotations selector item was clicked."""
         # Check : Item data
-        data = item.data(QtCore.Qt.UserRole)
+        data = index.data(QtCore.Qt.UserRole)
         if data is None:
             return
 
@@ -628,6 +777,14 @@ class MainWindowGui(Ui_MainWindow):
         self.annoter.Process(forceDetector=True)
         self.Setup()
 
+    def CallbackDetected(self, requestID: int, result: tuple):
+        """Background detections finished, merge if still current image."""
+        if not self.annoter.MergeDetections(requestID, result):
+            return
+
+        # Setup : Keep image and selection, editor is not interrupted
+        self.Setup(image_refresh=False)
+
     def CallbackDetectorUpdate(self):
         """Detector update."""
         if self.annoter.detector is None:
@@ -750,15 +907,16 @@ class MainWindowGui(Ui_MainWindow):
         image_id = self.annoter.GetFileID()
         # Next table row : From image_id
         table_row = self.ImageIDToRowNumber(image_id) + 1
-        if table_row >= self.ui.fileSelectorTableWidget.rowCount():
+        if table_row >= self.filesProxy.rowCount():
             table_row = 0
         # Next image_id : From table row
         next_image_id = self.RowNumberToImageID(table_row)
 
-        # Remove QtableWidget row
+        # Remove table row
         rowIndex = self.ImageIDToRowNumber(self.annoter.GetFileID())
         if rowIndex is not None:
-            self.ui.fileSelectorTableWidget.removeRow(rowIndex)
+            for model in (self.filesModel, self.annotationsModel, self.detectionsModel):
+                model.RemoveFiles([self.annoter.GetFile()])
             # Remove annoter data
             self.annoter.Delete()
             self.annoter.SetImageID(next_image_id)
@@ -782,13 +940,14 @@ class MainWindowGui(Ui_MainWindow):
         image_id = self.annoter.GetFileID()
         # Next table row : From image_id
         table_row = self.ImageIDToRowNumber(image_id) + 1
-        if table_row >= self.ui.fileSelectorTableWidget.rowCount():
+        if table_row >= self.filesProxy.rowCount():
             table_row = 0
         # Next image_id : From table row
         next_image_id = self.RowNumberToImageID(table_row)
 
         self.annoter.SetImageID(next_image_id)
         self.Setup()
+        self.PrefetchTableNeighbours()
 
     def CallbackPrevFile(self):
         """Callback"""
@@ -796,12 +955,13 @@ class MainWindowGui(Ui_MainWindow):
         # Previous table row : From image_id
         table_row = self.ImageIDToRowNumber(image_id) - 1
         if table_row < 0:
-            table_row = self.ui.fileSelectorTableWidget.rowCount() - 1
+            table_row = self.filesProxy.rowCount() - 1
         # Previous image_id : From table row
         prev_image_id = self.RowNumberToImageID(table_row)
 
         self.annoter.SetImageID(prev_image_id)
         self.Setup()
+        self.PrefetchTableNeighbours()
 
     def CallbackOpenLocation(self):
         """Open location callback."""
@@ -841,11 +1001,183 @@ class MainWindowGui(Ui_MainWindow):
         # System settings : Store filepaths
         self.OpenedDirectoriesStore(filepath)
 
+        # Progressive : Load location in background
+        if self.args.progressive:
+            return self.LocationOpenProgressive(
+                FixPath(filepath), force_detector=force_detector
+            )
+
         self.annoter.OpenLocation(FixPath(filepath), force_detector=force_detector)
         self.SetupDefault()
         self.Setup(table_refresh=True)
+        self.LocationOpened(FixPath(filepath))
+        return True
+
+    def LocationOpened(self, dirpath: str) -> None:
+        """Location opened and all files loaded."""
+        # Watcher : Watch opened directory changes
+        if self.args.watch:
+            self.WatcherStart(dirpath)
+
+    def LocationOpenProgressive(self, dirpath: str, force_detector: bool = False):
+        """
+        Open location and load files in background, file entries are
+        viewed in chunks as they arrive.
+        """
+        # Loader : Stop previous loading, drop its pending chunks
+        if self.loader is not None:
+            self.loader.signalChunk.disconnect()
+            self.loader.signalFailed.disconnect()
+            self.loader.signalLoaded.disconnect()
+            self.LocationLoadCancel(wait=True)
+            self.loader = None
+
+        filenames = self.annoter.OpenLocationPrepare(dirpath)
+        self.SetupDefault()
+
+        # Check : Invalid or same location
+        if filenames is None:
+            self.Setup(table_refresh=True)
+            return True
+
+        # Tables : Clear before loading
+        self.filesModel.SetFiles([])
+        self.annotationsModel.SetFiles([])
+        self.detectionsModel.SetFiles([])
+        self.TablesFilter()
+        self.loaderSummary = Summary()
+
+        # Progress : Show in status bar
+        self.loaderProgressBar.setRange(0, len(filenames))
+        self.loaderProgressBar.setValue(0)
+        self.loaderProgressBar.show()
+        self.loaderCancelButton.show()
+        self.ui.statusbar.clearMessage()
+
+        # Loader : Start
+        self.loader = LocationLoaderThread(
+            self.annoter.OpenLocationScan(filenames, force_detector),
+            parent=self.window,
+        )
+        self.loader.signalChunk.connect(self.CallbackLocationChunk)
+        self.loader.signalFailed.connect(self.CallbackLocationFailed)
+        self.loader.signalLoaded.connect(self.CallbackLocationLoaded)
+        self.loader.start()
         return True
 
+    def LocationLoadCancel(self, wait: bool = False) -> None:
+        """Cancel background loading of location."""
+        if (self.loader is None) or (not self.loader.isRunning()):
+            return
+
+        self.loader.requestInterruption()
+        if wait:
+            self.loader.wait()
+
+    def CallbackLocationChunk(self, chunk: list):
+        """Chunk of location file entries loaded."""
+        isFirst = self.annoter.GetFilesCount() == 0
+        self.annoter.AppendFiles(chunk)
+
+        # Files : Filter by classes
+        files = self.annoter.FilterFiles(
+            chunk,
+            filter_annotations_classnames=self.FilterClassesGet(),
+            filter_detections_classnames=self.FilterDetectionClassesGet(),
+        )
+
+        # Tables : Append rows, filtered by proxies
+        self.filesModel.AppendFiles(chunk)
+        self.annotationsModel.AppendFiles(chunk)
+        self.detectionsModel.AppendFiles(chunk)
+
+        # Images summary : Update
+        for fileEntry in files:
+            self.loaderSummary.Add(fileEntry)
+        ViewImagesSummary.ViewSummary(self.ui.fileSummaryLabel, self.loaderSummary)
+
+        # Progress : Update
+        self.loaderProgressBar.setValue(self.annoter.scan_count)
+
+        # First chunk : View first image at once, next chunks update only
+        # progress, viewed image and its row are not set up again
+        if isFirst:
+            self.annoter.Process()
+            ViewImagesTable.Resize(self.ui.fileSelectorTableWidget)
+            self.Setup()
+        else:
+            self.SetupProgress()
+
+    def CallbackLocationFailed(self, message: str):
+        """Loading of location failed, loaded files are partial."""
+        logging.error("(MainWindow) Loading of location failed! %s", message)
+        self.ui.statusbar.showMessage(
+            f"Loading failed, only {self.annoter.GetFilesCount()} files loaded! "
+            + message
+        )
+
+    def CallbackLocationLoaded(self, isCancelled: bool):
+        """Loading of location finished."""
+        if isCancelled:
+            logging.info("(MainWindow) Loading cancelled!")
+
+        self.annoter.OpenLocationFinish(reset=False)
+
+        # Progress : Hide
+        self.loaderProgressBar.hide()
+        self.loaderCancelButton.hide()
+
+        # Tables : Resize to contents
+        ViewImagesTable.Resize(self.ui.fileSelectorTableWidget)
+        ViewAnnotations.Resize(self.ui.tableAnnotations)
+        ViewDetections.Resize(self.ui.tableDetections)
+
+        # Check : Nothing loaded
+        if self.annoter.GetFilesCount() == 0:
+            self.annoter.OpenLocationFinish()
+
+        self.Setup()
+        self.LocationOpened(self.annoter.dirpath)
+
+    def WatcherStart(self, dirpath: str) -> None:
+        """Start watching changes of directory."""
+        self.watcherTimer.stop()
+        if self.watcher is not None:
+            self.watcher.Stop()
+
+        self.watcher = DirectoryWatcher(dirpath)
+        self.watcher.Start()
+        self.watcherTimer.start()
+
+    def CallbackWatcherTimeout(self):
+        """Watcher timer callback, updates changed files rows."""
+        if self.watcher is None:
+            return
+
+        # Check : Changes of directory files
+        names = self.watcher.Poll()
+        if len(names) == 0:
+            return
+
+        # Annoter : Update file entries
+        current = self.annoter.GetFile()
+        added, removed, updated = self.annoter.UpdateFiles(names)
+        if (len(added) == 0) and (len(removed) == 0) and (len(updated) == 0):
+            return
+
+        # Tables : Update only changed rows
+        for model in (self.filesModel, self.annotationsModel, self.detectionsModel):
+            model.RemoveFiles(removed)
+            for fileEntry in updated:
+                model.UpdateFile(fileEntry)
+            model.AppendFiles(added)
+
+        # Annoter : Current file removed, process new current file
+        if any(fileEntry is current for fileEntry in removed):
+            self.annoter.Process()
+
+        self.Setup()
+
     def CallbackClose(self):
         """Close GUI callback."""
         logging.debug("Closing application!")
@@ -777,7 +777,7 @@ class Ui_MainWindow(object):
         self.tabImages.setObjectName("tabImages")
         self.verticalLayout_9 = QtWidgets.QVBoxLayout(self.tabImages)
         self.verticalLayout_9.setObjectName("verticalLayout_9")
-        self.fileSelectorTableWidget = QtWidgets.QTableWidget(self.tabImages)
+        self.fileSelectorTableWidget = QtWidgets.QTableView(self.tabImages)
         sizePolicy = QtWidgets.QSizePolicy(
             QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding
         )
@@ -801,28 +801,22 @@ class Ui_MainWindow(object):
             QtWidgets.QAbstractItemView.SelectRows
         )
         self.fileSelectorTableWidget.setObjectName("fileSelectorTableWidget")
-        self.fileSelectorTableWidget.setColumnCount(0)
-        self.fileSelectorTableWidget.setRowCount(0)
         self.verticalLayout_9.addWidget(self.fileSelectorTableWidget)
         self.tabWidget.addTab(self.tabImages, "")
         self.tabAnnotations = QtWidgets.QWidget()
         self.tabAnnotations.setObjectName("tabAnnotations")
         self.verticalLayout_10 = QtWidgets.QVBoxLayout(self.tabAnnotations)
         self.verticalLayout_10.setObjectName("verticalLayout_10")
-        self.tableAnnotations = QtWidgets.QTableWidget(self.tabAnnotations)
+        self.tableAnnotations = QtWidgets.QTableView(self.tabAnnotations)
         self.tableAnnotations.setObjectName("tableAnnotations")
-        self.tableAnnotations.setColumnCount(0)
-        self.tableAnnotations.setRowCount(0)
         self.verticalLayout_10.addWidget(self.tableAnnotations)
         self.tabWidget.addTab(self.tabAnnotations, "")
         self.tabDetections = QtWidgets.QWidget()
         self.tabDetections.setObjectName("tabDetections")
         self.verticalLayout_11 = QtWidgets.QVBoxLayout(self.tabDetections)
         self.verticalLayout_11.setObjectName("verticalLayout_11")
-        self.tableDetections = QtWidgets.QTableWidget(self.tabDetections)
+        self.tableDetections = QtWidgets.QTableView(self.tabDetections)
         self.tableDetections.setObjectName("tableDetections")
-        self.tableDetections.setColumnCount(0)
-        self.tableDetections.setRowCount(0)
         self.verticalLayout_11.addWidget(self.tableDetections)
         self.tabWidget.addTab(self.tabDetections, "")
         self.verticalLayoutRight.addWidget(self.tabWidget)
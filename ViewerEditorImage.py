@@ -10,14 +10,15 @@ from typing import Any, Optional
 
 import cv2
 import numpy as np
-from PyQt5.QtCore import QPointF, QPoint, Qt, pyqtSignal
-from PyQt5.QtGui import QPainter, QPixmap, QPen
+from PyQt5.QtCore import QPointF, QPoint, QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QPainter, QPixmap, QPen, QRegion
 from PyQt5.QtWidgets import QWidget
 
 from engine.annotators.annotator import Annotator
 from engine.annote import Annote
 import helpers.boxes as boxes
 from engine.annote_enums import AnnotatorType, AnnoteAuthorType
+from engine.thumbnails import ThumbnailLevels
 from helpers.boxes import IsInside, PointsToRect, PointToAbsolute, PointToRelative
 from helpers.images import GetFixedFitToBox
 from helpers.QtDrawing import (
@@ -80,6 +81,12 @@ class ViewerEditorImage(QWidget):
         self.isThumbnail = True
         # Background image loaded
         self.imageBg = None
+        # Annoter image version of background image
+        self.imageBgVersion: Optional[int] = None
+        # Background image converted and scaled to viewport, reused by repaints
+        self.imageBgPixmap: Optional[QPixmap] = None
+        # Miniature of background image, rendered once per image
+        self.miniaturePixmap: Optional[QPixmap] = None
         # Mode of scaling image
         self.imageScaling = self.ImageScalingResize
         # Annoter for image
@@ -106,6 +113,10 @@ class ViewerEditorImage(QWidget):
         self.mouseDragging = False
         # Miniature current position
         self.miniaturePosition = ViewerEditorImage.MiniatureLeft
+        # Miniature last painted rect (x1, y1, x2, y2)
+        self.miniatureRect: Optional[tuple] = None
+        # Hovered annotation under mouse
+        self.annotation_hovered: Optional[Annote] = None
 
         # UI init and show
         self.setMouseTracking(True)
@@ -195,8 +206,27 @@ class ViewerEditorImage(QWidget):
 
         self.annotation_selected_id = None
         self.imageBg = image
+        self.imageBgVersion = None
+        if self.annoter is not None:
+            self.imageBgVersion = self.annoter.image_version
+        self.imageBgPixmap = None
+        self.miniaturePixmap = None
         self.update()
 
+    def SyncImage(self) -> None:
+        """Use annoter image if modified (painted, transformed) since set."""
+        if (
+            (self.annoter is None)
+            or (self.imageBgVersion is None)
+            or (self.imageBgVersion == self.annoter.image_version)
+        ):
+            return
+
+        self.imageBg = self.annoter.GetImage()
+        self.imageBgVersion = self.annoter.image_version
+        self.imageBgPixmap = None
+        self.miniaturePixmap = None
+
     def SetImageScaling(self, scalingMode):
         """Sets image scaling mode."""
         self.imageScaling = scalingMode
@@ -214,6 +244,91 @@ class ViewerEditorImage(QWidget):
         width, height = self.rect().getRect()[2:]
         return width, height
 
+    def GetViewportSize(self) -> tuple[int, int]:
+        """Returns size of image viewport for current scaling mode."""
+        widgetWidth, widgetHeight = self.GetViewSize()
+        if self.imageBg is not None:
+            imHeight, imWidth = self.imageBg.shape[0:2]
+        else:
+            imWidth, imHeight = widgetWidth, widgetHeight
+
+        # Resize with aspect ratio
+        if self.imageScaling == self.ImageScalingResizeAspectRatio:
+            return GetFixedFitToBox(imWidth, imHeight, widgetWidth, widgetHeight)
+
+        # Original size
+        if self.imageScaling == self.ImageScalingOriginalSize:
+            return imWidth, imHeight
+
+        return widgetWidth, widgetHeight
+
+    def GetImagePixmap(self, width: int, height: int) -> QPixmap:
+        """Returns background image pixmap of viewport size, cached until
+        size or annoter image version changes."""
+        width, height = max(1, width), max(1, height)
+        # Check : Image modified in annoter, cached pixmap is stale
+        self.SyncImage()
+        pixmap = self.imageBgPixmap
+        if (pixmap is not None) and (pixmap.width(), pixmap.height()) == (
+            width,
+            height,
+        ):
+            return pixmap
+
+        # Check : No image, black background
+        if self.imageBg is None:
+            pixmap = QPixmap(width, height)
+            pixmap.fill(Qt.black)
+        # Scale : Numpy image first, convert only pixels shown
+        else:
+            imHeight, imWidth = self.imageBg.shape[0:2]
+            image = self.imageBg
+            if (imWidth, imHeight) != (width, height):
+                interpolation = (
+                    cv2.INTER_AREA
+                    if width * height < imWidth * imHeight
+                    else cv2.INTER_LINEAR
+                )
+                image = cv2.resize(image, (width, height), interpolation=interpolation)
+            pixmap = CvImage2QtImage(image)
+
+        self.imageBgPixmap = pixmap
+        return pixmap
+
+    def GetOverlayRegion(self, position: Optional[QPoint]) -> QRegion:
+        """Returns region of overlays (crosshair, editor shapes) at mouse."""
+        if position is None:
+            return QRegion()
+
+        # Scale : Overlays are painted in widget coords, mapped to viewport
+        widgetWidth, widgetHeight = self.GetViewSize()
+        viewportWidth, viewportHeight = self.GetViewportSize()
+        scale = max(
+            viewportWidth / max(1, widgetWidth), viewportHeight / max(1, widgetHeight)
+        )
+        x, y = position.x(), position.y()
+
+        # Crosshair
+        half = int(50 * scale) + 2
+        region = QRegion(QRect(x - half, y - half, 2 * half + 1, 2 * half + 1))
+
+        # Adding annotation rectangle
+        if (self.editorMode == self.ModeAddAnnotation) and len(self.mouseClicks):
+            click = self.mouseClicks[0]
+            region += QRect(
+                QPoint(min(x, click.x()) - 2, min(y, click.y()) - 2),
+                QPoint(max(x, click.x()) + 2, max(y, click.y()) + 2),
+            )
+
+        # Paint circle
+        if (self.editorMode == self.ModePaintCircle) and (self.imageBg is not None):
+            imWidth = self.imageBg.shape[1]
+            radius = (self.editorModeArgument / imWidth) * viewportWidth
+            half = int(radius * scale) + 2
+            region += QRect(x - half, y - half, 2 * half + 1, 2 * half + 1)
+
+        return region
+
     def GetHoveredAnnotation(self, point: tuple) -> Any:
         """Finds currently hovered annotation."""
         founded = None
@@ -250,11 +365,39 @@ class ViewerEditorImage(QWidget):
 
     def mouseMoveEvent(self, event):
         """Handle mouse move event."""
+        previousPosition = self.mousePosition
         self.mousePosition = event.pos()
         if self.mouseTrajectory is not None:
             self.mouseTrajectory.append(event.pos())
 
-        self.update()
+        # Hovered : Changed annotation highlight needs whole repaint
+        hovered = None
+        if (self.annoter is not None) and (not self.config["isAnnotationsHidden"]):
+            viewportWidth, viewportHeight = self.GetViewportSize()
+            hovered = self.GetHoveredAnnotation(
+                boxes.PointToRelative(
+                    (event.pos().x(), event.pos().y()), viewportWidth, viewportHeight
+                )
+            )
+        isHoveredChanged = hovered is not self.annotation_hovered
+        self.annotation_hovered = hovered
+
+        # Miniature : Mouse over miniature moves it
+        isMiniature = (
+            self.isThumbnail
+            and (self.miniatureRect is not None)
+            and IsInside((event.pos().x(), event.pos().y()), self.miniatureRect)
+        )
+
+        if isHoveredChanged or isMiniature or (previousPosition is None):
+            self.update()
+            return
+
+        # Repaint : Only overlays at previous and current mouse position
+        self.update(
+            self.GetOverlayRegion(previousPosition)
+            + self.GetOverlayRegion(self.mousePosition)
+        )
 
     def mousePressEvent(self, event):
         """Handle mouse event."""
@@ -405,6 +548,8 @@ class ViewerEditorImage(QWidget):
                 imPoint = PointToAbsolute(relPoint, imWidth, imHeight)
                 # Add drawing to original image
                 self.annoter.PaintCircles([imPoint], self.editorModeArgument, (0, 0, 0))
+            # Background : Painted image, cached pixmaps are stale
+            self.SyncImage()
 
         previousMode = self.editorMode
         self.__resetEditorMode(previousMode)
@@ -429,8 +574,15 @@ class ViewerEditorImage(QWidget):
         miniWidth, miniHeight = GetFixedFitToBox(
             imWidth, imHeight, miniWidth, miniHeight
         )
-        # Change cv2 image to pixmap
-        pixmap = CvImage2QtImage(cv2.resize(image, (miniWidth, miniHeight)))
+        # Change cv2 image to pixmap, once per image
+        pixmap = self.miniaturePixmap
+        if (pixmap is None) or (pixmap.width(), pixmap.height()) != (
+            miniWidth,
+            miniHeight,
+        ):
+            pixmap = self.miniaturePixmap = self.GetMiniaturePixmap(
+                image, miniWidth, miniHeight
+            )
         # Create position Qrect
         if self.miniaturePosition == ViewerEditorImage.MiniatureLeft:
             miniaturePosition = QPointF(0, 0)
@@ -450,6 +602,35 @@ class ViewerEditorImage(QWidget):
 
         # Draw on painter in QRect corner
         painter.drawPixmap(miniaturePosition, pixmap)
+        mx, my = miniaturePosition.x(), miniaturePosition.y()
+        self.miniatureRect = (mx, my, mx + miniWidth, my + miniHeight)
+
+    def GetMiniaturePixmap(
+        self, image: np.ndarray, miniWidth: int, miniHeight: int
+    ) -> QPixmap:
+        """Returns miniature pixmap, from stored thumbnail if image is
+        not modified, otherwise scaled image."""
+        # Thumbnail : Of current, not modified annoter image
+        data = None
+        if (self.annoter is not None) and (image is self.annoter.GetImage()):
+            data = self.annoter.GetImageThumbnail(ThumbnailLevels[0])
+
+        if data is not None:
+            pixmap = QPixmap()
+            if pixmap.loadFromData(data):
+                if (pixmap.width(), pixmap.height()) == (miniWidth, miniHeight):
+                    return pixmap
+
+                return pixmap.scaled(
+                    miniWidth,
+                    miniHeight,
+                    Qt.IgnoreAspectRatio,
+                    Qt.SmoothTransformation,
+                )
+
+        return CvImage2QtImage(
+            cv2.resize(image, (miniWidth, miniHeight), interpolation=cv2.INTER_AREA)
+        )
 
     def paint_selected(self, painter: QPainter, annote: Annote) -> None:
         """Draw selected annotation"""
@@ -472,6 +653,8 @@ class ViewerEditorImage(QWidget):
         """Draw on every paint event."""
         # Get Preview info width & height
         widgetWidth, widgetHeight = self.GetViewSize()
+        # Check : Image modified in annoter
+        self.SyncImage()
         # Create painter
         widgetPainter = QPainter()
         widgetPainter.begin(self)
@@ -480,12 +663,10 @@ class ViewerEditorImage(QWidget):
         if self.imageBg is not None:
             # Setup image width & height
             imHeight, imWidth = self.imageBg.shape[0:2]
-            image = self.imageBg
-        # If there is no image then fill Black and draw text
+        # If there is no image then fill Black
         else:
             # Setup image width & height
             imWidth, imHeight = self.GetViewSize()
-            image = np.zeros([imWidth, imHeight, 3], dtype=np.uint8)
 
         # ---------- Select scaling mode -----------
         # Resize
@@ -523,13 +704,13 @@ class ViewerEditorImage(QWidget):
                 )
                 mouseClicks.append(QPointF(mx * widgetWidth, my * widgetHeight))
 
-        # Draw current OpenCV image as pixmap
-        pixmap = CvImage2QtImage(image)
+        # Draw current image as pixmap, converted and scaled once per image/size
+        pixmap = self.GetImagePixmap(viewportWidth, viewportHeight)
         widgetPainter.drawPixmap(self.rect(), pixmap)
 
         # Draw miniature
-        if self.isThumbnail:
-            self.paintMiniature(widgetPainter, image)
+        if self.isThumbnail and (self.imageBg is not None):
+            self.paintMiniature(widgetPainter, self.imageBg)
 
         # Check : Annotations not hidden
         if not self.config["isAnnotationsHidden"]:
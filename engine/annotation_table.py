@@ -0,0 +1,292 @@
+"""
+    Compact table of annotations stored as structure of arrays.
+
+    - Default : File entries hold AnnotationTable instead of list[Annote],
+    - columns are numpy arrays (float32 boxes, int16 classes, float32
+      confidence, uint8 author/evaluation, float32 evaluation and HSV),
+    - items are lightweight AnnoteView objects created on demand, they
+      read and write table row, so existing Annote code keeps working.
+"""
+
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+import engine.annote as annote
+from engine.annote_enums import AnnoteAuthorType, AnnoteEvaluation
+
+
+class AnnotationTable:
+    """Structure of arrays of annotations."""
+
+    # Columns arrays names, keys of toArrays()
+    columns: tuple[str, ...] = (
+        "boxes",
+        "classes",
+        "confidences",
+        "authors",
+        "evaluations",
+        "evaluations_iou",
+        "evaluations_confidence",
+        "hsv",
+    )
+    __slots__ = (*columns, "_names")
+
+    def __init__(self, count: int = 0):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        count : int
+            Number of zeroed annotations rows.
+        """
+        self.boxes = np.zeros((count, 4), dtype=np.float32)
+        self.classes = np.zeros(count, dtype=np.int16)
+        self.confidences = np.zeros(count, dtype=np.float32)
+        self.authors = np.zeros(count, dtype=np.uint8)
+        self.evaluations = np.zeros(count, dtype=np.uint8)
+        self.evaluations_iou = np.zeros(count, dtype=np.float32)
+        self.evaluations_confidence = np.zeros(count, dtype=np.float32)
+        self.hsv = np.zeros((count, 3), dtype=np.float32)
+        # Row -> class name, only if different than class number name
+        self._names: Optional[dict[int, str]] = None
+
+    @staticmethod
+    def fromAnnotes(annotations: Iterable[annote.Annote]) -> "AnnotationTable":
+        """Creates table from Annote objects."""
+        annotations = list(annotations)
+        table = AnnotationTable(len(annotations))
+        for index, item in enumerate(annotations):
+            table.Set(index, item)
+
+        return table
+
+    @staticmethod
+    def fromArrays(
+        arrays: dict[str, np.ndarray], names: Optional[dict[int, str]] = None
+    ) -> "AnnotationTable":
+        """Creates table from columns arrays and row class names."""
+        table = AnnotationTable()
+        for name in AnnotationTable.columns:
+            column = getattr(table, name)
+            array = np.asarray(arrays[name], dtype=column.dtype)
+            # Check : Column shape
+            if array.shape[1:] != column.shape[1:]:
+                raise ValueError(f"Invalid column `{name}` shape {array.shape}!")
+            setattr(table, name, array)
+
+        # Check : Columns of same length
+        if len({len(getattr(table, name)) for name in table.columns}) != 1:
+            raise ValueError("Columns of different length!")
+
+        table._names = dict(names) if names else None
+        return table
+
+    def toArrays(self) -> dict[str, np.ndarray]:
+        """Returns columns arrays, without row class names."""
+        return {name: getattr(self, name) for name in self.columns}
+
+    @property
+    def names(self) -> dict[int, str]:
+        """Returns row class names different than class number names."""
+        return dict(self._names) if self._names is not None else {}
+
+    def toAnnotes(self) -> list[annote.Annote]:
+        """Returns independent Annote objects of all rows."""
+        annotations = []
+        for index in range(len(self)):
+            item = annote.Annote(
+                tuple(float(value) for value in self.boxes[index]),
+                classNumber=int(self.classes[index]),
+                className=self.GetClassName(index),
+                confidence=float(self.confidences[index]),
+                authorType=AnnoteAuthorType(int(self.authors[index])),
+            )
+            item.SetEvalution(
+                AnnoteEvaluation(int(self.evaluations[index])),
+                float(self.evaluations_iou[index]),
+                float(self.evaluations_confidence[index]),
+            )
+            item.hue, item.saturation, item.brightness = (
+                float(value) for value in self.hsv[index]
+            )
+            annotations.append(item)
+
+        return annotations
+
+    def __len__(self) -> int:
+        """Returns number of annotations."""
+        return len(self.classes)
+
+    def __getitem__(self, index: int) -> "AnnoteView":
+        """Returns view of annotation row."""
+        if index < 0:
+            index += len(self)
+        if (index < 0) or (index >= len(self)):
+            raise IndexError("AnnotationTable index out of range")
+
+        return AnnoteView(self, index)
+
+    def __iter__(self) -> Iterator["AnnoteView"]:
+        """Iterate views of annotation rows."""
+        return (AnnoteView(self, index) for index in range(len(self)))
+
+    def __add__(self, other) -> list[annote.Annote]:
+        """Concatenation with list, as for list[Annote]."""
+        return list(self) + list(other)
+
+    def __radd__(self, other) -> list[annote.Annote]:
+        """Concatenation with list, as for list[Annote]."""
+        return list(other) + list(self)
+
+    def Set(self, index: int, item: annote.Annote) -> None:
+        """Set row from Annote object."""
+        self.boxes[index] = item.box
+        self.classes[index] = item.classNumber
+        self.confidences[index] = item.confidence
+        self.authors[index] = item.authorType.value
+        self.evaluations[index] = item.evalution.value
+        self.evaluations_iou[index] = item.evaluation_iou
+        self.evaluations_confidence[index] = item.evaluation_confidence
+        self.hsv[index] = (item.hue, item.saturation, item.brightness)
+        self.SetClassName(index, item.className)
+
+    def GetClassName(self, index: int) -> str:
+        """Returns class name of row."""
+        if (self._names is not None) and (index in self._names):
+            return self._names[index]
+
+        return annote.GetClassName(int(self.classes[index]))
+
+    def SetClassName(self, index: int, name: str) -> None:
+        """Set class name of row, stored only if different than number name."""
+        if name == annote.GetClassName(int(self.classes[index])):
+            if self._names is not None:
+                self._names.pop(index, None)
+            return
+
+        if self._names is None:
+            self._names = {}
+        self._names[index] = name
+
+    @property
+    def class_numbers(self) -> set[int]:
+        """Returns set of class numbers."""
+        return set(np.unique(self.classes).tolist())
+
+    @property
+    def nbytes(self) -> int:
+        """Returns size of columns in bytes."""
+        return sum(getattr(self, name).nbytes for name in self.columns)
+
+
+class AnnoteView(annote.Annote):
+    """Annote view of AnnotationTable row."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: AnnotationTable, index: int):
+        """Constructor, without Annote attributes."""
+        self._table = table
+        self._index = index
+
+    @property
+    def box(self) -> tuple:
+        """Returns box."""
+        return tuple(float(value) for value in self._table.boxes[self._index])
+
+    @box.setter
+    def box(self, value) -> None:
+        self._table.boxes[self._index] = value
+
+    @property
+    def classNumber(self) -> int:
+        """Returns class number."""
+        return int(self._table.classes[self._index])
+
+    @classNumber.setter
+    def classNumber(self, value: int) -> None:
+        self._table.classes[self._index] = value
+        self._table.SetClassName(self._index, annote.GetClassName(value))
+
+    @property
+    def className(self) -> str:
+        """Returns class name."""
+        return self._table.GetClassName(self._index)
+
+    @className.setter
+    def className(self, value: str) -> None:
+        self._table.SetClassName(self._index, value)
+
+    @property
+    def confidence(self) -> float:
+        """Returns confidence."""
+        return float(self._table.confidences[self._index])
+
+    @confidence.setter
+    def confidence(self, value: float) -> None:
+        self._table.confidences[self._index] = value
+
+    @property
+    def authorType(self) -> AnnoteAuthorType:
+        """Returns author type."""
+        return AnnoteAuthorType(int(self._table.authors[self._index]))
+
+    @authorType.setter
+    def authorType(self, value: AnnoteAuthorType) -> None:
+        self._table.authors[self._index] = value.value
+
+    @property
+    def evalution(self) -> AnnoteEvaluation:
+        """Returns evaluation."""
+        return AnnoteEvaluation(int(self._table.evaluations[self._index]))
+
+    @evalution.setter
+    def evalution(self, value: AnnoteEvaluation) -> None:
+        self._table.evaluations[self._index] = value.value
+
+    @property
+    def evaluation_iou(self) -> float:
+        """Returns evaluation IOU."""
+        return float(self._table.evaluations_iou[self._index])
+
+    @evaluation_iou.setter
+    def evaluation_iou(self, value: float) -> None:
+        self._table.evaluations_iou[self._index] = value
+
+    @property
+    def evaluation_confidence(self) -> float:
+        """Returns evaluation confidence."""
+        return float(self._table.evaluations_confidence[self._index])
+
+    @evaluation_confidence.setter
+    def evaluation_confidence(self, value: float) -> None:
+        self._table.evaluations_confidence[self._index] = value
+
+    @property
+    def hue(self) -> float:
+        """Returns hue."""
+        return float(self._table.hsv[self._index, 0])
+
+    @hue.setter
+    def hue(self, value: float) -> None:
+        self._table.hsv[self._index, 0] = value
+
+    @property
+    def saturation(self) -> float:
+        """Returns saturation."""
+        return float(self._table.hsv[self._index, 1])
+
+    @saturation.setter
+    def saturation(self, value: float) -> None:
+        self._table.hsv[self._index, 1] = value
+
+    @property
+    def brightness(self) -> float:
+        """Returns brightness."""
+        return float(self._table.hsv[self._index, 2])
+
+    @brightness.setter
+    def brightness(self, value: float) -> None:
+        self._table.hsv[self._index, 2] = value
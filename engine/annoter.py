@@ -6,16 +6,26 @@ Created on 17 lis 2020
 
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from math import sqrt
-from typing import Optional
+from typing import Iterator, Optional
 
 import cv2
 import numpy as np
-from tqdm import tqdm
 
 import engine.annote as annote
+from engine.annotation_table import AnnotationTable
 from engine.dataset import Dataset
+from engine.detection_cache import DetectionCache
+from engine.detection_worker import DetectionWorker
+from engine.files_summary import FilesSummary
+from engine.frame_cache import FrameCache
+from engine.prefetcher import Prefetcher
+from engine.scan_index import ScanIndex
+from engine.scanner import MarkDuplicates, ScanFile, Scanner, ScanMode
+from engine.thumbnails import ThumbnailGenerator, ThumbnailStore
 import helpers.boxes as boxes
 import helpers.prefilters as prefilters
 import helpers.transformations as transformations
@@ -32,15 +42,18 @@ from helpers.files import (
     IsImageFile,
 )
 from helpers.metrics import EvaluateMetrics, Metrics
+from helpers.visuals import Visuals, VisualsDuplicates, VisualsStore
+from helpers.writer import BufferedWriter, WriteAtomic
 from helpers.textAnnotations import (
     DeleteAnnotations,
     IsExistsAnnotations,
-    ReadAnnotations,
-    ReadDetections,
+    ReadAnnotationsArrays,
+    ReadDetectionsArrays,
     SaveAnnotations,
     SaveDetections,
+    ToAnnotations,
+    ToDetections,
 )
-from helpers.visuals import Visuals, VisualsDuplicates
 
 
 class DetectorSelected(str, Enum):
@@ -75,6 +88,12 @@ class Annoter:
         forceDetector=False,
         detectorConfidence: float = 0.4,
         detectorNms: float = 0.45,
+        scanWorkers: int = 1,
+        scanMode: ScanMode = ScanMode.Processes,
+        scanIndex: bool = True,
+        visualsStore: bool = False,
+        detectionCache: bool = True,
+        thumbnails: bool = True,
     ) -> None:
         """
         Constructor
@@ -88,6 +107,12 @@ class Annoter:
             "isOnlyErrorFiles": isOnlyErrorFiles,
             "isOnlyDetectedClass": isOnlyDetectedClass,
             "isOnlySpecificClass": isOnlySpecificClass,
+            "scanWorkers": scanWorkers,
+            "scanMode": scanMode,
+            "scanIndex": scanIndex,
+            "visualsStore": visualsStore,
+            "detectionCache": detectionCache,
+            "thumbnails": thumbnails,
         }
         # Yolo World handle
         self.yolo_world = None
@@ -95,6 +120,15 @@ class Annoter:
         self.yolo_world_ontology = {"bus": "g.autobusy"}
         # Path
         self.dirpath = None
+        # Directory files scanner
+        self.scanner = Scanner(workers=scanWorkers, mode=scanMode)
+        # Directory persistent scan index
+        self.scan_index = ScanIndex()
+        # Directory visuals store
+        self.visuals_store = VisualsStore()
+        # Directory thumbnails, generated in background
+        self.thumbnails = ThumbnailStore()
+        self.thumbnail_generator = ThumbnailGenerator(self.thumbnails)
         # Detector handle
         self.detector = detector
         self.is_detector_enabled = not noDetector
@@ -106,12 +140,32 @@ class Annoter:
         self.nms = detectorNms
         # Detector : NMS method
         self.nmsMethod = NmsMethod.Nms
+        # Detector : Lock for calls from loading thread
+        self.detector_lock = threading.Lock()
 
         # Selection of detector:
         self.detector_selected = DetectorSelected.Default
+        # Decoded images frames, shared by scan, detector and view
+        self.frame_cache = FrameCache(capacity=max(32, 2 * self.detector_batch))
+        # Background writer of annotations and detections files
+        self.writer = BufferedWriter()
+        # Read-ahead of neighbouring images and detections
+        self.prefetcher = Prefetcher(self.frame_cache)
+        # Number of prefetched images before and after current one
+        self.prefetch_depth = 2
+        # Persistent detections, keyed by image content and detector settings
+        self.detection_cache = DetectionCache()
+        if detectionCache:
+            self.detection_cache.Open()
+        # Background detector requests, asynchronous if callback is set
+        self.detection_worker = DetectionWorker()
 
         # File entries list
         self.files: Optional[list[dict]] = None
+        # Summary of file entries, updated with every file entry change
+        self.summary = FilesSummary()
+        # Number of files scanned while opening location
+        self.scan_count = 0
         # Validation dataset
         self.dataset_validation = Dataset()
         # Annotations list
@@ -120,6 +174,10 @@ class Annoter:
         self.annotations_copy: list[annote.Annote] = []
         # Readed image cv2 object
         self.image = None
+        # Modifications counter of image (painted, transformed)
+        self.image_version = 0
+        # Modifications counter when image was read from file
+        self.image_read_version = 0
         # Current file number offset
         self.offset = 0
         # Set of all errors
@@ -165,9 +223,9 @@ class Annoter:
         """Read file annotations if possible."""
         txtAnnotes = []
         # If exists annotations file
-        if IsExistsAnnotations(filepath):
-            txtAnnotes = ReadAnnotations(filepath)
-            txtAnnotes = [annote.fromTxtAnnote(el) for el in txtAnnotes]
+        arrays = ReadAnnotationsArrays(filepath, writer=self.writer)
+        if arrays is not None:
+            txtAnnotes = [annote.fromTxtAnnote(el) for el in ToAnnotations(arrays)]
 
             # Post-check of errors
             self.errors = self.__checkOfErrors()
@@ -183,8 +241,7 @@ class Annoter:
             return None
 
         try:
-            image = cv2.imread(filepath)
-            return image
+            return self.frame_cache.Read(filepath)
 
         except Exception as e:
             logging.fatal(
@@ -196,17 +253,88 @@ class Annoter:
         """Read file annotations if possible."""
 
         # Selecte extension str
-        extension_str = ".detector"
+        extension_str = self.detections_extension
+
+        # Detector annotations, empty if file not exists
+        arrays = ReadDetectionsArrays(
+            filepath, extension=extension_str, writer=self.writer
+        )
+        detAnnotes = ToDetections(arrays)
+        return [annote.fromDetection(el) for el in detAnnotes]
+
+    @property
+    def detections_extension(self) -> str:
+        """Returns extension of selected detector annotations file."""
         if self.detector_selected == DetectorSelected.YoloWorld:
-            extension_str = ".yoloworld"
+            return ".yoloworld"
 
-        detAnnotes = []
-        # If detector annotations not exists then call detector
-        if IsExistsAnnotations(filepath, extension=extension_str):
-            detAnnotes = ReadDetections(filepath, extension=extension_str)
-            detAnnotes = [annote.fromDetection(el) for el in detAnnotes]
+        return ".detector"
 
-        return detAnnotes
+    @property
+    def detector_batch(self) -> int:
+        """Returns number of images processed by single detector call."""
+        if (self.detector is None) or (
+            self.detector_selected != DetectorSelected.Default
+        ):
+            return 1
+
+        return self.detector.batchSize
+
+    def DetectFiles(self, filepaths: list[str]) -> list[list]:
+        """Read images files and process detections of all at once."""
+        # Images : Read concurrently, BGR -> RGB
+        with ThreadPoolExecutor(max_workers=max(1, len(filepaths))) as executor:
+            images = list(executor.map(self.GetFileImage, filepaths))
+        images = [
+            cv2.cvtColor(im, cv2.COLOR_BGR2RGB) if im is not None else None
+            for im in images
+        ]
+
+        # Detector : Not batched detector, image by image
+        if self.detector_batch <= 1:
+            return [
+                self.ProcessDetections(im, filepath)
+                for im, filepath in zip(images, filepaths)
+            ]
+
+        # Detector : Cached detections, batch of other readed images
+        keys = [self.GetDetectionKey(filepath) for filepath in filepaths]
+        batchDetections = [self.detection_cache.Get(key) for key in keys]
+        indexes = [
+            index
+            for index, im in enumerate(images)
+            if (im is not None) and (batchDetections[index] is None)
+        ]
+        if len(indexes):
+            with self.detector_lock:
+                detected = self.detector.DetectBatch(
+                    [images[index] for index in indexes],
+                    confidence=self.confidence,
+                    nms_thresh=self.nms,
+                    boxRelative=True,
+                    nmsMethod=self.nmsMethod,
+                    image_strategy=self.imageStrategy,
+                )
+            for index, detAnnotes in zip(indexes, detected):
+                self.detection_cache.Put(keys[index], detAnnotes)
+                batchDetections[index] = detAnnotes
+
+        results = [[] for _ in filepaths]
+        for index, detAnnotes in enumerate(batchDetections):
+            if detAnnotes is None:
+                continue
+
+            # Save/Update detector annotations file
+            SaveDetections(
+                filepaths[index],
+                detAnnotes,
+                extension=".detector",
+                writer=self.writer,
+                isChangedOnly=True,
+            )
+            results[index] = [annote.fromDetection(el) for el in detAnnotes]
+
+        return results
 
     def ProcessDetections(self, im: np.array, filepath: str) -> list:
         """Process detections for file."""
@@ -223,23 +351,113 @@ class Annoter:
         if (self.detector is None) or (im is None):
             return []
 
-        # Call detector manually!
-        detAnnotes = self.detector.Detect(
-            im,
-            confidence=self.confidence,
-            nms_thresh=self.nms,
-            boxRelative=True,
-            nmsMethod=self.nmsMethod,
-            image_strategy=self.imageStrategy,
+        # Detector : Prefetched, cached detections or call detector manually!
+        detAnnotes = self.prefetcher.GetDetections(filepath, self.detector_settings)
+        if detAnnotes is None:
+            detAnnotes = self.DetectYolov4(im, filepath)
+
+        # Save/Update detector annotations file, if changed
+        SaveDetections(
+            filepath,
+            detAnnotes,
+            extension=".detector",
+            writer=self.writer,
+            isChangedOnly=True,
         )
 
-        # Save/Update detector annotations file
-        SaveDetections(filepath, detAnnotes, extension=".detector")
-
         # Create annotes
         detAnnotes = [annote.fromDetection(el) for el in detAnnotes]
         return detAnnotes
 
+    def DetectYolov4(self, im: np.ndarray, filepath: Optional[str] = None) -> list:
+        """Detect RGB image with default detector, returns raw detections."""
+        # Check : Cached detections of same image content and settings
+        key = self.GetDetectionKey(filepath) if filepath is not None else None
+        detections = self.detection_cache.Get(key)
+        if detections is not None:
+            return detections
+
+        with self.detector_lock:
+            detections = self.detector.Detect(
+                im,
+                confidence=self.confidence,
+                nms_thresh=self.nms,
+                boxRelative=True,
+                nmsMethod=self.nmsMethod,
+                image_strategy=self.imageStrategy,
+            )
+
+        self.detection_cache.Put(key, detections)
+        return detections
+
+    def GetDetectionKey(self, filepath: str) -> Optional[str]:
+        """Returns detection cache key of file for default detector settings."""
+        if (self.detector is None) or (not self.detection_cache.is_open):
+            return None
+
+        return DetectionCache.Key(
+            filepath,
+            self.detector.signature,
+            self.confidence,
+            self.nms,
+            self.nmsMethod,
+            self.imageStrategy,
+        )
+
+    @property
+    def detector_settings(self) -> tuple:
+        """Returns settings of default detector, key of prefetched detections."""
+        return (
+            id(self.detector),
+            self.confidence,
+            self.nms,
+            self.nmsMethod,
+            self.imageStrategy,
+        )
+
+    def Prefetch(self, fileIDs: list[int]) -> None:
+        """Prefetch images (and detections) of file IDs, nearest first."""
+        if not self.files:
+            return
+
+        # Paths : Find file entries of IDs, stop when all found
+        paths = {}
+        wanted = set(fileIDs)
+        for fileEntry in self.files:
+            if fileEntry["ID"] in wanted:
+                paths[fileEntry["ID"]] = fileEntry["Path"]
+                if len(paths) == len(wanted):
+                    break
+        filepaths = [paths[fileID] for fileID in fileIDs if fileID in paths]
+
+        # Detector : Precompute only default detector detections
+        def detect(im: np.ndarray, filepath: str) -> list:
+            return self.DetectYolov4(cv2.cvtColor(im, cv2.COLOR_BGR2RGB), filepath)
+
+        isDetect = (
+            self.is_detector_enabled
+            and (self.detector is not None)
+            and (self.detector_selected == DetectorSelected.Default)
+        )
+        self.prefetcher.Prefetch(
+            filepaths,
+            detect=detect if isDetect else None,
+            detectKey=self.detector_settings,
+        )
+
+    def PrefetchNeighbours(self) -> None:
+        """Prefetch images before and after current one, in files order."""
+        if not self.files:
+            return
+
+        fileIDs = []
+        for distance in range(1, self.prefetch_depth + 1):
+            for index in (self.offset + distance, self.offset - distance):
+                if 0 <= index < len(self.files):
+                    fileIDs.append(self.files[index]["ID"])
+
+        self.Prefetch(fileIDs)
+
     def ProcessYoloWorldDetections(self, im, filepath) -> list:
         """Read file annotations if possible."""
         if (self.yolo_world is None) or (im is None):
@@ -274,34 +492,45 @@ class Annoter:
 
     def OpenLocation(self, path: str, force_detector: bool = False):
         """Open images/annotations location."""
+        filenames = self.OpenLocationPrepare(path)
+        if filenames is None:
+            return
+
+        # Files : Scan all files
+        self.files = list(self.OpenLocationScan(filenames, force_detector))
+        self.summary.Reset(self.files)
+        self.OpenLocationFinish()
+
+    def OpenLocationPrepare(self, path: str) -> Optional[list[str]]:
+        """
+        Prepare opening of images/annotations location.
+
+        Returns
+        -------
+        list[str]
+            Image filenames to scan, in order of sort method or None
+            if location is invalid or already opened.
+        """
         # Check : If path is valid
         if (path is None) or (len(path) == 0):
             logging.error("(Annoter) Path `%s` not exists!", path)
-            return
+            return None
 
         # Check : If path exists
         if not os.path.exists(path):
             logging.error("(Annoter) Path `%s` not exists!", path)
-            return
+            return None
 
         # Check : Path is same
         if self.dirpath == path:
             logging.info("(Annoter) Path `%s` is same!", path)
-            return
-
-        # Force detector : Update from config
-        if force_detector is False:
-            force_detector = self.config["forceDetector"]
+            return None
 
         # Update dirpath
         self.dirpath = path
         # filter only images and not excludes
         excludes = [".", "..", "./", ".directory"]
 
-        if not os.path.exists(path):
-            logging.error("(Annoter) Path `%s` not exists!", path)
-            return
-
         # Fiels : List all directory files and exclude not needed.
         filesToParse = [
             filename
@@ -309,79 +538,148 @@ class Annoter:
             if (filename not in excludes) and (IsImageFile(filename))
         ]
 
-        # Dataset Validation : Read from filepath
+        # Sorting : Scan files in order of view, first entries are first rows.
+        if self.config["sortMethod"] in (self.SortByDatetime, self.SortByInvDatetime):
+            filesToParse = sorted(
+                filesToParse,
+                key=lambda filename: os.lstat(path + filename).st_mtime,
+                reverse=self.config["sortMethod"] == self.SortByInvDatetime,
+            )
+        elif self.config["sortMethod"] == self.SortByAlphabet:
+            filesToParse = sorted(filesToParse)
+
+        # Prefetcher : Drop prefetches of previous location
+        self.prefetcher.Clear()
+
+        # Thumbnails : Open directory store, generate missing in background
+        self.thumbnail_generator.Clear()
+        self.thumbnail_generator.Wait()
+        self.thumbnails.Close()
+        if (self.config["thumbnails"] is True) and self.thumbnails.Open(path):
+            self.thumbnails.Prune(filesToParse)
+            self.thumbnail_generator.Generate(
+                [path + filename for filename in filesToParse]
+            )
+
+        # Dataset Validation : Save changes of previous location, read from filepath
+        self.dataset_validation.flush(force=True)
         self.dataset_validation.load(FixPath(self.dirpath) + "validation.txt")
 
-        # VisualsDuplicates : Create to find duplicates
-        visualsDuplicates = VisualsDuplicates()
-        # Files : List of all files
+        # Files : Empty until scanned
         self.files = []
-        # Processing all files
-        # startTime = time.time()
-        for index, filename in enumerate(
-            tqdm(filesToParse, desc="Processing files", unit="files")
-        ):
-            # Check if annotations exists
-            isAnnotation = IsExistsAnnotations(path + filename)
+        self.summary.Reset()
+        self.scan_count = 0
+        return filesToParse
 
-            # Read annotations
-            txtAnnotations = self.GetFileAnnotations(path + filename)
+    def OpenLocationScan(
+        self, filenames: list[str], force_detector: bool = False
+    ) -> Iterator[dict]:
+        """Scan location files and yield file entries passing filters."""
+        path = self.dirpath
 
-            # Force detector if needed
-            detections = []
-            # Force detector to process every image
-            if force_detector is True:
-                im = self.GetFileImage(path + filename)
-                im_rgb = cv2.cvtColor(im, cv2.COLOR_BGR2RGB)
-                detections = self.ProcessDetections(im_rgb, path + filename)
+        # Writer : Barrier, scanner reads files from disk
+        self.writer.Flush(fsync=False)
 
-            # Read historical detections
-            else:
-                detections = self.ReadDetections(path + filename)
+        # Force detector : Update from config
+        if force_detector is False:
+            force_detector = self.config["forceDetector"]
 
-            # For calculation : Filter detections with itself for multiple detections catches.
-            detections = prefilters.filter_iou_by_confidence(detections, detections)
+        # Detector : Force detector to process every image
+        detect = None
+        if force_detector is True:
+            detect = self.DetectFiles
 
-            # For view : Filter by IOU internal with same annotes and also with txt annotes.
-            detections_filtered = prefilters.filter_iou_by_confidence(
-                detections, detections + txtAnnotations
+        # Index : Open directory scan index
+        if self.config["scanIndex"] is True:
+            self.scan_index.Open(
+                path,
+                meta=f"{self.detections_extension}:{','.join(annote.GetClasses())}",
             )
 
-            # Calculate metrics
-            metrics = self.CalculateYoloMetrics(txtAnnotations, detections)
-            # Calculate visuals
-            visuals = Visuals.LoadCreate(
-                path + filename, force=self.config["forceDetector"]
-            )
-            # Visuals : Check dhash is in duplicates
-            visuals.isDuplicate = visualsDuplicates.IsDuplicate(visuals)
-            # VisualsDuplicates : Update set of image hashes
-            visualsDuplicates.Add(visuals)
-
-            # Text annotations : Update annotations visuals
-            for annote_item in txtAnnotations:
-                annote_item.update_hsv_from_grid(visuals.numpy_grid)
-
-            # Add file entry
-            self.files.append(
-                {
-                    "Name": filename,
-                    "Path": path + filename,
-                    "ID": index,
-                    "IsAnnotation": isAnnotation,
-                    "IsValidation": self.dataset_validation.is_inside(filename),
-                    "Annotations": txtAnnotations,
-                    "AnnotationsClasses": ", ".join(
-                        {f"{item.class_abbrev}" for item in txtAnnotations}
-                    ),
-                    "Datetime": os.lstat(path + filename).st_mtime,
-                    "Errors": len(self.errors),
-                    "Detections": detections_filtered,
-                    "Detections_original": detections,
-                    "Metrics": metrics,
-                    "Visuals": visuals,
-                }
+        # Visuals store : Open directory visuals store
+        if self.config["visualsStore"] is True:
+            self.visuals_store.Open(path)
+
+        # VisualsDuplicates : Find duplicates in order of files
+        visualsDuplicates = VisualsDuplicates()
+        isCompleted = False
+        try:
+            for fileEntry in self.scanner.Scan(
+                path,
+                filenames,
+                detect=detect,
+                detectBatch=self.detector_batch,
+                frameCache=self.frame_cache,
+                detectionsExtension=self.detections_extension,
+                forceVisuals=self.config["forceDetector"],
+                scanIndex=self.scan_index if self.scan_index.is_open else None,
+                visualsStore=self.visuals_store if self.visuals_store.is_open else None,
+            ):
+                self.scan_count += 1
+
+                # File entry : Update validation dataset membership
+                fileEntry["IsValidation"] = self.dataset_validation.is_inside(
+                    fileEntry["Name"]
+                )
+
+                # Visuals : Check near duplicates and update index
+                visuals = fileEntry["Visuals"]
+                visuals.isDuplicate = visualsDuplicates.Add(visuals)
+
+                if self.IsFileEntryIncluded(fileEntry):
+                    yield fileEntry
+
+            isCompleted = True
+
+        finally:
+            # Index : Remove not existing files and close
+            if self.scan_index.is_open:
+                if isCompleted:
+                    self.scan_index.Prune(filenames)
+                self.scan_index.Close()
+
+            # Visuals store : Remove not existing files, save and close
+            if self.visuals_store.is_open:
+                if isCompleted:
+                    self.visuals_store.Prune(filenames)
+                self.visuals_store.Close()
+
+    def IsFileEntryIncluded(self, fileEntry: dict) -> bool:
+        """True if file entry passes configured filters."""
+        # Use only not annotated files
+        if (self.config["isOnlyNewFiles"] is True) and fileEntry["IsAnnotation"]:
+            return False
+
+        # Use only files with errors
+        if (self.config["isOnlyErrorFiles"] is True) and (fileEntry["Errors"] == 0):
+            return False
+
+        # Use only files with specific class
+        if self.config["isOnlySpecificClass"] is not None:
+            annotations = self.AnnotationsSelectClasses(
+                fileEntry["Annotations"], [self.config["isOnlySpecificClass"]]
             )
+            if (annotations is None) or (len(annotations) == 0):
+                return False
+
+        return True
+
+    def AppendFiles(self, files: list[dict]) -> None:
+        """Append scanned file entries, e.g. chunk of progressive loading."""
+        self.files.extend(files)
+        for fileEntry in files:
+            self.summary.Add(fileEntry)
+
+    def OpenLocationFinish(self, reset: bool = True) -> None:
+        """
+        Finish opening of location, sort scanned files.
+
+        Parameters
+        ----------
+        reset : bool
+            Reset current file, otherwise keep current file entry.
+        """
+        current = self.GetFile()
 
         # ------- Sorting ------------
         # Sorting : by datetime
@@ -393,43 +691,143 @@ class Annoter:
         elif self.config["sortMethod"] == self.SortByAlphabet:
             self.files = sorted(self.files, key=lambda i: i["Name"])
 
-        # ------- Filtering  ------------
-        # Use only not annotated files
-        if self.config["isOnlyNewFiles"] is True:
-            newFiles = []
-            for offset, fileEntry in enumerate(self.files):
-                if not fileEntry["IsAnnotation"]:
-                    newFiles.append(fileEntry)
+        # Current : Keep current file entry
+        if not reset:
+            if current is not None:
+                self.offset = self.files.index(current)
+            return
 
-            self.files = newFiles
+        # Reset values at the end
+        self.annotations = []
+        self.image = None
+        self.offset = 0
+        self.errors = set()
 
-        # Use only files with errors
-        if self.config["isOnlyErrorFiles"] is True:
-            filesWithErrors = []
-            for index, fileEntry in enumerate(self.files):
-                if fileEntry["Errors"] != 0:
-                    filesWithErrors.append(fileEntry)
+    def UpdateFiles(self, names: set[str]) -> tuple[list, list, list]:
+        """
+        Update file entries in place for changed directory files.
+
+        Parameters
+        ----------
+        names : set[str]
+            Changed filenames (images or annotations sidecars), visuals
+            sidecars are skipped because they are written by scan itself.
+
+        Returns
+        -------
+        tuple
+            Lists of added, removed and updated file entries, added only
+            if passing configured filters, updated also if duplicate
+            state changed.
+        """
+        added, removed, updated = [], [], []
+        if (self.files is None) or (self.dirpath is None) or (len(names) == 0):
+            return added, removed, updated
 
-            # Swap with files
-            self.files = filesWithErrors
+        # Entries : Map filename without extension to file entry
+        entries = {
+            GetFilename(fileEntry["Name"]): fileEntry for fileEntry in self.files
+        }
 
-        # Use only files with specific class
-        if self.config["isOnlySpecificClass"] is not None:
-            filesForClass = []
-            for offset, fileEntry in enumerate(self.files):
-                annotations = self.AnnotationsSelectClasses(
-                    fileEntry["Annotations"], [self.config["isOnlySpecificClass"]]
+        # Images : Changed images or images of changed sidecars
+        images = set()
+        for name in names:
+            if IsImageFile(name):
+                images.add(name)
+            elif GetFilename(name) in entries:
+                images.add(entries[GetFilename(name)]["Name"])
+
+        # Visuals store : Open directory visuals store
+        if self.config["visualsStore"] is True:
+            self.visuals_store.Open(self.dirpath)
+
+        nextID = max((fileEntry["ID"] for fileEntry in self.files), default=-1) + 1
+        for name in sorted(images):
+            fileEntry = entries.get(GetFilename(name))
+            if (fileEntry is not None) and (fileEntry["Name"] != name):
+                fileEntry = None
+            isExisting = os.path.isfile(self.dirpath + name)
+
+            # Removed : Drop file entry
+            if (fileEntry is not None) and (not isExisting):
+                index = self.files.index(fileEntry)
+                self.files.pop(index)
+                self.summary.Remove(fileEntry)
+                if index < self.offset:
+                    self.offset -= 1
+                removed.append(fileEntry)
+                continue
+
+            # Check : Not existing and not known
+            if not isExisting:
+                continue
+
+            # Visuals : Load or create with visuals store
+            visuals = None
+            if self.visuals_store.is_open:
+                visuals = Visuals.LoadCreate(
+                    self.dirpath + name, store=self.visuals_store
                 )
-                if (annotations is not None) and (len(annotations) != 0):
-                    filesForClass.append(fileEntry)
 
-            self.files = filesForClass
+            # Added or updated : Scan file again
+            newEntry = ScanFile(
+                self.dirpath,
+                name,
+                nextID if fileEntry is None else fileEntry["ID"],
+                detectionsExtension=self.detections_extension,
+                visuals=visuals,
+            )
+            newEntry["IsValidation"] = self.dataset_validation.is_inside(name)
 
-        # Reset values at the end
-        self.annotations = []
-        self.image = None
-        self.offset = 0
-        self.errors = set()
+            if fileEntry is None:
+                # Check : Added file passes configured filters
+                if not self.IsFileEntryIncluded(newEntry):
+                    continue
+
+                self.files.append(newEntry)
+                added.append(newEntry)
+                nextID += 1
+            else:
+                self.files[self.files.index(fileEntry)] = newEntry
+                updated.append(newEntry)
+            self.summary.Add(newEntry)
+
+        # Visuals store : Save and close
+        self.visuals_store.Close()
+
+        # Offset : Keep in range
+        self.offset = max(0, min(self.offset, self.GetFilesCount() - 1))
+
+        # Visuals : Find duplicates again, entries with changed duplicate
+        # state are updated too
+        if len(added) or len(removed) or len(updated):
+            changed = {fileEntry["ID"] for fileEntry in added + updated}
+            states = {
+                fileEntry["ID"]: self.GetDuplicateState(fileEntry)
+                for fileEntry in self.files
+                if fileEntry["ID"] not in changed
+            }
+            MarkDuplicates(self.files)
+            updated.extend(
+                fileEntry
+                for fileEntry in self.files
+                if (fileEntry["ID"] in states)
+                and (states[fileEntry["ID"]] != self.GetDuplicateState(fileEntry))
+            )
+
+        logging.info(
+            "(Annoter) Files updated: %u added, %u removed, %u updated.",
+            len(added),
+            len(removed),
+            len(updated),
+        )
+        return added, removed, updated
+
+    @staticmethod
+    def GetDuplicateState(fileEntry: dict) -> tuple[bool, int]:
+        """Returns duplicate flag and group of file entry visuals."""
+        visuals: Visuals = fileEntry["Visuals"]
+        return visuals.isDuplicate, visuals.duplicateGroup
 
     def GetFile(self):
         """Returns current filepath."""
@@ -458,6 +856,14 @@ class Annoter:
         """Returns current image."""
         return self.image
 
+    def GetImageThumbnail(self, level: int) -> Optional[bytes]:
+        """Returns encoded thumbnail of current image, None if image was
+        modified since read or thumbnail is not generated yet."""
+        if (self.image is None) or (self.image_version != self.image_read_version):
+            return None
+
+        return self.thumbnails.Get(self.GetFilepath(), level)
+
     def GetImageSize(self):
         """Returns current image."""
         if self.image is not None:
@@ -480,34 +886,55 @@ class Annoter:
         if (self.files is None) or (len(self.files) == 0):
             return None
 
-        # Filter : Iterating over all files
-        files = []
-        for fileEntry in self.files:
-            # Filter : Classes of annotations
-            if (filter_annotations_classnames is not None) and (
-                len(filter_annotations_classnames) > 0
-            ):
-                annotations = fileEntry["Annotations"]
-                if not any(
-                    annotation.className in filter_annotations_classnames
-                    for annotation in annotations
-                ):
-                    continue
+        return self.FilterFiles(
+            self.files, filter_annotations_classnames, filter_detections_classnames
+        )
+
+    @staticmethod
+    def FilterFiles(
+        files: list[dict],
+        filter_annotations_classnames: list[str] = None,
+        filter_detections_classnames: list[str] = None,
+    ) -> list[dict]:
+        """Returns files with annotations/detections of given classes."""
+        return [
+            fileEntry
+            for fileEntry in files
+            if Annoter.IsFileEntryMatching(
+                fileEntry, filter_annotations_classnames, filter_detections_classnames
+            )
+        ]
 
-            # Filter : Classes of detections
-            if (filter_detections_classnames is not None) and (
-                len(filter_detections_classnames) > 0
+    @staticmethod
+    def IsFileEntryMatching(
+        fileEntry: dict,
+        filter_annotations_classnames: list[str] = None,
+        filter_detections_classnames: list[str] = None,
+    ) -> bool:
+        """True if file has annotations/detections of given classes."""
+        # Filter : Classes of annotations
+        if (filter_annotations_classnames is not None) and (
+            len(filter_annotations_classnames) > 0
+        ):
+            annotations = fileEntry["Annotations"]
+            if not any(
+                annotation.className in filter_annotations_classnames
+                for annotation in annotations
             ):
-                detections = fileEntry["Detections_original"]
-                if not any(
-                    annotation.className in filter_detections_classnames
-                    for annotation in detections
-                ):
-                    continue
+                return False
 
-            files.append(fileEntry)
+        # Filter : Classes of detections
+        if (filter_detections_classnames is not None) and (
+            len(filter_detections_classnames) > 0
+        ):
+            detections = fileEntry["Detections_original"]
+            if not any(
+                annotation.className in filter_detections_classnames
+                for annotation in detections
+            ):
+                return False
 
-        return files
+        return True
 
     def GetFileID(self):
         """Returns current image ID."""
@@ -533,12 +960,7 @@ class Annoter:
 
     def GetFilesAnnotatedCount(self) -> int:
         """Returns count of processed images number."""
-        # Check : Files exists
-        if (self.files is None) or (len(self.files) == 0):
-            return 0
-
-        annotated = sum([int(fileEntry["IsAnnotation"]) for fileEntry in self.files])
-        return annotated
+        return self.summary.annotated
 
     def SetImageID(self, fileID: int):
         """Sets current image number."""
@@ -577,12 +999,18 @@ class Annoter:
         for a in self.annotations:
             a.authorType = annote.AnnoteAuthorType.byHuman
         self.errors.add("ImageModified!")
+        self.image_version += 1
 
     def PaintCircles(self, points, radius, color):
         """Paint list of circles Circle on image."""
+        # Image : Cached frames are read-only, paint on copy
+        if not self.image.flags.writeable:
+            self.image = self.image.copy()
+
         for x, y in points:
             self.image = cv2.circle(self.image, (round(x), round(y)), radius, color, -1)
         self.errors.add("ImageModified!")
+        self.image_version += 1
 
     def GetAnnotations(self):
         """Returns current annotations."""
@@ -679,9 +1107,11 @@ class Annoter:
         # If entry exists then delete it
         if fileEntry is not None:
             self.ClearAnnotations()
+            self.writer.Discard(GetFilename(fileEntry["Path"]) + ".txt")
             DeleteAnnotations(fileEntry["Path"])
             DeleteFile(fileEntry["Path"])
             self.files.remove(fileEntry)
+            self.summary.Remove(fileEntry)
 
             # Step back offset
             self.offset = min(self.offset, self.GetFilesCount() - 1)
@@ -703,14 +1133,14 @@ class Annoter:
         else:
             self.dataset_validation.add(filename)
 
-        # Dataset : Save if needed
-        if self.dataset_validation.is_not_saved():
-            self.dataset_validation.save()
+        # Dataset : Save coalesced changes
+        self.dataset_validation.flush()
 
         # File entry : Update
         self.files[self.offset]["IsValidation"] = self.dataset_validation.is_inside(
             filename
         )
+        self.summary.Update(self.files[self.offset])
 
     def Save(self):
         """Save current annotations."""
@@ -718,18 +1148,14 @@ class Annoter:
 
         # If image was modified, then save it also
         if self.__isClearImageSynchronized() is False:
-            # Create temporary and original paths
+            # Original image path
             imgpath = FixPath(self.dirpath) + filename
-            tmppath = FixPath(self.dirpath) + "tmp" + GetExtension(filename)
-            # Save temporary image
-            result = cv2.imwrite(tmppath, self.image)
-            if result is False:
+            # Encode image and atomic replace of original image
+            result, data = cv2.imencode(GetExtension(filename), self.image)
+            if (result is False) or (not WriteAtomic(imgpath, data.tobytes())):
                 logging.error('(Annoter) Writing image "%s" failed!', imgpath)
                 return
 
-            # If saved then atomic move image to original image
-            os.system('mv -fv "%s" "%s" ' % (tmppath, imgpath))
-
         # Check other errors
         self.errors = self.__checkOfErrors()
         if len(self.errors) != 0:
@@ -738,12 +1164,11 @@ class Annoter:
 
         # Save annotations
         annotations = [annote.toTxtAnnote(el) for el in self.annotations]
-        annotations = SaveAnnotations(self.dirpath + filename, annotations)
+        SaveAnnotations(self.dirpath + filename, annotations, writer=self.writer)
         logging.debug("(Annoter) Saved annotations for %s!", filename)
 
-        # Dataset : Save if needed
-        if self.dataset_validation.is_not_saved():
-            self.dataset_validation.save()
+        # Dataset : Save coalesced changes
+        self.dataset_validation.flush()
 
         # Process file again after save
         self.Process()
@@ -753,10 +1178,13 @@ class Annoter:
             filename
         )
         self.files[self.offset]["IsAnnotation"] = True
-        self.files[self.offset]["Annotations"] = self.annotations
+        self.files[self.offset]["Annotations"] = AnnotationTable.fromAnnotes(
+            self.annotations
+        )
         self.files[self.offset]["AnnotationsClasses"] = ",".join(
             {f"{item.classNumber}" for item in self.annotations}
         )
+        self.summary.Update(self.files[self.offset])
 
     def IsEnd(self):
         """True if files ended."""
@@ -779,36 +1207,41 @@ class Annoter:
         forceDetector: bool = False,
     ):
         """process file."""
+        # Detection worker : Requests of previous processing are stale
+        self.detection_worker.Cancel()
+
         if (self.offset >= 0) and (self.offset < self.GetFilesCount()):
             fileEntry = self.GetFile()
 
             # Read image
             if processImage is True:
-                self.image = im = self.GetFileImage(fileEntry["Path"])
+                self.image = self.GetFileImage(fileEntry["Path"])
+                self.image_read_version = self.image_version
+            im = self.image
 
             # All txt annotations
             txtAnnotations = self.GetFileAnnotations(fileEntry["Path"])
             # Detector annotations list
             detAnnotes = []
             # if annotations file not exists or empty then detect.
-            if (self.is_detector_enabled is True) and (
-                (processImage is True) or (len(txtAnnotations) == 0)
+            if (
+                (self.is_detector_enabled is True)
+                and (im is not None)
+                and ((processImage is True) or (len(txtAnnotations) == 0))
             ):
-                # Detector : Process
                 im_rgb = cv2.cvtColor(im, cv2.COLOR_BGR2RGB)
-                detAnnotes = self.ProcessDetections(im_rgb, fileEntry["Path"])
-
-                # Calculate metrics
-                metrics = self.CalculateYoloMetrics(txtAnnotations, detAnnotes)
-
-                # For view : Filter by IOU internal with same annotes and also with txt annotes.
-                if len(txtAnnotations):
-                    detAnnotes = prefilters.filter_iou_by_confidence(
-                        detAnnotes, detAnnotes + txtAnnotations, maxIOU=sqrt(self.nms)
+                filepath = fileEntry["Path"]
+                # Detector : Asynchronous, merged by MergeDetections()
+                if self.detection_worker.callback is not None:
+                    self.detection_worker.Submit(
+                        lambda: (filepath, self.ProcessDetections(im_rgb, filepath))
+                    )
+                # Detector : Process
+                else:
+                    detAnnotes = self.ProcessDetections(im_rgb, filepath)
+                    detAnnotes = self.__mergeDetections(
+                        fileEntry, txtAnnotations, detAnnotes
                     )
-
-                # Store metrics
-                fileEntry["Metrics"] = metrics
 
             # All annotations
             self.annotations = txtAnnotations + detAnnotes
@@ -820,11 +1253,48 @@ class Annoter:
 
         return False
 
+    def MergeDetections(self, requestID: int, result: tuple[str, list]) -> bool:
+        """Merge asynchronous detections of current image, False if stale."""
+        filepath, detAnnotes = result
+        fileEntry = self.GetFile()
+        # Check : Stale request or other image is processed already
+        if (
+            (not self.detection_worker.IsCurrent(requestID))
+            or (fileEntry is None)
+            or (fileEntry["Path"] != filepath)
+        ):
+            return False
+
+        # Annotations : Current ones, maybe edited while detecting
+        detAnnotes = self.__mergeDetections(fileEntry, self.annotations, detAnnotes)
+        self.annotations = self.annotations + detAnnotes
+        self.errors = self.__checkOfErrors()
+        return True
+
+    def __mergeDetections(
+        self, fileEntry: dict, txtAnnotations: list, detAnnotes: list
+    ) -> list:
+        """Store metrics of detections, returns detections not overlapping."""
+        # Calculate metrics
+        metrics = self.CalculateYoloMetrics(txtAnnotations, detAnnotes)
+
+        # For view : Filter by IOU internal with same annotes and also with txt annotes.
+        if len(txtAnnotations):
+            detAnnotes = prefilters.filter_iou_by_confidence(
+                detAnnotes, detAnnotes + txtAnnotations, maxIOU=sqrt(self.nms)
+            )
+
+        # Store metrics
+        fileEntry["Metrics"] = metrics
+        self.summary.Update(fileEntry)
+        return detAnnotes
+
     def ProcessNext(self) -> bool:
         """Process next image."""
         if self.offset < (self.GetFilesCount() - 1):
             self.offset += 1
             self.Process()
+            self.PrefetchNeighbours()
             return True
 
         return False
@@ -834,6 +1304,7 @@ class Annoter:
         if self.offset > 0:
             self.offset -= 1
             self.Process()
+            self.PrefetchNeighbours()
             return True
 
         return False
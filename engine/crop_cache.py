@@ -0,0 +1,235 @@
+"""
+    Cache of image crops thumbnails, shown in tables tooltips.
+
+    - key is hash of image content, crop and thumbnail width, stable
+      between runs, so crops are reused by next sessions,
+    - decoded source images are kept in small FrameCache, crops of same
+      image decode it once,
+    - encoded crops are kept in memory LRU bounded by size, and stored in
+      user cache directory, bounded by size too.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import cv2
+
+from engine.frame_cache import FrameCache
+from helpers.files import GetCacheDirectory
+from helpers.hashing import GetFileHash, GetTextHash
+from helpers.writer import WriteAtomic
+
+# Cache format version, increase when crops encoding changes.
+CacheVersion = 1
+
+
+class CropCache:
+    """Memory and disk cache of encoded image crops."""
+
+    # Crops subdirectory inside cache directory
+    dirname: str = "crops"
+    # Crop file extension, encoding
+    extension: str = ".jpg"
+
+    def __init__(
+        self,
+        maxSize: int = 16 * 1024 * 1024,
+        maxDiskSize: int = 256 * 1024 * 1024,
+        images: int = 4,
+        directory: Optional[str] = None,
+    ):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        maxSize : int
+            Maximal size [B] of encoded crops kept in memory.
+        maxDiskSize : int
+            Maximal size [B] of stored crops files, oldest are removed.
+        images : int
+            Number of decoded source images kept in memory.
+        directory : str
+            Crops directory, default one in user cache directory.
+        """
+        self.maxSize = maxSize
+        self.maxDiskSize = maxDiskSize
+        self.directory = directory
+        # Decoded source images
+        self.images = FrameCache(capacity=images)
+        # Key -> encoded crop
+        self._crops: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Disk : Pruned once, at first use
+        self._isPruned = False
+
+    @property
+    def size(self) -> int:
+        """Returns size [B] of encoded crops kept in memory."""
+        return self._size
+
+    @staticmethod
+    def Key(
+        filepath: str, crop: Optional[tuple[int, int, int, int]], maxWidth: int
+    ) -> Optional[str]:
+        """Returns cache key of image file crop."""
+        imageHash = GetFileHash(filepath)
+        if imageHash is None:
+            return None
+
+        return GetTextHash(f"{CacheVersion}:{imageHash}:{crop}:{maxWidth}")
+
+    def Get(
+        self,
+        filepath: str,
+        crop: Optional[tuple[int, int, int, int]] = None,
+        maxWidth: int = 640,
+    ) -> Optional[bytes]:
+        """Returns encoded crop (x1, y1, x2, y2) of image file, whole image
+        if crop is None, scaled down to maximal width."""
+        key = self.Key(filepath, crop, maxWidth)
+        if key is None:
+            return None
+
+        # Memory : Check
+        with self._lock:
+            data = self._crops.get(key)
+            if data is not None:
+                self._crops.move_to_end(key)
+                return data
+
+        # Disk : Check, otherwise crop and store
+        data = self.__read(key)
+        if data is None:
+            data = self.__create(filepath, crop, maxWidth)
+            if data is None:
+                return None
+            self.__write(key, data)
+
+        self.__put(key, data)
+        return data
+
+    def Clear(self) -> None:
+        """Remove crops kept in memory."""
+        with self._lock:
+            self._crops.clear()
+            self._size = 0
+        self.images.Clear()
+
+    def Prune(self) -> None:
+        """Remove oldest crops files above maximal disk size."""
+        directory = self.__directory()
+        try:
+            entries = [entry for entry in os.scandir(directory) if entry.is_file()]
+            stats = [(entry.path, entry.stat()) for entry in entries]
+        except OSError:
+            return
+
+        total = sum(stat.st_size for _path, stat in stats)
+        if total <= self.maxDiskSize:
+            return
+
+        # Prune : Down to 90% of maximal size, oldest used first
+        limit = int(self.maxDiskSize * 0.9)
+        for path, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+            if total <= limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= stat.st_size
+
+    def __directory(self) -> str:
+        """Returns crops directory."""
+        if self.directory is None:
+            self.directory = os.path.join(GetCacheDirectory(), self.dirname)
+
+        return self.directory
+
+    def __path(self, key: str) -> str:
+        """Returns crop file path of key."""
+        return os.path.join(self.__directory(), key + self.extension)
+
+    def __read(self, key: str) -> Optional[bytes]:
+        """Returns stored crop of key, marks it as used."""
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except OSError:
+            return None
+
+        return data
+
+    def __write(self, key: str, data: bytes) -> None:
+        """Store crop of key, atomically."""
+        if not self._isPruned:
+            self._isPruned = True
+            self.Prune()
+
+        path = self.__path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        except OSError as e:
+            logging.error("(CropCache) Cannot store crop `%s`! %s", path, e)
+            return
+
+        WriteAtomic(path, data)
+
+    def __create(
+        self,
+        filepath: str,
+        crop: Optional[tuple[int, int, int, int]],
+        maxWidth: int,
+    ) -> Optional[bytes]:
+        """Returns encoded crop of decoded source image."""
+        image = self.images.Read(filepath)
+        if image is None:
+            return None
+
+        # Crop : Clipped to image
+        if crop is not None:
+            height, width = image.shape[:2]
+            x1, y1, x2, y2 = crop
+            x1, x2 = max(0, min(x1, width)), max(0, min(x2, width))
+            y1, y2 = max(0, min(y1, height)), max(0, min(y2, height))
+            image = image[y1:y2, x1:x2]
+
+        # Check : Empty crop
+        if image.size == 0:
+            return None
+
+        # Thumbnail : Scale down only
+        height, width = image.shape[:2]
+        if width > maxWidth:
+            scaledHeight = max(1, round(height * maxWidth / width))
+            image = cv2.resize(
+                image, (maxWidth, scaledHeight), interpolation=cv2.INTER_AREA
+            )
+
+        isEncoded, buffer = cv2.imencode(
+            self.extension, image, [cv2.IMWRITE_JPEG_QUALITY, 90]
+        )
+        if not isEncoded:
+            logging.error("(CropCache) Cannot encode crop of `%s`!", filepath)
+            return None
+
+        return buffer.tobytes()
+
+    def __put(self, key: str, data: bytes) -> None:
+        """Keep encoded crop in memory, drop least recently used."""
+        with self._lock:
+            previous = self._crops.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._crops[key] = data
+            self._size += len(data)
+            while (self._size > self.maxSize) and (len(self._crops) > 1):
+                _key, dropped = self._crops.popitem(last=False)
+                self._size -= len(dropped)
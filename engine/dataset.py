@@ -3,36 +3,63 @@
 
     - Default : Loading 'dataset.txt' file, each line is path to .txt annote file.
     - has method add(path:str) and remove(path:str)
-    - has method load() and save()
+    - has bulk methods add_many(paths) and remove_many(paths)
+    - has method load() and save(), flush() saves coalesced changes,
+      skipped save is deferred to end of save interval (background timer)
     - has method is_inside() -> bool
 """
 
 import logging
 import os
-from typing import Optional
+import threading
+import time
+from typing import Iterable, Optional
 
 
 class Dataset:
     """Class containing the file dataset informations."""
 
-    def __init__(self):
-        """Init."""
+    def __init__(self, save_interval: float = 2.0):
+        """
+        Init.
+
+        Parameters
+        ----------
+        save_interval : float
+            Minimal interval [s] between saves of coalesced changes by flush().
+        """
         self._path: Optional[str] = None
-        self._dataset: list[str] = []
+        # Ordered set of paths : path -> None
+        self._dataset: dict[str, None] = {}
         self._is_not_saved: bool = False
+        self._saved: Optional[float] = None
+        self.save_interval = save_interval
+        # Deferred save of changes skipped by flush()
+        self._timer: Optional[threading.Timer] = None
+        # Changes and save from timer thread
+        self._lock = threading.RLock()
 
     def __len__(self):
         """Return length of dataset."""
         return len(self._dataset)
 
+    def __contains__(self, path: str) -> bool:
+        """Check if path is in dataset."""
+        return path in self._dataset
+
+    def __iter__(self):
+        """Iterate paths in order of adding."""
+        return iter(self._dataset)
+
     def add(self, path: str):
         """Add path to dataset."""
         if self.is_inside(path):
             logging.error("Path %s is already in dataset.", path)
             return
 
-        self._dataset.append(path)
-        self._is_not_saved = True
+        with self._lock:
+            self._dataset[path] = None
+            self._is_not_saved = True
 
     def remove(self, path: str):
         """Remove path from dataset."""
@@ -40,35 +67,107 @@ class Dataset:
             logging.error("Path %s is not in dataset.", path)
             return
 
-        self._dataset.remove(path)
-        self._is_not_saved = True
+        with self._lock:
+            del self._dataset[path]
+            self._is_not_saved = True
+
+    def add_many(self, paths: Iterable[str]) -> int:
+        """Add paths to dataset, returns number of added."""
+        with self._lock:
+            count = len(self._dataset)
+            self._dataset.update(dict.fromkeys(paths))
+            added = len(self._dataset) - count
+            if added:
+                self._is_not_saved = True
+
+        return added
+
+    def remove_many(self, paths: Iterable[str]) -> int:
+        """Remove paths from dataset, returns number of removed."""
+        removed = 0
+        with self._lock:
+            for path in paths:
+                if path in self._dataset:
+                    del self._dataset[path]
+                    removed += 1
+
+            if removed:
+                self._is_not_saved = True
+
+        return removed
 
     def load(self, path: str):
         """Load dataset from file."""
-        self._path = path
-
-        # Check if file exists
-        if not os.path.exists(path):
-            return
+        with self._lock:
+            self.__cancelTimer()
+            self._path = path
+            self._dataset = {}
+            self._is_not_saved = False
 
-        with open(self._path, "r") as file:
-            for line in file:
-                self._dataset.append(line.strip())
+            # Check if file exists
+            if not os.path.exists(path):
+                return
 
-        self._is_not_saved = False
+            with open(self._path, "r") as file:
+                self._dataset = dict.fromkeys(line.strip() for line in file)
 
         # Info
         logging.info("Loaded %d paths from dataset.", len(self._dataset))
 
     def save(self):
-        """Save dataset to file."""
+        """Save dataset to file, atomic replace of file."""
         if self._path is None:
             logging.error("Path is not set.")
             return
 
-        with open(self._path, "w") as file:
-            for path in self._dataset:
-                file.write(path + "\n")
+        with self._lock:
+            self.__cancelTimer()
+            tmppath = self._path + ".tmp"
+            try:
+                with open(tmppath, "w") as file:
+                    file.writelines(path + "\n" for path in self._dataset)
+                os.replace(tmppath, self._path)
+            except OSError as e:
+                logging.error("Saving dataset %s failed! %s", self._path, e)
+                return
+
+            self._is_not_saved = False
+            self._saved = time.monotonic()
+
+    def flush(self, force: bool = False):
+        """Save changes if not saved, at most once per save interval,
+        otherwise save is deferred to end of interval."""
+        with self._lock:
+            if not self._is_not_saved:
+                return
+
+            elapsed = None
+            if self._saved is not None:
+                elapsed = time.monotonic() - self._saved
+            if force or (elapsed is None) or (elapsed >= self.save_interval):
+                self.save()
+                return
+
+            # Deferred : Save at end of interval, if not scheduled already
+            if self._timer is None:
+                self._timer = threading.Timer(
+                    self.save_interval - elapsed, self.__deferredSave
+                )
+                self._timer.daemon = True
+                self._timer.start()
+
+    def __deferredSave(self) -> None:
+        """Timer thread, save changes skipped by flush()."""
+        with self._lock:
+            self._timer = None
+            if self._is_not_saved:
+                self.save()
+
+    def __cancelTimer(self) -> None:
+        """Cancel deferred save."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
 
     def is_inside(self, path: str) -> bool:
         """Check if path is in dataset."""
@@ -0,0 +1,230 @@
+"""
+    Persistent cache of detector results, keyed by content.
+
+    - Default : SQLite file 'detections.db' in user cache directory,
+      shared by all images directories,
+    - key is hash of image content, detector model signature and
+      detection settings (confidence, NMS threshold and method, image
+      strategy), so renamed or copied images hit the cache too,
+    - detections are stored as JSON data only (no pickle), so cache file
+      cannot run code when read,
+    - least recently used results are evicted above maximal size.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from helpers.files import GetCacheDirectory
+from helpers.hashing import GetFileHash, GetTextHash
+
+# Cache format version, increase when detections structure changes.
+CacheVersion = 2
+
+
+def EncodeDetections(detections: list) -> bytes:
+    """Returns detections (className, confidence, box) as JSON."""
+    return json.dumps(
+        [
+            [str(className), float(confidence), [float(value) for value in box]]
+            for className, confidence, box in detections
+        ]
+    ).encode()
+
+
+def DecodeDetections(data: bytes) -> list:
+    """Returns detections (className, confidence, box) of JSON."""
+    return [
+        (str(className), float(confidence), tuple(float(value) for value in box))
+        for className, confidence, box in json.loads(data)
+    ]
+
+
+class DetectionCache:
+    """Persistent cache of detector results."""
+
+    # Cache filename inside cache directory
+    filename: str = "detections.db"
+    # Commit after this number of updates
+    commit_every: int = 16
+
+    def __init__(self, maxSize: int = 256 * 1024 * 1024):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        maxSize : int
+            Maximal size [B] of stored detections, least recently used
+            are evicted above it.
+        """
+        self.maxSize = maxSize
+        self._path: Optional[str] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._size: int = 0
+        self._not_commited: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True if cache is opened."""
+        return self._connection is not None
+
+    @property
+    def size(self) -> int:
+        """Returns size [B] of stored detections."""
+        return self._size
+
+    def Open(self, path: Optional[str] = None) -> bool:
+        """Open cache file, default one in user cache directory."""
+        self.Close()
+        if path is None:
+            path = os.path.join(GetCacheDirectory(), self.filename)
+
+        self._path = path
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS detections "
+                + "(key TEXT PRIMARY KEY, size INTEGER, accessed REAL, "
+                + "detections BLOB)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS accessed ON detections (accessed)"
+            )
+            row = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM detections"
+            ).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            logging.error("(DetectionCache) Cannot open cache `%s`! %s", path, e)
+            self._connection = None
+            return False
+
+        self._size = row[0]
+        self.Evict()
+        return True
+
+    def Close(self) -> None:
+        """Commit and close cache."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+            self._not_commited = 0
+
+    def Commit(self) -> None:
+        """Commit not saved changes."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.commit()
+            self._not_commited = 0
+
+    @staticmethod
+    def Key(
+        filepath: str,
+        signature: str,
+        confidence: float,
+        nms: float,
+        nmsMethod: str,
+        imageStrategy: int,
+    ) -> Optional[str]:
+        """Returns cache key of image file and detector settings."""
+        imageHash = GetFileHash(filepath)
+        if imageHash is None:
+            return None
+
+        settings = f"{signature}:{confidence}:{nms}:{nmsMethod}:{imageStrategy}"
+        settingsHash = GetTextHash(f"{CacheVersion}:{settings}")
+        return f"{imageHash}:{settingsHash}"
+
+    def Get(self, key: Optional[str]) -> Optional[list]:
+        """Returns cached detections of key, None if not cached."""
+        if key is None:
+            return None
+
+        with self._lock:
+            if self._connection is None:
+                return None
+
+            row = self._connection.execute(
+                "SELECT detections FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            # Access : Update time of use, commited with next update
+            self._connection.execute(
+                "UPDATE detections SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+
+        try:
+            return DecodeDetections(row[0])
+        except Exception as e:
+            logging.error("(DetectionCache) Invalid entry `%s`! %s", key, e)
+            return None
+
+    def Put(self, key: Optional[str], detections: list) -> None:
+        """Store detections of key."""
+        if key is None:
+            return
+
+        data = EncodeDetections(detections)
+        with self._lock:
+            if self._connection is None:
+                return
+
+            row = self._connection.execute(
+                "SELECT size FROM detections WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO detections (key, size, accessed, detections) "
+                + "VALUES (?, ?, ?, ?)",
+                (key, len(data), time.time(), data),
+            )
+            self._size += len(data) - (row[0] if row is not None else 0)
+
+            # Commit : Coalesce updates
+            self._not_commited += 1
+            if self._not_commited >= self.commit_every:
+                self._connection.commit()
+                self._not_commited = 0
+
+        if self._size > self.maxSize:
+            self.Evict()
+
+    def Evict(self) -> None:
+        """Remove least recently used detections above maximal size."""
+        with self._lock:
+            if (self._connection is None) or (self._size <= self.maxSize):
+                return
+
+            # Evict : Down to 90% of maximal size, not at every put
+            limit = int(self.maxSize * 0.9)
+            removed = []
+            for key, size in self._connection.execute(
+                "SELECT key, size FROM detections ORDER BY accessed"
+            ):
+                if self._size <= limit:
+                    break
+                removed.append((key,))
+                self._size -= size
+
+            self._connection.executemany(
+                "DELETE FROM detections WHERE key = ?", removed
+            )
+            self._connection.commit()
+            self._not_commited = 0
+
+        logging.info("(DetectionCache) Evicted %u entries.", len(removed))
@@ -0,0 +1,115 @@
+"""
+    Background worker running detector requests off the GUI thread.
+
+    - every submitted request gets increasing request ID,
+    - only latest request is current : queued older request is dropped
+      before start, result of running older request is not delivered,
+    - result of current request is passed to callback, called in worker
+      thread (e.g. Qt signal emit, delivered in GUI thread).
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+
+class DetectionWorker:
+    """Background worker of latest detector request."""
+
+    def __init__(self, callback: Optional[Callable[[int, Any], None]] = None):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        callback : Callable
+            Called with (requestID, result) of finished current request.
+        """
+        self.callback = callback
+        # Latest request ID, all older ones are stale
+        self._request_id = 0
+        # (requestID, job) waiting for start
+        self._pending: Optional[tuple[int, Callable[[], Any]]] = None
+        # Request ID being processed, 0 if idle
+        self._running = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._is_closed = False
+
+    @property
+    def is_busy(self) -> bool:
+        """True if current request is not finished."""
+        with self._condition:
+            return (self._pending is not None) or (
+                self._running == self._request_id != 0
+            )
+
+    def Submit(self, job: Callable[[], Any]) -> int:
+        """Submit request, older requests become stale, returns request ID."""
+        with self._condition:
+            self._request_id += 1
+            self._pending = (self._request_id, job)
+            if (self._thread is None) and (not self._is_closed):
+                self._thread = threading.Thread(
+                    target=self.__run, name="DetectionWorker", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+            return self._request_id
+
+    def Cancel(self) -> None:
+        """Make all submitted requests stale, drop queued one."""
+        with self._condition:
+            self._request_id += 1
+            self._pending = None
+
+    def IsCurrent(self, requestID: int) -> bool:
+        """True if request is latest submitted and not cancelled."""
+        with self._condition:
+            return requestID == self._request_id
+
+    def Wait(self) -> None:
+        """Wait until submitted requests are finished."""
+        with self._condition:
+            while (self._pending is not None) or self._running:
+                self._condition.wait()
+
+    def Close(self) -> None:
+        """Cancel requests and stop background thread."""
+        with self._condition:
+            self._request_id += 1
+            self._pending = None
+            self._is_closed = True
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            thread.join()
+
+    def __run(self) -> None:
+        """Background thread, processes latest request."""
+        while True:
+            with self._condition:
+                while (self._pending is None) and (not self._is_closed):
+                    self._condition.wait()
+
+                if self._is_closed:
+                    return
+
+                (requestID, job), self._pending = self._pending, None
+                self._running = requestID
+
+            try:
+                result = job()
+            except Exception as e:
+                logging.error("(DetectionWorker) Request %u failed! %s", requestID, e)
+                result = None
+
+            # Callback : Only result of current request, stale is dropped
+            if (result is not None) and self.IsCurrent(requestID):
+                if self.callback is not None:
+                    self.callback(requestID, result)
+
+            with self._condition:
+                self._running = 0
+                self._condition.notify_all()
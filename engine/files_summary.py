@@ -0,0 +1,137 @@
+"""
+    Aggregate statistics of directory file entries, updated incrementally.
+
+    - Counts of files, annotated and validation files, sums of metrics
+      (correctness, new detections, precision, recall),
+    - contribution of every file entry is stored by file ID, changed file
+      entry is subtracted and added again, no recomputation over all files,
+    - averages have same meaning as views Summary of files.
+"""
+
+from typing import Iterable, Optional
+
+# Contribution : (annotated, validation, correct, correct bboxes,
+# new detections, precision, recall)
+Contribution = tuple[int, int, float, float, int, float, float]
+ContributionSize = 7
+
+
+class FilesSummary:
+    """Incremental summary of file entries."""
+
+    def __init__(self, files: Optional[Iterable[dict]] = None):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        files : Iterable[dict]
+            Initial file entries.
+        """
+        # File ID -> contribution
+        self._contributions: dict[int, Contribution] = {}
+        # Sums of contributions
+        self._sums: list[float] = [0] * ContributionSize
+        self.Reset(files)
+
+    @property
+    def files(self) -> int:
+        """Returns number of files."""
+        return len(self._contributions)
+
+    @property
+    def annotated(self) -> int:
+        """Returns number of annotated files."""
+        return int(self._sums[0])
+
+    @property
+    def validation(self) -> int:
+        """Returns number of validation dataset files."""
+        return int(self._sums[1])
+
+    @property
+    def new_detections(self) -> int:
+        """Returns number of new detections of all files."""
+        return int(self._sums[4])
+
+    @property
+    def correct(self) -> float:
+        """Returns % of correct detections."""
+        return self.__average(2)
+
+    @property
+    def correct_bboxes(self) -> float:
+        """Returns % of correct detections boxes."""
+        return self.__average(3)
+
+    @property
+    def precision(self) -> float:
+        """Returns average precision."""
+        return self.__average(5)
+
+    @property
+    def recall(self) -> float:
+        """Returns average recall."""
+        return self.__average(6)
+
+    @staticmethod
+    def GetContribution(fileEntry: dict) -> Contribution:
+        """Returns counted values of file entry."""
+        metrics = fileEntry.get("Metrics")
+        if metrics is None:
+            return (
+                int(fileEntry["IsAnnotation"]),
+                int(fileEntry["IsValidation"]),
+                0.0,
+                0.0,
+                0,
+                0.0,
+                0.0,
+            )
+
+        return (
+            int(fileEntry["IsAnnotation"]),
+            int(fileEntry["IsValidation"]),
+            metrics.correct,
+            metrics.correct_bboxes,
+            metrics.new_detections,
+            metrics.precision,
+            metrics.recall,
+        )
+
+    def Reset(self, files: Optional[Iterable[dict]] = None) -> None:
+        """Recount summary of all file entries."""
+        self._contributions = {}
+        self._sums = [0] * ContributionSize
+        for fileEntry in files or []:
+            self.Add(fileEntry)
+
+    def Add(self, fileEntry: dict) -> None:
+        """Add file entry, replaces previous file entry of same ID."""
+        self.Remove(fileEntry)
+        contribution = self.GetContribution(fileEntry)
+        self._contributions[fileEntry["ID"]] = contribution
+        self.__sum(contribution, 1)
+
+    def Remove(self, fileEntry: dict) -> None:
+        """Remove file entry, if counted."""
+        contribution = self._contributions.pop(fileEntry["ID"], None)
+        if contribution is not None:
+            self.__sum(contribution, -1)
+
+    def Update(self, fileEntry: dict) -> None:
+        """Count changed file entry again, only if counted already."""
+        if fileEntry["ID"] in self._contributions:
+            self.Add(fileEntry)
+
+    def __sum(self, contribution: Contribution, sign: int) -> None:
+        """Add or subtract contribution from sums."""
+        for index, value in enumerate(contribution):
+            self._sums[index] += sign * value
+
+    def __average(self, index: int) -> float:
+        """Returns average of summed value over files."""
+        if len(self._contributions) == 0:
+            return 0
+
+        return self._sums[index] / len(self._contributions)
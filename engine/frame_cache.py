@@ -0,0 +1,94 @@
+"""
+    Bounded cache of decoded image frames, shared by scan, detection,
+    visuals and current image view.
+
+    - Frames are read-only BGR arrays, copy before modification,
+    - frame is valid only if image file (mtime, size) is unchanged,
+    - least recently used frames are dropped above capacity.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from engine.scan_index import GetFileStat
+
+
+class FrameCache:
+    """Bounded LRU cache of decoded image frames."""
+
+    def __init__(self, capacity: int = 32):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        capacity : int
+            Maximal number of cached frames.
+        """
+        self.capacity = max(1, capacity)
+        # Filepath -> (stat, frame)
+        self._frames: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns number of cached frames."""
+        return len(self._frames)
+
+    def Get(self, filepath: str) -> Optional[np.ndarray]:
+        """Returns cached frame if image file is unchanged."""
+        with self._lock:
+            cached = self._frames.get(filepath)
+            if cached is None:
+                return None
+
+            # Check : Image file changed
+            if cached[0] != GetFileStat(filepath):
+                self._frames.pop(filepath)
+                return None
+
+            self._frames.move_to_end(filepath)
+            return cached[1]
+
+    def Put(self, filepath: str, frame: np.ndarray) -> np.ndarray:
+        """Cache frame of image file, returns read-only frame."""
+        frame.setflags(write=False)
+        stat = GetFileStat(filepath)
+        with self._lock:
+            self._frames[filepath] = (stat, frame)
+            self._frames.move_to_end(filepath)
+            while len(self._frames) > self.capacity:
+                self._frames.popitem(last=False)
+
+        return frame
+
+    def Read(self, filepath: str) -> Optional[np.ndarray]:
+        """Returns cached frame or decodes and caches image file."""
+        frame = self.Get(filepath)
+        if frame is not None:
+            return frame
+
+        try:
+            frame = cv2.imread(filepath)
+        except Exception as e:
+            logging.error("(FrameCache) Cannot read image `%s`! %s", filepath, e)
+            return None
+
+        if frame is None:
+            return None
+
+        return self.Put(filepath, frame)
+
+    def Remove(self, filepath: str) -> None:
+        """Remove cached frame of image file."""
+        with self._lock:
+            self._frames.pop(filepath, None)
+
+    def Clear(self) -> None:
+        """Remove all cached frames."""
+        with self._lock:
+            self._frames.clear()
@@ -0,0 +1,147 @@
+"""
+    Read-ahead prefetcher of images neighbouring current one.
+
+    - Images are decoded on background threads into shared FrameCache,
+    - detections are precomputed when detect callback is given and kept
+      in bounded LRU, keyed by image file (mtime, size) and detector
+      settings,
+    - prefetch of images not requested anymore is cancelled.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+from engine.frame_cache import FrameCache
+from engine.scan_index import GetFileStat
+
+
+class Prefetcher:
+    """Read-ahead prefetcher of images and detections."""
+
+    def __init__(self, frameCache: FrameCache, workers: int = 2, capacity: int = 16):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        frameCache : FrameCache
+            Cache of decoded frames, filled by prefetcher.
+        workers : int
+            Number of background threads.
+        capacity : int
+            Maximal number of cached detections.
+        """
+        self.frame_cache = frameCache
+        self.workers = max(1, workers)
+        self.capacity = max(1, capacity)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Filepath -> future of prefetch
+        self._pending: dict[str, Future] = {}
+        # (filepath, stat, key) -> detections
+        self._detections: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def Prefetch(
+        self,
+        filepaths: list[str],
+        detect: Optional[Callable[[np.ndarray, str], list]] = None,
+        detectKey: Hashable = None,
+    ) -> None:
+        """
+        Prefetch images, in order of priority, cancel other prefetches.
+
+        Parameters
+        ----------
+        filepaths : list[str]
+            Image filepaths, nearest first.
+        detect : Callable
+            Detector call for BGR frame and its filepath, returns detections.
+        detectKey : Hashable
+            Detector settings, detections of other settings are not used.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="Prefetcher"
+                )
+
+            # Cancel : Not requested anymore
+            for filepath in list(self._pending):
+                if filepath not in filepaths:
+                    self._pending.pop(filepath).cancel()
+
+            for filepath in filepaths:
+                future = self._pending.get(filepath)
+                if (future is not None) and (not future.done()):
+                    continue
+
+                self._pending[filepath] = self._executor.submit(
+                    self.__load, filepath, detect, detectKey
+                )
+
+    def GetDetections(self, filepath: str, detectKey: Hashable) -> Optional[list]:
+        """Returns prefetched detections, waits if image is being prefetched."""
+        with self._lock:
+            future = self._pending.get(filepath)
+        if future is not None:
+            try:
+                future.result()
+            except (Exception, CancelledError):
+                pass
+
+        with self._lock:
+            key = (filepath, GetFileStat(filepath), detectKey)
+            detections = self._detections.get(key)
+            if detections is not None:
+                self._detections.move_to_end(key)
+            return detections
+
+    def Clear(self) -> None:
+        """Cancel prefetches and remove cached detections."""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._detections.clear()
+
+    def Close(self) -> None:
+        """Cancel prefetches and stop background threads."""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __load(
+        self,
+        filepath: str,
+        detect: Optional[Callable[[np.ndarray, str], list]],
+        detectKey: Hashable,
+    ) -> None:
+        """Decode image and detect, in background thread."""
+        frame = self.frame_cache.Read(filepath)
+        if (frame is None) or (detect is None):
+            return
+
+        key = (filepath, GetFileStat(filepath), detectKey)
+        with self._lock:
+            if key in self._detections:
+                return
+
+        try:
+            detections = detect(frame, filepath)
+        except Exception as e:
+            logging.error("(Prefetcher) Detection of `%s` failed! %s", filepath, e)
+            return
+
+        with self._lock:
+            self._detections[key] = detections
+            while len(self._detections) > self.capacity:
+                self._detections.popitem(last=False)
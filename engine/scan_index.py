@@ -0,0 +1,258 @@
+"""
+    Persistent index of scanned file entries, stored next to images.
+
+    - Default : SQLite file '.yaya.index' in images directory,
+    - each row holds file entry keyed by filename, data only : scalars
+      as JSON and boxes, grid and matches as numpy arrays (no pickle), so
+      index of shared directory cannot run code when opened,
+    - entry is valid only if image and sidecars signature is unchanged.
+"""
+
+import io
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import fields
+from typing import Optional
+
+import numpy as np
+
+from engine.annotation_table import AnnotationTable
+from helpers.files import ChangeExtension
+from helpers.metrics import Metrics
+from helpers.visuals import Visuals
+
+# Index format version, increase when file entry structure changes.
+IndexVersion = 4
+# File entry keys stored as JSON values, without Name and Path which are
+# set by directory of scan, so moved directory keeps its index
+EntryScalars = (
+    "IsAnnotation",
+    "IsValidation",
+    "AnnotationsClasses",
+    "Datetime",
+    "Errors",
+)
+# File entry keys of AnnotationTable, stored as arrays
+EntryTables = ("Annotations", "Detections", "Detections_original")
+
+
+def GetFileStat(filepath: str) -> Optional[tuple[int, int]]:
+    """Returns (mtime, size) of file or None if not exists."""
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def JsonValue(value):
+    """Returns JSON serializable value of numpy scalar."""
+    if isinstance(value, np.generic):
+        return value.item()
+
+    raise TypeError(f"Not serializable {type(value).__name__}!")
+
+
+def EncodeEntry(fileEntry: dict) -> tuple[str, bytes]:
+    """Returns file entry as JSON of scalars and npz of arrays."""
+    arrays, names = {}, {}
+    for key in EntryTables:
+        table: AnnotationTable = fileEntry[key]
+        for column, array in table.toArrays().items():
+            arrays[f"{key}.{column}"] = array
+        names[key] = table.names
+
+    metrics: Metrics = fileEntry["Metrics"]
+    visuals: Visuals = fileEntry["Visuals"]
+    arrays["Metrics.matches"] = np.asarray(metrics.matches, dtype=np.int32)
+    arrays["Visuals.grid"] = np.asarray(visuals.grid, dtype=np.float32)
+    data = {
+        **{key: fileEntry[key] for key in EntryScalars},
+        "Names": names,
+        "Metrics": {
+            f.name: getattr(metrics, f.name)
+            for f in fields(metrics)
+            if f.name != "matches"
+        },
+        "Visuals": {
+            f.name: getattr(visuals, f.name)
+            for f in fields(visuals)
+            if f.name != "grid"
+        },
+    }
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return json.dumps(data, default=JsonValue), buffer.getvalue()
+
+
+def DecodeEntry(text: str, blob: bytes) -> dict:
+    """Returns file entry of JSON scalars and npz arrays, without ID, Name
+    and Path."""
+    data = json.loads(text)
+    with np.load(io.BytesIO(blob), allow_pickle=False) as npz:
+        arrays = {name: npz[name] for name in npz.files}
+
+    fileEntry = {key: data[key] for key in EntryScalars}
+    for key in EntryTables:
+        fileEntry[key] = AnnotationTable.fromArrays(
+            {column: arrays[f"{key}.{column}"] for column in AnnotationTable.columns},
+            {int(row): name for row, name in data["Names"][key].items()},
+        )
+
+    grid = arrays["Visuals.grid"]
+    fileEntry["Metrics"] = Metrics(
+        **data["Metrics"], matches=arrays["Metrics.matches"].astype(np.int32)
+    )
+    fileEntry["Visuals"] = Visuals(
+        **data["Visuals"], grid=grid if grid.size else []
+    )
+    return fileEntry
+
+
+class ScanIndex:
+    """Persistent index of scanned file entries."""
+
+    # Index filename inside images directory
+    filename: str = ".yaya.index"
+    # Commit after this number of updates
+    commit_every: int = 1000
+
+    def __init__(self):
+        """Constructor."""
+        self._path: Optional[str] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._not_commited: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True if index is opened."""
+        return self._connection is not None
+
+    def Open(self, dirpath: str, meta: str = "") -> bool:
+        """
+        Open index of directory.
+
+        Parameters
+        ----------
+        dirpath : str
+            Directory path with '/' at the end.
+        meta : str
+            Scan configuration (class names, detector extension), index
+            is cleared if different than stored one.
+        """
+        self.Close()
+        self._path = dirpath + self.filename
+        try:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                + "(name TEXT PRIMARY KEY, signature TEXT, entry TEXT, arrays BLOB)"
+            )
+        except sqlite3.Error as e:
+            logging.error("(ScanIndex) Cannot open index `%s`! %s", self._path, e)
+            self._connection = None
+            return False
+
+        # Meta : Clear index if version or scan configuration changed
+        meta = f"{IndexVersion}:{meta}"
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE key = 'meta'"
+        ).fetchone()
+        if (row is None) or (row[0] != meta):
+            self._connection.execute("DELETE FROM entries")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('meta', ?)", (meta,)
+            )
+            self._connection.commit()
+
+        return True
+
+    def Close(self) -> None:
+        """Commit and close index."""
+        if self._connection is None:
+            return
+
+        self.Commit()
+        self._connection.close()
+        self._connection = None
+
+    def Commit(self) -> None:
+        """Commit not saved changes."""
+        if self._connection is None:
+            return
+
+        self._connection.commit()
+        self._not_commited = 0
+
+    @staticmethod
+    def Signature(filepath: str, extensions: list[str]) -> str:
+        """Returns signature of image and its sidecar files."""
+        stats = [GetFileStat(filepath)]
+        stats += [GetFileStat(ChangeExtension(filepath, ext)) for ext in extensions]
+        return repr(stats)
+
+    def Get(self, name: str, signature: str) -> Optional[dict]:
+        """Returns stored file entry if signature is unchanged."""
+        if self._connection is None:
+            return None
+
+        row = self._connection.execute(
+            "SELECT signature, entry, arrays FROM entries WHERE name = ?", (name,)
+        ).fetchone()
+        if (row is None) or (row[0] != signature):
+            return None
+
+        try:
+            return DecodeEntry(row[1], row[2])
+        except Exception as e:
+            logging.error("(ScanIndex) Invalid entry `%s`! %s", name, e)
+            return None
+
+    def Put(self, name: str, signature: str, fileEntry: dict) -> None:
+        """Store file entry with signature."""
+        if self._connection is None:
+            return
+
+        entry, arrays = EncodeEntry(fileEntry)
+        self._connection.execute(
+            "INSERT OR REPLACE INTO entries (name, signature, entry, arrays) "
+            + "VALUES (?, ?, ?, ?)",
+            (name, signature, entry, arrays),
+        )
+
+        # Commit : Coalesce updates
+        self._not_commited += 1
+        if self._not_commited >= self.commit_every:
+            self.Commit()
+
+    def Remove(self, name: str) -> None:
+        """Remove file entry."""
+        if self._connection is None:
+            return
+
+        self._connection.execute("DELETE FROM entries WHERE name = ?", (name,))
+        self._not_commited += 1
+
+    def Prune(self, names: list[str]) -> None:
+        """Remove file entries not found in names."""
+        if self._connection is None:
+            return
+
+        existing = {
+            row[0] for row in self._connection.execute("SELECT name FROM entries")
+        }
+        removed = existing.difference(names)
+        self._connection.executemany(
+            "DELETE FROM entries WHERE name = ?", [(name,) for name in removed]
+        )
+        self.Commit()
+
+        if len(removed):
+            logging.info("(ScanIndex) Pruned %u entries.", len(removed))
@@ -0,0 +1,382 @@
+"""
+    Directory scanner which creates file entries of images.
+
+    - Default : Serial processing of every file in calling thread.
+    - Threads/Processes : Processing files with pool of workers,
+      file entries are returned in the same order as filenames.
+    - Index : Unchanged files are restored from persistent scan index.
+    - Visuals store : Visuals are read and stored in calling thread.
+    - Frames : Images decoded for detector are reused for visuals, only
+      in calling process (serial or threads).
+    - Annotations and detections are stored as compact AnnotationTable.
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from enum import Enum
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+from tqdm import tqdm
+
+import engine.annote as annote
+from engine.annotation_table import AnnotationTable
+from engine.frame_cache import FrameCache
+from engine.scan_index import ScanIndex
+import helpers.prefilters as prefilters
+from helpers.metrics import EvaluateMetrics, Metrics
+from helpers.textAnnotations import (
+    ReadAnnotationsArrays,
+    ReadDetectionsArrays,
+    ToAnnotations,
+    ToDetections,
+)
+from helpers.visuals import Visuals, VisualsDuplicates, VisualsStore
+
+
+class ScanMode(str, Enum):
+    """Scanner workers mode."""
+
+    Threads = "Threads"
+    Processes = "Processes"
+
+
+def ReadFileAnnotations(filepath: str) -> Optional[list[annote.Annote]]:
+    """Read file .txt annotations, None if not exists."""
+    arrays = ReadAnnotationsArrays(filepath)
+    if arrays is None:
+        return None
+
+    return [annote.fromTxtAnnote(el) for el in ToAnnotations(arrays)]
+
+
+def ReadFileDetections(
+    filepath: str, extension: str = ".detector"
+) -> list[annote.Annote]:
+    """Read file detector annotations if exists."""
+    return [
+        annote.fromDetection(el)
+        for el in ToDetections(ReadDetectionsArrays(filepath, extension=extension))
+    ]
+
+
+def CheckErrors(annotations: list[annote.Annote]) -> set:
+    """Check annotations for errors."""
+    errors = set()
+    if len(annotations) != len(
+        prefilters.filter_iou_by_confidence(annotations, annotations)
+    ):
+        errors.add("Override error!")
+
+    return errors
+
+
+def ScanFile(
+    dirpath: str,
+    filename: str,
+    index: int,
+    detections: Optional[list[annote.Annote]] = None,
+    detectionsExtension: str = ".detector",
+    forceVisuals: bool = False,
+    visuals: Optional[Visuals] = None,
+    saveVisuals: bool = True,
+    image: Optional[np.ndarray] = None,
+) -> dict:
+    """
+    Create file entry of single image file.
+
+    Parameters
+    ----------
+    dirpath : str
+        Directory path with '/' at the end.
+    filename : str
+        Image filename.
+    index : int
+        File entry ID.
+    detections : list
+        Already processed detections, otherwise read from detector file.
+    detectionsExtension : str
+        Extension of detector annotations file.
+    forceVisuals : bool
+        Force recreation of visuals.
+    visuals : Visuals
+        Already loaded visuals, otherwise loaded or created.
+    saveVisuals : bool
+        Save created visuals to json file.
+    image : np.ndarray
+        Already decoded BGR image, used for visuals creation.
+    """
+    filepath = dirpath + filename
+
+    # Read annotations, check if annotations exists
+    txtAnnotations = ReadFileAnnotations(filepath)
+    isAnnotation = txtAnnotations is not None
+    if txtAnnotations is None:
+        txtAnnotations = []
+    errors = CheckErrors(txtAnnotations)
+
+    # Read historical detections
+    if detections is None:
+        detections = ReadFileDetections(filepath, extension=detectionsExtension)
+
+    # For calculation : Filter detections with itself for multiple detections catches.
+    detections = prefilters.filter_iou_by_confidence(detections, detections)
+
+    # For view : Filter by IOU internal with same annotes and also with txt annotes.
+    detections_filtered = prefilters.filter_iou_by_confidence(
+        detections, detections + txtAnnotations
+    )
+
+    # Calculate metrics
+    metrics = Metrics()
+    if len(txtAnnotations):
+        metrics = EvaluateMetrics(txtAnnotations, detections)
+
+    # Calculate visuals
+    if visuals is None:
+        visuals = Visuals.LoadCreate(
+            filepath, force=forceVisuals, save=saveVisuals, image=image
+        )
+
+    # Text annotations : Update annotations visuals
+    for annote_item in txtAnnotations:
+        annote_item.update_hsv_from_grid(visuals.numpy_grid)
+
+    return {
+        "Name": filename,
+        "Path": filepath,
+        "ID": index,
+        "IsAnnotation": isAnnotation,
+        "IsValidation": False,
+        "Annotations": AnnotationTable.fromAnnotes(txtAnnotations),
+        "AnnotationsClasses": ", ".join(
+            {f"{item.class_abbrev}" for item in txtAnnotations}
+        ),
+        "Datetime": os.lstat(filepath).st_mtime,
+        "Errors": len(errors),
+        "Detections": AnnotationTable.fromAnnotes(detections_filtered),
+        "Detections_original": AnnotationTable.fromAnnotes(detections),
+        "Metrics": metrics,
+        "Visuals": visuals,
+    }
+
+
+def CompletedFuture(result) -> Future:
+    """Returns future with already set result."""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def MarkDuplicates(files: list[dict]) -> None:
+    """Mark duplicated visuals of file entries, in order of list."""
+    visualsDuplicates = VisualsDuplicates()
+    for fileEntry in files:
+        visuals = fileEntry["Visuals"]
+        # VisualsDuplicates : Check near duplicates and update index
+        visuals.isDuplicate = visualsDuplicates.Add(visuals)
+
+
+class Scanner:
+    """Scanner of directory image files."""
+
+    # Maximal number of pending results per worker
+    pending_per_worker: int = 4
+
+    def __init__(self, workers: int = 1, mode: ScanMode = ScanMode.Processes):
+        """Constructor."""
+        # Number of workers, 1 means serial processing.
+        self.workers = max(1, workers)
+        # Workers mode : threads or processes
+        self.mode = mode
+
+    @property
+    def is_parallel(self) -> bool:
+        """True if scanning with pool of workers."""
+        return self.workers > 1
+
+    @property
+    def is_shared_memory(self) -> bool:
+        """True if files are processed in memory of calling process."""
+        return (not self.is_parallel) or (self.mode == ScanMode.Threads)
+
+    def CreateExecutor(self):
+        """Create workers pool executor."""
+        if self.mode == ScanMode.Threads:
+            return ThreadPoolExecutor(max_workers=self.workers)
+
+        # Processes : Class names must be initialized in every worker.
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=annote.Init,
+            initargs=(annote.GetClasses(),),
+        )
+
+    def Submit(self, executor: Optional[Executor], *args, **kwargs) -> Future:
+        """Submit ScanFile call to executor or call it in calling thread."""
+        if executor is not None:
+            return executor.submit(ScanFile, *args, **kwargs)
+
+        return CompletedFuture(ScanFile(*args, **kwargs))
+
+    def Scan(
+        self,
+        dirpath: str,
+        filenames: list[str],
+        detect: Optional[Callable[[list[str]], list[list]]] = None,
+        detectBatch: int = 1,
+        detectionsExtension: str = ".detector",
+        forceVisuals: bool = False,
+        scanIndex: Optional[ScanIndex] = None,
+        visualsStore: Optional[VisualsStore] = None,
+        frameCache: Optional[FrameCache] = None,
+    ) -> Iterator[dict]:
+        """
+        Scan files and yield file entries in order of filenames.
+
+        Parameters
+        ----------
+        dirpath : str
+            Directory path with '/' at the end.
+        filenames : list[str]
+            Image filenames to scan.
+        detect : Callable
+            Detector call for batch of filepaths, returns detections
+            of every filepath, always called in calling thread.
+        detectBatch : int
+            Number of filepaths passed to single detector call.
+        detectionsExtension : str
+            Extension of detector annotations file.
+        forceVisuals : bool
+            Force recreation of visuals.
+        scanIndex : ScanIndex
+            Opened index of directory, unchanged files are not scanned again.
+        visualsStore : VisualsStore
+            Opened visuals store of directory, used instead of json files.
+        frameCache : FrameCache
+            Cache of frames decoded by detector, reused for visuals.
+        """
+        progress = tqdm(total=len(filenames), desc="Processing files", unit="files")
+
+        # Executor : Pool of workers or serial processing
+        executor = None
+        if self.is_parallel:
+            logging.info(
+                "(Scanner) Scanning %u files with %u %s.",
+                len(filenames),
+                self.workers,
+                self.mode.value,
+            )
+            executor = self.CreateExecutor()
+
+        # Signature : Image and its annotations files
+        extensions = [".txt", detectionsExtension]
+        # Pending results : (filename, signature, future)
+        pending: deque = deque()
+        # Detected batch : filename -> detections
+        detected: dict[str, list] = {}
+        try:
+            for index, filename in enumerate(filenames):
+                filepath = dirpath + filename
+
+                # Detector : Detect batch in calling thread, rest of file in workers.
+                detections = None
+                if detect is not None:
+                    if filename not in detected:
+                        batch = filenames[index : index + max(1, detectBatch)]
+                        detected = dict(
+                            zip(batch, detect([dirpath + name for name in batch]))
+                        )
+                    detections = detected.pop(filename)
+
+                # Visuals : Read from store in calling thread
+                visuals = None
+                if (visualsStore is not None) and (not forceVisuals):
+                    visuals = visualsStore.Get(filepath)
+
+                # Index : Reuse file entry if files unchanged.
+                signature, fileEntry = None, None
+                if scanIndex is not None:
+                    signature = ScanIndex.Signature(filepath, extensions)
+                    if detect is None:
+                        fileEntry = scanIndex.Get(filename, signature)
+
+                if fileEntry is not None:
+                    fileEntry["ID"] = index
+                    fileEntry["Name"] = filename
+                    fileEntry["Path"] = filepath
+                    if visuals is not None:
+                        fileEntry["Visuals"] = visuals
+                    pending.append((filename, None, CompletedFuture(fileEntry)))
+                else:
+                    # Frame : Reuse image decoded by detector, not for
+                    # processes, pickled frame costs more than decoding.
+                    image = None
+                    if (
+                        (frameCache is not None)
+                        and (detect is not None)
+                        and (visuals is None)
+                        and self.is_shared_memory
+                    ):
+                        image = frameCache.Get(filepath)
+
+                    future = self.Submit(
+                        executor,
+                        dirpath,
+                        filename,
+                        index,
+                        detections=detections,
+                        detectionsExtension=detectionsExtension,
+                        forceVisuals=forceVisuals,
+                        visuals=visuals,
+                        saveVisuals=visualsStore is None,
+                        image=image,
+                    )
+                    pending.append((filename, signature, future))
+
+                # Results : Yield already finished, or wait if too many pending
+                while pending and (
+                    pending[0][2].done()
+                    or (len(pending) > self.pending_per_worker * self.workers)
+                ):
+                    yield self.Collect(pending.popleft(), scanIndex, visualsStore)
+                    progress.update()
+
+            # Results : Yield rest, in order of filenames
+            while pending:
+                yield self.Collect(pending.popleft(), scanIndex, visualsStore)
+                progress.update()
+
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            if scanIndex is not None:
+                scanIndex.Commit()
+            progress.close()
+
+    @staticmethod
+    def Collect(
+        result: tuple,
+        scanIndex: Optional[ScanIndex] = None,
+        visualsStore: Optional[VisualsStore] = None,
+    ) -> dict:
+        """Wait for scan result and store it in index and visuals store."""
+        filename, signature, future = result
+        fileEntry = future.result()
+
+        # Visuals store : Store new or migrated visuals
+        if visualsStore is not None:
+            visualsStore.Put(fileEntry["Visuals"])
+
+        # Index : Store scanned file entry
+        if (scanIndex is not None) and (signature is not None):
+            scanIndex.Put(filename, signature, fileEntry)
+
+        return fileEntry
@@ -0,0 +1,361 @@
+"""
+    Persistent thumbnails pyramid of directory images.
+
+    - Default : SQLite pack file in user cache directory, one for every
+      images directory (keyed by hash of its path), so writes of pack do
+      not change watched images directory,
+    - every image has JPEG thumbnails of all levels (longer side 128 and
+      512 px), valid only if image (mtime, size) is unchanged,
+    - thumbnails are generated on background threads, images of visible
+      rows first (latest request first), then remaining directory images,
+    - images are decoded in reduced scale (JPEG draft), not full size.
+"""
+
+import heapq
+import io
+import itertools
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+from PIL import Image, ImageOps
+
+from engine.scan_index import GetFileStat
+from helpers.files import GetCacheDirectory
+from helpers.hashing import GetTextHash
+
+# Thumbnails levels, longer side [px]
+ThumbnailLevels = (128, 512)
+
+
+def CreateThumbnails(
+    imagepath: str, levels: tuple[int, ...] = ThumbnailLevels, quality: int = 85
+) -> Optional[dict[int, bytes]]:
+    """Returns encoded JPEG thumbnails of image, for every level."""
+    thumbnails = {}
+    try:
+        with Image.open(imagepath) as image:
+            # Decode : Reduced scale, not smaller than largest level
+            image.draft("RGB", (max(levels), max(levels)))
+            image = ImageOps.exif_transpose(image).convert("RGB")
+
+        # Pyramid : Smaller levels from larger ones
+        for level in sorted(levels, reverse=True):
+            image.thumbnail((level, level))
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality)
+            thumbnails[level] = buffer.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logging.error("(Thumbnails) Cannot create thumbnails `%s`! %s", imagepath, e)
+        return None
+
+    return thumbnails
+
+
+class ThumbnailStore:
+    """Persistent pack file of directory images thumbnails."""
+
+    # Packs directory inside cache directory
+    dirname: str = "thumbnails"
+    # Commit after this number of updates
+    commit_every: int = 64
+
+    def __init__(self):
+        """Constructor."""
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._not_commited: int = 0
+
+    @property
+    def is_open(self) -> bool:
+        """True if store is opened."""
+        return self._connection is not None
+
+    @staticmethod
+    def GetPath(dirpath: str) -> str:
+        """Returns default pack path of directory in user cache directory."""
+        key = GetTextHash(os.path.abspath(dirpath))
+        return os.path.join(GetCacheDirectory(), ThumbnailStore.dirname, f"{key}.db")
+
+    def Open(self, dirpath: str, path: Optional[str] = None) -> bool:
+        """
+        Open thumbnails of directory.
+
+        Parameters
+        ----------
+        dirpath : str
+            Directory path with '/' at the end.
+        path : str
+            Pack file path, default one of directory in user cache directory.
+        """
+        self.Close()
+        if path is None:
+            path = self.GetPath(dirpath)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS thumbnails "
+                + "(name TEXT, level INTEGER, mtime INTEGER, size INTEGER, "
+                + "data BLOB, PRIMARY KEY (name, level))"
+            )
+        except (OSError, sqlite3.Error) as e:
+            logging.error("(ThumbnailStore) Cannot open store `%s`! %s", path, e)
+            return False
+
+        with self._lock:
+            self._connection = connection
+        return True
+
+    def Close(self) -> None:
+        """Commit and close store."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+            self._not_commited = 0
+
+    def Commit(self) -> None:
+        """Commit not saved changes."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.commit()
+            self._not_commited = 0
+
+    def Get(self, imagepath: str, level: int) -> Optional[bytes]:
+        """Returns encoded thumbnail of image, None if not valid."""
+        stat = GetFileStat(imagepath)
+        if stat is None:
+            return None
+
+        with self._lock:
+            if self._connection is None:
+                return None
+
+            row = self._connection.execute(
+                "SELECT data FROM thumbnails "
+                + "WHERE name = ? AND level = ? AND mtime = ? AND size = ?",
+                (os.path.basename(imagepath), level, *stat),
+            ).fetchone()
+
+        return row[0] if row is not None else None
+
+    def IsValid(self, imagepath: str) -> bool:
+        """True if all thumbnails levels of image are valid."""
+        stat = GetFileStat(imagepath)
+        if stat is None:
+            return False
+
+        with self._lock:
+            if self._connection is None:
+                return False
+
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM thumbnails "
+                + "WHERE name = ? AND mtime = ? AND size = ?",
+                (os.path.basename(imagepath), *stat),
+            ).fetchone()
+
+        return row[0] >= len(ThumbnailLevels)
+
+    def Put(
+        self,
+        imagepath: str,
+        stat: tuple[int, int],
+        thumbnails: dict[int, bytes],
+    ) -> None:
+        """Store thumbnails of image (mtime, size)."""
+        name = os.path.basename(imagepath)
+        with self._lock:
+            if self._connection is None:
+                return
+
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO thumbnails (name, level, mtime, size, data) "
+                + "VALUES (?, ?, ?, ?, ?)",
+                [(name, level, *stat, data) for level, data in thumbnails.items()],
+            )
+
+            # Commit : Coalesce updates
+            self._not_commited += 1
+            if self._not_commited >= self.commit_every:
+                self._connection.commit()
+                self._not_commited = 0
+
+    def Prune(self, names: list[str]) -> None:
+        """Remove thumbnails of images not found in names."""
+        with self._lock:
+            if self._connection is None:
+                return
+
+            stored = {
+                row[0]
+                for row in self._connection.execute("SELECT name FROM thumbnails")
+            }
+            removed = [(name,) for name in stored.difference(names)]
+            self._connection.executemany(
+                "DELETE FROM thumbnails WHERE name = ?", removed
+            )
+            self._connection.commit()
+            self._not_commited = 0
+
+
+class ThumbnailGenerator:
+    """Background generator of thumbnails, visible images first."""
+
+    def __init__(
+        self,
+        store: ThumbnailStore,
+        workers: int = 2,
+        callback: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        store : ThumbnailStore
+            Store of generated thumbnails.
+        workers : int
+            Number of background threads.
+        callback : Callable
+            Called with image path of generated thumbnails, in worker
+            thread (e.g. Qt signal emit).
+        """
+        self.store = store
+        self.workers = max(1, workers)
+        self.callback = callback
+        # Queue : (priority, order, imagepath), lower first
+        self._queue: list[tuple[int, int, str]] = []
+        # Imagepath -> queued priority, older queue entries are stale
+        self._queued: dict[str, int] = {}
+        self._order = itertools.count()
+        # Priority of latest visible images request
+        self._priority = 0
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        # Imagepaths being generated
+        self._running: set[str] = set()
+        self._is_closed = False
+
+    @property
+    def pending(self) -> int:
+        """Returns number of queued images."""
+        with self._condition:
+            return len(self._queued)
+
+    def Generate(self, imagepaths: list[str]) -> None:
+        """Queue images in background, after visible ones."""
+        self.__queue(imagepaths, 0)
+
+    def Prioritize(self, imagepaths: list[str]) -> None:
+        """Queue visible images before all queued ones."""
+        with self._condition:
+            self._priority -= 1
+            priority = self._priority
+        self.__queue(imagepaths, priority)
+
+    def Clear(self) -> None:
+        """Drop queued images."""
+        with self._condition:
+            self._queue.clear()
+            self._queued.clear()
+
+    def Wait(self) -> None:
+        """Wait until queued images are generated."""
+        with self._condition:
+            while self._queued or self._running:
+                self._condition.wait()
+
+    def Close(self) -> None:
+        """Drop queued images and stop background threads."""
+        with self._condition:
+            self._queue.clear()
+            self._queued.clear()
+            self._is_closed = True
+            self._condition.notify_all()
+            threads, self._threads = self._threads, []
+
+        for thread in threads:
+            thread.join()
+
+    def __queue(self, imagepaths: list[str], priority: int) -> None:
+        """Queue images with priority, keep higher queued priority."""
+        with self._condition:
+            if self._is_closed:
+                return
+
+            for imagepath in imagepaths:
+                queued = self._queued.get(imagepath)
+                if (imagepath in self._running) or (
+                    (queued is not None) and (queued <= priority)
+                ):
+                    continue
+
+                self._queued[imagepath] = priority
+                heapq.heappush(self._queue, (priority, next(self._order), imagepath))
+
+            # Threads : Started at first use
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self.__run, name="ThumbnailGenerator", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._condition.notify_all()
+
+    def __run(self) -> None:
+        """Background thread, generates queued images thumbnails."""
+        while True:
+            with self._condition:
+                imagepath = None
+                while (imagepath is None) and (not self._is_closed):
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+
+                    priority, _order, imagepath = heapq.heappop(self._queue)
+                    # Check : Stale entry, queued again with other priority
+                    if self._queued.get(imagepath) != priority:
+                        imagepath = None
+                        continue
+                    del self._queued[imagepath]
+
+                if self._is_closed:
+                    return
+                self._running.add(imagepath)
+
+            try:
+                self.__generate(imagepath)
+            except Exception as e:
+                logging.error("(ThumbnailGenerator) `%s` failed! %s", imagepath, e)
+
+            with self._condition:
+                self._running.discard(imagepath)
+                self._condition.notify_all()
+
+    def __generate(self, imagepath: str) -> None:
+        """Generate and store thumbnails of image if not valid."""
+        if (not self.store.is_open) or self.store.IsValid(imagepath):
+            return
+
+        stat = GetFileStat(imagepath)
+        if stat is None:
+            return
+
+        thumbnails = CreateThumbnails(imagepath)
+        if thumbnails is None:
+            return
+
+        self.store.Put(imagepath, stat, thumbnails)
+        if self.callback is not None:
+            self.callback(imagepath)
@@ -0,0 +1,162 @@
+"""
+    Watcher of directory files changes.
+
+    - Default : Linux inotify watch of directory (without extra packages),
+    - Fallback : Polling of directory files mtime/size.
+    - Poll() returns set of changed filenames since last call, without
+      application own '.yaya.*' files (index, visuals, their journals).
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import time
+from typing import Optional
+
+# Inotify : Events masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+# Inotify : Event header struct (wd, mask, cookie, len)
+InotifyEvent = struct.Struct("iIII")
+# Application own files prefix, not reported as changes
+IgnoredPrefix = ".yaya."
+
+
+class DirectoryWatcher:
+    """Watcher of directory files changes."""
+
+    def __init__(self, dirpath: str, poll_interval: float = 5.0):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        dirpath : str
+            Watched directory path.
+        poll_interval : float
+            Minimal interval between polling fallback directory scans.
+        """
+        self.dirpath = dirpath
+        self.poll_interval = poll_interval
+        # Inotify : File descriptor
+        self._fd: Optional[int] = None
+        # Polling : Filename -> (mtime, size)
+        self._stats: dict[str, tuple[int, int]] = {}
+        self._polled: float = 0
+
+    @property
+    def is_inotify(self) -> bool:
+        """True if inotify is used."""
+        return self._fd is not None
+
+    def Start(self) -> None:
+        """Start watching directory."""
+        self.Stop()
+        if not self.__startInotify():
+            logging.info("(DirectoryWatcher) Polling `%s`.", self.dirpath)
+            self._stats = self.__listStats()
+            self._polled = time.monotonic()
+
+    def Stop(self) -> None:
+        """Stop watching directory."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+        self._stats = {}
+
+    def Poll(self) -> set[str]:
+        """Returns set of changed filenames since last call."""
+        if self._fd is not None:
+            changed = self.__pollInotify()
+        else:
+            changed = self.__pollStats()
+
+        return {name for name in changed if not name.startswith(IgnoredPrefix)}
+
+    def __startInotify(self) -> bool:
+        """Start inotify watch, False if not available."""
+        if not sys.platform.startswith("linux"):
+            return False
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return False
+
+            mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+            if libc.inotify_add_watch(fd, os.fsencode(self.dirpath), mask) < 0:
+                os.close(fd)
+                return False
+
+        except (OSError, AttributeError) as e:
+            logging.error("(DirectoryWatcher) Inotify not available! %s", e)
+            return False
+
+        self._fd = fd
+        logging.info("(DirectoryWatcher) Watching `%s`.", self.dirpath)
+        return True
+
+    def __pollInotify(self) -> set[str]:
+        """Read all pending inotify events."""
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset + InotifyEvent.size <= len(data):
+                _, mask, _, length = InotifyEvent.unpack_from(data, offset)
+                offset += InotifyEvent.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+
+                # Overflow : Fallback to full directory listing
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(os.listdir(self.dirpath))
+                elif len(name):
+                    changed.add(os.fsdecode(name))
+
+        return changed
+
+    def __listStats(self) -> dict[str, tuple[int, int]]:
+        """Returns (mtime, size) of every directory file."""
+        stats = {}
+        with os.scandir(self.dirpath) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                stats[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+        return stats
+
+    def __pollStats(self) -> set[str]:
+        """Compare directory files stats with previous ones."""
+        # Check : Polling interval
+        if time.monotonic() - self._polled < self.poll_interval:
+            return set()
+
+        stats = self.__listStats()
+        self._polled = time.monotonic()
+
+        # Changed : Added, removed or modified
+        changed = set(stats.keys()).symmetric_difference(self._stats.keys())
+        changed.update(
+            name
+            for name, stat in stats.items()
+            if (name in self._stats) and (self._stats[name] != stat)
+        )
+        self._stats = stats
+        return changed
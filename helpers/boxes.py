@@ -357,6 +357,33 @@ def iou(
     return intersection / (area1 + area2 - intersection)
 
 
+def iou_matrix(boxes1: np.ndarray, boxes2: np.ndarray) -> np.ndarray:
+    """Calculates iou metric of every boxes pair, (N,4) x (M,4) -> (N,M)."""
+    boxes1 = np.asarray(boxes1, dtype=np.float64).reshape(-1, 4)
+    boxes2 = np.asarray(boxes2, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x1e, y1e = (boxes1[:, None, k] for k in range(4))
+    x2, y2, x2e, y2e = (boxes2[None, :, k] for k in range(4))
+
+    # Areas : Same as GetArea
+    area1 = np.abs((x1e - x1) * (y1e - y1))
+    area2 = np.abs((x2e - x2) * (y2e - y2))
+
+    # Intersection : Same as GetIntersectionArea
+    begin = np.maximum(np.minimum(x1, x1e), np.minimum(x2, x2e))
+    end = np.minimum(np.maximum(x1, x1e), np.maximum(x2, x2e))
+    width = np.where(begin < end, end - begin, 0.0)
+    begin = np.maximum(np.minimum(y1, y1e), np.minimum(y2, y2e))
+    end = np.minimum(np.maximum(y1, y1e), np.maximum(y2, y2e))
+    height = np.where(begin < end, end - begin, 0.0)
+    intersection = width * height
+
+    # Check : No intersection
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            intersection == 0, 0.0, intersection / (area1 + area2 - intersection)
+        )
+
+
 def tiles_iou(
     box1: Tuple[float, float, float, float], box2: Tuple[float, float, float, float]
 ) -> float:
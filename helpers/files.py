@@ -17,6 +17,14 @@ def CreateDirectory(path: str) -> Path:
     return Path(path).mkdir(parents=True, exist_ok=True)
 
 
+def GetCacheDirectory() -> str:
+    """Returns user cache directory of application."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "yaya")
+
+
 def GetFileLocation(path: str) -> str:
     """Returns file location"""
     if path is None:
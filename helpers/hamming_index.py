@@ -0,0 +1,103 @@
+"""
+    Index of integer hashes answering queries "all hashes within
+    Hamming distance k" (multi-index hashing).
+
+    - Hash bits are split into k+1 disjoint chunks, two hashes within
+      distance k have at least one equal chunk (pigeonhole principle),
+    - every chunk has buckets of hash IDs keyed by chunk value,
+    - candidates from buckets are verified with vectorized popcount.
+"""
+
+from array import array
+
+import numpy as np
+
+# Number of set bits of every byte value
+ByteBits = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def PopCount(values: np.ndarray) -> np.ndarray:
+    """Returns number of set bits of every uint64 value."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+
+    return ByteBits[values.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+
+class HammingIndex:
+    """Multi-index hashing of integer hashes."""
+
+    def __init__(self, bits: int = 64, maxDistance: int = 2):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        bits : int
+            Number of hash bits, at most 64.
+        maxDistance : int
+            Maximal Hamming distance of queries.
+        """
+        self.bits = bits
+        self.maxDistance = maxDistance
+        # Chunks : (shift, mask) of k+1 disjoint parts of hash bits
+        chunks = min(bits, maxDistance + 1)
+        bounds = [round(index * bits / chunks) for index in range(chunks + 1)]
+        self._chunks = [
+            (begin, (1 << (end - begin)) - 1)
+            for begin, end in zip(bounds[:-1], bounds[1:])
+        ]
+        # Buckets of every chunk : chunk value -> hash IDs
+        self._buckets: list[dict[int, array]] = [{} for _ in self._chunks]
+        # Hashes by ID, growing array
+        self._hashes = np.zeros(1024, dtype=np.uint64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Returns number of hashes."""
+        return self._count
+
+    def Add(self, value: int) -> int:
+        """Add hash, returns its ID."""
+        index = self._count
+        if index == len(self._hashes):
+            self._hashes = np.concatenate(
+                (self._hashes, np.zeros(len(self._hashes), dtype=np.uint64))
+            )
+
+        self._hashes[index] = value
+        self._count += 1
+        for buckets, (shift, mask) in zip(self._buckets, self._chunks):
+            key = (value >> shift) & mask
+            if key not in buckets:
+                buckets[key] = array("q")
+            buckets[key].append(index)
+
+        return index
+
+    def Query(self, value: int, maxDistance: int = None) -> list[tuple[int, int]]:
+        """Returns (ID, distance) of hashes within distance, nearest first."""
+        if maxDistance is None:
+            maxDistance = self.maxDistance
+        maxDistance = min(maxDistance, self.maxDistance)
+
+        # Candidates : IDs with at least one equal chunk
+        candidates = [
+            np.frombuffer(buckets[key], dtype=np.int64)
+            for buckets, (shift, mask) in zip(self._buckets, self._chunks)
+            if (key := (value >> shift) & mask) in buckets
+        ]
+        if len(candidates) == 0:
+            return []
+
+        # Verify : Distance of candidates, then unique IDs in order of adding
+        ids = np.concatenate(candidates)
+        distances = PopCount(self._hashes[ids] ^ np.uint64(value))
+        selected = distances <= maxDistance
+        ids, distances = ids[selected], distances[selected]
+        if len(ids) > 1:
+            ids, first = np.unique(ids, return_index=True)
+            distances = distances[first]
+
+        order = np.argsort(distances, kind="stable")
+        return list(zip(ids[order].tolist(), distances[order].tolist()))
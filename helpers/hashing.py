@@ -4,6 +4,10 @@ Created on 12 lis 2020
 @author: spasz
 '''
 
+import hashlib
+import os
+from typing import Optional
+
 
 def GetHexList():
     ''' Returns hex list.'''
@@ -31,7 +35,6 @@ counter = 0
 
 def GetRandomSha1():
     '''Create image name'''
-    import hashlib
     import datetime
     global counter
     m = hashlib.sha1()
@@ -39,3 +42,39 @@ def GetRandomSha1():
     m.update(str(datetime.datetime.now().timestamp()).encode('ASCII'))
     counter += 1
     return m.hexdigest()
+
+
+# (path, mtime, size) -> content hash of file
+fileHashes = {}
+
+
+def GetFileHash(path: str, chunkSize: int = 1 << 20) -> Optional[str]:
+    '''Returns blake2b hash of file content, memoized by file stat.'''
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = fileHashes.get(key)
+    if digest is not None:
+        return digest
+
+    m = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb') as file:
+            while chunk := file.read(chunkSize):
+                m.update(chunk)
+    except OSError:
+        return None
+
+    # Check : Bounded memo, cleared at once
+    if len(fileHashes) >= 65536:
+        fileHashes.clear()
+    digest = fileHashes[key] = m.hexdigest()
+    return digest
+
+
+def GetTextHash(text: str) -> str:
+    '''Returns short blake2b hash of text.'''
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
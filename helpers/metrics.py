@@ -4,7 +4,11 @@ Created on 15 wrz 2020
 @author: spasz
 """
 
+import logging
 from dataclasses import dataclass, field
+from enum import Enum
+
+import numpy as np
 
 from engine.annote import Annote, AnnoteEvaluation
 from helpers import prefilters
@@ -12,6 +16,13 @@ from helpers import prefilters
 from . import boxes
 
 
+class MatchingMethod(str, Enum):
+    """Different annotations with detections matching methods."""
+
+    Greedy = "Greedy"
+    Hungarian = "Hungarian"
+
+
 @dataclass
 class Metrics:
     """List of evaluated metrics"""
@@ -32,64 +43,22 @@ class Metrics:
     FN: int = field(init=True, default=0)
     # Label true positive
     LTP: int = field(init=True, default=0)
-    # List of all detections
-    detections: list = field(init=True, default_factory=list)
-    # List of matched pairs (annotation, detection)
-    matches: list = field(init=True, default_factory=list)
+    # Confidence of all detections : mean, min, max
+    detections_confidence: float = field(init=True, default=0)
+    detections_confidence_min: float = field(init=True, default=0)
+    detections_confidence_max: float = field(init=True, default=0)
+    # Matched (annotation, confident detection) indexes, no Annote objects
+    matches: np.ndarray = field(
+        init=True, default_factory=lambda: np.zeros((0, 2), dtype=np.int32)
+    )
+    # Confidence of matched detections : mean, min, max
+    matches_confidence: float = field(init=True, default=0)
+    matches_confidence_min: float = field(init=True, default=0)
+    matches_confidence_max: float = field(init=True, default=0)
 
     def __post_init__(self):
         """Post initiliatizaton."""
 
-    @property
-    def detections_confidence(self) -> float:
-        """Returns confidence ."""
-        if len(self.detections) == 0:
-            return 0
-
-        return sum([item.confidence for item in self.detections]) / len(self.detections)
-
-    @property
-    def detections_confidence_min(self) -> float:
-        """Returns list of confidence values."""
-        if len(self.detections) == 0:
-            return 0
-
-        return min([item.confidence for item in self.detections])
-
-    @property
-    def detections_confidence_max(self) -> float:
-        """Returns list of confidence values."""
-        if len(self.detections) == 0:
-            return 0
-
-        return max([item.confidence for item in self.detections])
-
-    @property
-    def matches_confidence(self) -> float:
-        """Returns confidence ."""
-        if len(self.matches) == 0:
-            return 0
-
-        return sum(
-            [detection.confidence for annotation, detection in self.matches]
-        ) / len(self.matches)
-
-    @property
-    def matches_confidence_min(self) -> float:
-        """Returns list of confidence values."""
-        if len(self.matches) == 0:
-            return 0
-
-        return min([detection.confidence for annotation, detection in self.matches])
-
-    @property
-    def matches_confidence_max(self) -> float:
-        """Returns list of confidence values."""
-        if len(self.matches) == 0:
-            return 0
-
-        return max([detection.confidence for annotation, detection in self.matches])
-
     @property
     def AvgSize(self) -> float:
         """Returns metric."""
@@ -175,11 +144,56 @@ def dSurplus(annotations, detections, minConfidence=0.5):
     return len(detections) - len(annotations)
 
 
+def MatchGreedy(ious: np.ndarray, minIOU: float = 0.5) -> list[tuple[int, int]]:
+    """
+    Match every annotation (row), in order, with not matched detection
+    (column) of biggest IOU, first one if equal.
+
+    Returns list of matched (annotation, detection) indexes.
+    """
+    matches = []
+    # Check : No detections
+    if ious.shape[1] == 0:
+        return matches
+
+    available = np.ones(ious.shape[1], dtype=bool)
+    for i in range(ious.shape[0]):
+        row = np.where(available, ious[i], -1.0)
+        j = int(np.argmax(row))
+        if row[j] >= minIOU:
+            matches.append((i, j))
+            available[j] = False
+
+    return matches
+
+
+def MatchHungarian(ious: np.ndarray, minIOU: float = 0.5) -> list[tuple[int, int]]:
+    """
+    Match annotations (rows) with detections (columns) with maximal sum
+    of IOU, only pairs with (IOU >= minIOU). Requires scipy.
+
+    Returns list of matched (annotation, detection) indexes.
+    """
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:
+        logging.error("(Metrics) Hungarian matching requires scipy, using greedy!")
+        return MatchGreedy(ious, minIOU)
+
+    rows, cols = linear_sum_assignment(
+        np.where(ious >= minIOU, ious, 0.0), maximize=True
+    )
+    return [
+        (int(i), int(j)) for i, j in zip(rows, cols) if ious[i, j] >= minIOU
+    ]
+
+
 def EvaluateMetrics(
     annotations: list[Annote],
     detections: list[Annote],
     minConfidence: float = 0.5,
     minIOU: float = 0.5,
+    matching: MatchingMethod = MatchingMethod.Greedy,
 ) -> tuple:
     """
     Definition of terms:
@@ -200,8 +214,8 @@ def EvaluateMetrics(
     if (detections is None) or (len(detections) == 0):
         return Metrics(All=len(annotations))
 
-    # 0. Detections copy
-    original_detections = detections.copy()
+    # 0. Confidence of all detections
+    detectionsConfidence = [item.confidence for item in detections]
 
     # 1. Drop detections with (confidence < minConfidence)
     detections = [item for item in detections if (item.confidence > minConfidence)]
@@ -213,19 +227,23 @@ def EvaluateMetrics(
     # Detection lonely. => FP
     detectionsUnmatched = []
 
+    # 2. Calculate all possibilities, IOU of every annotation with detection
+    ious = boxes.iou_matrix(
+        [annotation.box for annotation in annotations],
+        [detection.box for detection in detections],
+    )
+
+    # 3. Match annotations with detections
+    if matching == MatchingMethod.Hungarian:
+        matched = dict(MatchHungarian(ious, minIOU))
+    else:
+        matched = dict(MatchGreedy(ious, minIOU))
+
     # For all annotations
-    for annotation in annotations:
-        # 1. Calculate all possibilities (detections)
-        possibilities = [
-            (boxes.iou(annotation.box, detection.box), detection)
-            for detection in detections
-        ]
-        # Sort possibilities by IOU
-        possibilities = sorted(possibilities, key=lambda x: x[0], reverse=True)
-
-        # Check first(biggest IOU) possibility
-        if len(possibilities) and (possibilities[0][0] >= minIOU):
-            iou, detection = possibilities[0]
+    for i, annotation in enumerate(annotations):
+        # Check matched detection
+        if i in matched:
+            iou, detection = float(ious[i, matched[i]]), detections[matched[i]]
 
             if annotation.classNumber == detection.classNumber:
                 annotation.SetEvalution(
@@ -240,17 +258,17 @@ def EvaluateMetrics(
                     confidence=detection.confidence,
                 )
             annotationsMatched.append((annotation, detection))
-            detections.remove(detection)
         # Otherwise not matched
         else:
             annotation.SetEvalution(AnnoteEvaluation.FalseNegative, iou=0, confidence=0)
             annotationsUnmatched.append(annotation)
 
-    # Detections unmatched are detections left in list.
-    detectionsUnmatched = detections
+    # Detections unmatched are detections left, in order.
+    unmatched = sorted(set(range(len(detections))).difference(matched.values()))
+    detectionsUnmatched = [detections[j] for j in unmatched]
     # For view : Filter by IOU internal with same annotes and also with txt annotes.
     detectionsUnmatched = prefilters.filter_iou_by_confidence(
-        detectionsUnmatched, annotations
+        detectionsUnmatched, annotations, ious=ious[:, unmatched].T
     )
 
     # True positives // Annotations Bboxes matched
@@ -272,6 +290,11 @@ def EvaluateMetrics(
         annotations
     )
 
+    # Confidence of matched detections
+    matchesConfidence = [
+        detection.confidence for _, detection in annotationsMatched
+    ] or [0]
+
     return Metrics(
         All=len(annotations),
         AvgWidth=avgWidth,
@@ -280,6 +303,11 @@ def EvaluateMetrics(
         FP=FP,
         FN=FN,
         LTP=LTP,
-        detections=original_detections,
-        matches=annotationsMatched,
+        detections_confidence=sum(detectionsConfidence) / len(detectionsConfidence),
+        detections_confidence_min=min(detectionsConfidence),
+        detections_confidence_max=max(detectionsConfidence),
+        matches=np.array(sorted(matched.items()), dtype=np.int32).reshape(-1, 2),
+        matches_confidence=sum(matchesConfidence) / len(matchesConfidence),
+        matches_confidence_min=min(matchesConfidence),
+        matches_confidence_max=max(matchesConfidence),
     )
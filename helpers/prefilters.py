@@ -4,40 +4,60 @@ Created on 18 lis 2020
 @author: spasz
 """
 
+from typing import Optional
+
 import numpy as np
 
 from engine.annote import Annote
 
-from helpers.boxes import iou
+from helpers.boxes import iou_matrix
 
 
 def filter_iou_by_confidence(
-    annotations1: list[Annote], annotations2: list[Annote], maxIOU: float = 0.70
+    annotations1: list[Annote],
+    annotations2: list[Annote],
+    maxIOU: float = 0.70,
+    ious: Optional[np.ndarray] = None,
 ) -> list[Annote]:
     """
     Filter annotation1 with annotations2
     if has bigger IOU > maxIOU.
     Annotation with bigger confidence stays!
+    Already calculated IOU matrix (len(annotations1), len(annotations2))
+    could be passed as ious.
     """
 
+    # Check : Nothing to compare
+    if (len(annotations1) == 0) or (len(annotations2) == 0):
+        return list(annotations1)
+
     # Create IOU results matrix
-    results = np.zeros([len(annotations1), len(annotations2)], dtype=np.float32)
-    for i, annote1 in enumerate(annotations1):
-        for j, annote2 in enumerate(annotations2):
-            if annote1 != annote2:
-                results[i, j] = iou(annote1.GetBox(), annote2.GetBox())
+    if ious is None:
+        ious = iou_matrix(
+            [annote1.GetBox() for annote1 in annotations1],
+            [annote2.GetBox() for annote2 in annotations2],
+        )
+    results = ious.astype(np.float32)
+
+    # Same annotation objects are not compared
+    ids1 = np.array([id(annote1) for annote1 in annotations1], dtype=np.uint64)
+    ids2 = np.array([id(annote2) for annote2 in annotations2], dtype=np.uint64)
+    results[ids1[:, None] == ids2[None, :]] = 0
+
+    # Overlapping : Columns with (IOU >= maxIOU) of every row, in order
+    overlapping: list[list[int]] = [[] for _ in annotations1]
+    for i, j in zip(*np.nonzero(results >= maxIOU)):
+        overlapping[i].append(j)
 
-    # Parse each row of IOU matrix
+    # Parse each row of IOU matrix, confidences are updated while parsing
     passed: list[Annote] = []
     for i, annote in enumerate(annotations1):
         isFiltered = False
 
-        # For every other annotation
-        for j in range(len(annotations2)):
-            # If (IOU >= maxIOU) and confidence is smaller
-            if (results[i, j] >= maxIOU) and (
-                annote.GetConfidence() <= annotations2[j].GetConfidence()
-            ):
+        # For every other overlapping annotation
+        for j in overlapping[i]:
+            # If confidence is smaller
+            if annote.GetConfidence() <= annotations2[j].GetConfidence():
                 isFiltered = True
                 # Affect annotations_2 confidence
                 annotations2[j].confidence = annote.confidence
@@ -3,10 +3,24 @@ Created on 16 lis 2020
 
 @author: spasz
 '''
+import logging
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
 from helpers.files import GetFilename, DeleteFile
+from helpers.writer import BufferedWriter, WriteAtomic
 import helpers.boxes as boxes
 
+# Annotations arrays : (classes int16 [N], boxes float64 rects [N,4])
+AnnotationsArrays = tuple[np.ndarray, np.ndarray]
+# Detections arrays : (classnames list[str], confidences float64 [N], boxes float64 rects [N,4])
+DetectionsArrays = tuple[list, np.ndarray, np.ndarray]
+
 
 def GetImageFilepath(annotationPath):
     ''' Returns image filepath.'''
@@ -40,56 +54,254 @@ def DeleteAnnotations(imagePath, extension='.txt'):
     DeleteFile(path)
 
 
+def ReadText(path: str, writer: Optional[BufferedWriter] = None) -> Optional[str]:
+    '''Read whole text file or its not written data, None if not exists.'''
+    if writer is not None:
+        data = writer.Get(path)
+        if data is not None:
+            return data.decode()
+
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode()
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def RowsPattern(columns: int) -> re.Pattern:
+    '''Returns pattern of lines with exactly `columns` single space separated tokens.'''
+    return re.compile(r'(?:\S+(?: \S+){%u}(?:\n|\Z))*' % (columns - 1))
+
+
+def SplitRows(text: str, columns: int, path: str = '') -> list[str]:
+    '''Split text lines into flat list of `columns` tokens per line.'''
+    # Fast path : Every line has exactly `columns` tokens, checked per line
+    # (other whitespace or line lengths are handled by slow path)
+    if RowsPattern(columns).fullmatch(text):
+        return text.split()
+
+    # Slow path : Extra tokens are skipped, too short lines are dropped
+    tokens = []
+    for line in text.splitlines():
+        values = line.split()
+        if len(values) == 0:
+            continue
+        if len(values) < columns:
+            logging.error('Invalid annotation line `%s` in %s!', line, path)
+            continue
+        tokens.extend(values[:columns])
+
+    return tokens
+
+
+def ToRects(bboxes: np.ndarray) -> np.ndarray:
+    '''Vectorized boxes.Bbox2Rect of [N,4] array.'''
+    half = bboxes[:, 2:4] / 2
+    rects = np.empty((len(bboxes), 4), dtype=np.float64)
+    np.subtract(bboxes[:, 0:2], half, out=rects[:, 0:2])
+    np.add(bboxes[:, 0:2], half, out=rects[:, 2:4])
+    return rects
+
+
+def ClassNumbers(tokens: list[str]) -> np.ndarray:
+    '''Returns class numbers of tokens, ValueError if not int16 integers (as int()).'''
+    try:
+        return np.array(tokens, dtype=np.int16)
+    except OverflowError as e:
+        raise ValueError(str(e)) from e
+
+
+def DropInvalidRows(rowTokens: list[str], columns: int, isNamed: bool, path: str = '') -> list[str]:
+    '''Returns tokens of rows without invalid numbers or class numbers.'''
+    tokens = []
+    for start in range(0, len(rowTokens), columns):
+        row = rowTokens[start:start + columns]
+        try:
+            if not isNamed:
+                ClassNumbers(row[:1])
+            np.array(row[1:], dtype=np.float64)
+        except ValueError:
+            logging.error('Invalid annotation line `%s` in %s!', ' '.join(row), path)
+            continue
+        tokens.extend(row)
+
+    return tokens
+
+
+def ParseRows(rows: list, columns: int, isNamed: bool = False) -> list:
+    '''Parse split rows tokens of many texts, None rows give None.'''
+    tokens, heads, offsets = [], [], [0]
+    for rowTokens in rows:
+        if rowTokens is not None:
+            # First column : Class names or class numbers
+            heads.extend(rowTokens[0::columns])
+            rowTokens = list(rowTokens)
+            del rowTokens[0::columns]
+            tokens.extend(rowTokens)
+        offsets.append(len(tokens))
+
+    # Numeric columns : One conversion for all texts
+    width = columns - 1
+    values = np.array(tokens, dtype=np.float64).reshape(-1, width)
+    rects = ToRects(values[:, width - 4:])
+    classes = None if isNamed else ClassNumbers(heads)
+
+    results = []
+    for index, rowTokens in enumerate(rows):
+        if rowTokens is None:
+            results.append(None)
+            continue
+
+        begin, end = offsets[index] // width, offsets[index + 1] // width
+        if isNamed:
+            results.append((heads[begin:end], values[begin:end, 0], rects[begin:end]))
+        else:
+            results.append((classes[begin:end], rects[begin:end]))
+
+    return results
+
+
+def ParseMany(texts: list, columns: int, paths: list = None, isNamed: bool = False) -> list:
+    '''Parse many texts with single numpy conversion, None text gives None.'''
+    paths = paths if (paths is not None) else [''] * len(texts)
+    rows = [
+        SplitRows(text, columns, path) if (text is not None) else None
+        for text, path in zip(texts, paths)
+    ]
+    try:
+        return ParseRows(rows, columns, isNamed)
+    except ValueError:
+        # Slow path : Invalid number, only invalid lines of its file dropped
+        rows = [
+            None if (rowTokens is None) else DropInvalidRows(rowTokens, columns, isNamed, path)
+            for rowTokens, path in zip(rows, paths)
+        ]
+        return ParseRows(rows, columns, isNamed)
+
+
+def ParseAnnotations(text: str, path: str = '') -> AnnotationsArrays:
+    '''Parse annotations text into arrays.'''
+    return ParseMany([text], 5, [path])[0]
+
+
+def ParseDetections(text: str, path: str = '') -> DetectionsArrays:
+    '''Parse detections text into arrays.'''
+    return ParseMany([text], 6, [path], isNamed=True)[0]
+
+
+def ReadTexts(paths: list, workers: int = 1, writer: Optional[BufferedWriter] = None) -> list:
+    '''Read many text files, concurrently for slow (network) storage.'''
+    if (workers <= 1) or (len(paths) <= 1):
+        return [ReadText(path, writer) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda path: ReadText(path, writer), paths))
+
+
+def ReadAnnotationsArrays(imagePath, extension='.txt',
+                          writer: Optional[BufferedWriter] = None) -> Optional[AnnotationsArrays]:
+    '''Read annotations file into arrays, None if file not exists.'''
+    return ReadManyAnnotationsArrays([imagePath], extension, writer=writer)[0]
+
+
+def ReadDetectionsArrays(imagePath, extension='.txt',
+                         writer: Optional[BufferedWriter] = None) -> Optional[DetectionsArrays]:
+    '''Read detections file into arrays, None if file not exists.'''
+    return ReadManyDetectionsArrays([imagePath], extension, writer=writer)[0]
+
+
+def ReadManyAnnotationsArrays(imagePaths: list, extension='.txt', workers: int = 1,
+                              writer: Optional[BufferedWriter] = None) -> list:
+    '''Read annotations of many images concurrently, in order of paths.'''
+    paths = [GetFilename(imagePath)+extension for imagePath in imagePaths]
+    return ParseMany(ReadTexts(paths, workers, writer), 5, paths)
+
+
+def ReadManyDetectionsArrays(imagePaths: list, extension='.txt', workers: int = 1,
+                             writer: Optional[BufferedWriter] = None) -> list:
+    '''Read detections of many images concurrently, in order of paths.'''
+    paths = [GetFilename(imagePath)+extension for imagePath in imagePaths]
+    return ParseMany(ReadTexts(paths, workers, writer), 6, paths, isNamed=True)
+
+
+def ToAnnotations(arrays: Optional[AnnotationsArrays]) -> list:
+    '''Convert annotations arrays to list of (classNumber, box).'''
+    if arrays is None:
+        return []
+
+    classes, rects = arrays
+    return list(zip(classes.tolist(), map(tuple, rects.tolist())))
+
+
+def ToDetections(arrays: Optional[DetectionsArrays]) -> list:
+    '''Convert detections arrays to list of (className, confidence, box).'''
+    if arrays is None:
+        return []
+
+    classnames, confidences, rects = arrays
+    return list(zip(classnames, confidences.tolist(), map(tuple, rects.tolist())))
+
+
 def ReadAnnotations(imagePath, extension='.txt'):
     '''Read annotations from file.'''
-    annotations = []
     path = GetFilename(imagePath)+extension
-    with open(path, 'r') as f:
-        for line in f:
-            txtAnnote = (line.rstrip('\n').split(' '))
-            classNumber = int(txtAnnote[0])
-            box = (float(txtAnnote[1]), float(txtAnnote[2]),
-                   float(txtAnnote[3]), float(txtAnnote[4]))
-            box = boxes.Bbox2Rect(box)
-            annotations.append((classNumber, box))
-
-    return annotations
+    with open(path, 'rb') as f:
+        return ToAnnotations(ParseAnnotations(f.read().decode(), path))
 
 
 def ReadDetections(imagePath, extension='.txt'):
     '''Read annotations detections from file.'''
-    annotations = []
     path = GetFilename(imagePath)+extension
-    with open(path, 'r') as f:
-        for line in f:
-            txtAnnote = (line.rstrip('\n').split(' '))
-            className = str(txtAnnote[0])
-            confidence = float(txtAnnote[1])
-            box = (float(txtAnnote[2]), float(txtAnnote[3]),
-                   float(txtAnnote[4]), float(txtAnnote[5]))
-            box = boxes.Bbox2Rect(box)
-            annotations.append((className, confidence, box))
+    with open(path, 'rb') as f:
+        return ToDetections(ParseDetections(f.read().decode(), path))
 
-    return annotations
 
+def FormatAnnotations(annotations) -> str:
+    '''Format annotations as text of annotations file.'''
+    lines = []
+    for element in annotations:
+        classNumber, box = element
+        box = boxes.Rect2Bbox(box)
+        lines.append('%u %2.6f %2.6f %2.6f %2.6f\n' %
+                     (classNumber, box[0], box[1], box[2], box[3]))
 
-def SaveAnnotations(imagePath, annotations, extension='.txt'):
-    '''Save annotations for file.'''
+    return ''.join(lines)
+
+
+def FormatDetections(annotations) -> str:
+    '''Format detections as text of detections file.'''
+    lines = []
+    for element in annotations:
+        className, confidence, box = element
+        box = boxes.Rect2Bbox(box)
+        lines.append('%s %2.2f %2.6f %2.6f %2.6f %2.6f\n' %
+                     (className, confidence, box[0], box[1], box[2], box[3]))
+
+    return ''.join(lines)
+
+
+def SaveAnnotations(imagePath, annotations, extension='.txt',
+                    writer: Optional[BufferedWriter] = None):
+    '''Save annotations for file, atomic or queued in background writer.'''
     path = GetFilename(imagePath)+extension
-    with open(path, 'w') as f:
-        for element in annotations:
-            classNumber, box = element
-            box = boxes.Rect2Bbox(box)
-            f.write('%u %2.6f %2.6f %2.6f %2.6f\n' %
-                    (classNumber, box[0], box[1], box[2], box[3]))
+    if writer is not None:
+        writer.Write(path, FormatAnnotations(annotations))
+    else:
+        WriteAtomic(path, FormatAnnotations(annotations))
 
 
-def SaveDetections(imagePath, annotations, extension='.txt'):
-    '''Save annotations for file.'''
+def SaveDetections(imagePath, annotations, extension='.txt',
+                   writer: Optional[BufferedWriter] = None,
+                   isChangedOnly: bool = False):
+    '''Save detections for file, atomic or queued in background writer.'''
     path = GetFilename(imagePath)+extension
-    with open(path, 'w') as f:
-        for element in annotations:
-            className, confidence, box = element
-            box = boxes.Rect2Bbox(box)
-            f.write('%s %2.2f %2.6f %2.6f %2.6f %2.6f\n' %
-                    (className, confidence, box[0], box[1], box[2], box[3]))
+    text = FormatDetections(annotations)
+    # Check : Same content, file (and its mtime) is not touched
+    if isChangedOnly and (ReadText(path, writer=writer) == text):
+        return
+
+    if writer is not None:
+        writer.Write(path, text)
+    else:
+        WriteAtomic(path, text)
@@ -5,15 +5,38 @@
 
 from __future__ import annotations
 from dataclasses import asdict, dataclass, field
+import io
+import logging
 import os
+import threading
 from typing import Optional
 import cv2
 import numpy as np
 import imagehash
 from PIL import Image
 from helpers.files import ChangeExtension
+from helpers.hamming_index import HammingIndex
 from helpers.json import jsonRead, jsonWrite
 
+# Grid size (rows and columns) of image visuals
+GridSize = 20
+# Minimal size of reduced resolution image
+ReducedMinSize = 8 * GridSize
+# Number of bits of dhash (hash size 6)
+DhashBits = 36
+# Maximal difference of similar images mean (S, V), 3% of range,
+# mean hue is not compared, it's unstable for gray pixels.
+SimilarTolerance = 255 * 0.03
+# EXIF orientation tag
+ExifOrientation = 0x0112
+# Reduction factor -> JPEG reduced resolution reading flags
+ReducedFlags = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
 
 @dataclass
 class Visuals:
@@ -25,12 +48,15 @@ class Visuals:
     width: float = field(init=True, default=0)
     # Image height
     height: float = field(init=True, default=0)
-    # Grid 20x20 of tuples(h,s,v) of image informations
+    # Grid 20x20 of tuples(h,s,v) of image informations,
+    # or array (20,20,3) view of visuals store.
     grid: list[tuple[float, float, float]] = field(init=True, default_factory=list)
     # Diffrential (perceptual) hash of image
     dhash: str = 0
     # True if it's duplicate of other image
     isDuplicate: bool = False
+    # Duplicates cluster ID, -1 if image has no duplicates
+    duplicateGroup: int = -1
 
     def __post_init__(self):
         """Post initiliatizaton."""
@@ -38,22 +64,33 @@ class Visuals:
     @property
     def hue(self) -> float:
         """Returns average hue of image."""
-        return np.mean([item[0] for item in self.grid])
+        return np.mean(np.reshape(self.grid, (-1, 3))[:, 0])
 
     @property
     def saturation(self) -> float:
         """Returns average saturation of image."""
-        return np.mean([item[1] for item in self.grid])
+        return np.mean(np.reshape(self.grid, (-1, 3))[:, 1])
 
     @property
     def brightness(self) -> float:
         """Returns average brightness of image."""
-        return np.mean([item[2] for item in self.grid])
+        return np.mean(np.reshape(self.grid, (-1, 3))[:, 2])
+
+    @property
+    def dhash_int(self) -> int:
+        """Returns dhash as integer of DhashBits bits."""
+        return round(self.dhash * (1 << DhashBits))
+
+    def IsSimilar(self, other: Visuals) -> bool:
+        """True if mean saturation and brightness of images are within tolerance."""
+        return (abs(self.saturation - other.saturation) <= SimilarTolerance) and (
+            abs(self.brightness - other.brightness) <= SimilarTolerance
+        )
 
     @property
     def numpy_grid(self) -> np.ndarray:
         """Returns grid as numpy array."""
-        array = np.array(self.grid).reshape((20, 20, 3))
+        array = np.array(self.grid).reshape((GridSize, GridSize, 3))
         # Replace NaN as zeroes
         array = np.nan_to_num(array, copy=False, nan=0.0)
         return array
@@ -67,21 +104,55 @@ class Visuals:
         # Create visuals annotations json filepath.
         jsonpath = ChangeExtension(self.imagepath, ".visuals.json")
 
-        # Save data to json file.
-        jsonWrite(jsonpath, asdict(self))
+        # Save data to json file, grid as list of tuples.
+        data = asdict(self)
+        data["grid"] = np.reshape(self.grid, (-1, 3)).tolist()
+        jsonWrite(jsonpath, data)
 
     @staticmethod
-    def LoadCreate(imagepath: str, force: bool = False) -> Visuals:
-        """Load or create visuals from image."""
-
-        # 1. Load from json file
+    def LoadCreate(
+        imagepath: str,
+        force: bool = False,
+        store: Optional[VisualsStore] = None,
+        save: bool = True,
+        image: Optional[np.ndarray] = None,
+    ) -> Visuals:
+        """
+        Load or create visuals from image.
+
+        Parameters
+        ----------
+        imagepath : str
+            Image path.
+        force : bool
+            Force recreation of visuals.
+        store : VisualsStore
+            Opened directory visuals store, used instead of json files,
+            json files are migrated to store.
+        save : bool
+            Save created visuals to json file, if store is not used.
+        image : np.ndarray
+            Already decoded BGR image, otherwise image file is read.
+        """
+        # 1. Load from visuals store
+        if (store is not None) and (not force):
+            loaded = store.Get(imagepath)
+            if loaded is not None:
+                return loaded
+
+        # 2. Load from json file
         loaded = Visuals.Load(imagepath)
         if (loaded is not None) and (not force):
+            if store is not None:
+                store.Put(loaded)
             return loaded
 
-        # 2. Otherwise create and save
-        visuals = Visuals.Create(imagepath)
-        visuals.Save()
+        # 3. Otherwise create and save
+        visuals = Visuals.Create(imagepath, image=image)
+        if store is not None:
+            store.Put(visuals)
+        elif save:
+            visuals.Save()
 
         return visuals
 
@@ -101,44 +172,34 @@ class Visuals:
             return None
 
     @staticmethod
-    def Create(imagepath: str) -> Visuals:
-        """Create visuals from image."""
+    def Create(imagepath: str, image: Optional[np.ndarray] = None) -> Visuals:
+        """Create visuals from image file or already decoded BGR image."""
         # Check : Not existing image, empty visuals
         if not os.path.exists(imagepath):
             return Visuals(imagepath=imagepath)
 
-        # Load/Check image
-        image = cv2.imread(imagepath)
+        # Load/Check image, reduced resolution if possible
+        if image is not None:
+            image, width, height = ReduceImage(imagepath, image)
+        else:
+            image, width, height = ReadImageReduced(imagepath)
         if image is None:
             return Visuals(imagepath=imagepath)
 
-        # Get image size
-        height, width, _ = image.shape
-
         image_hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
 
-        # Grid : Calculate HSV of every grid part
-        grid: list[tuple[float, float, float]] = []
-        for row in range(20):
-            for col in range(20):
-                # Get grid part
-                grid_part = image_hsv[
-                    row * height // 20 : (row + 1) * height // 20,
-                    col * width // 20 : (col + 1) * width // 20,
-                ]
-
-                # Calculate mean of HSV
-                h = np.mean(grid_part[:, :, 0])
-                s = np.mean(grid_part[:, :, 1])
-                v = np.mean(grid_part[:, :, 2])
-
-                # Add to grid
-                grid.append((h, s, v))
+        # Grid : Mean HSV of every grid part, as area resampling
+        grid_hsv = cv2.resize(
+            image_hsv.astype(np.float32),
+            (GridSize, GridSize),
+            interpolation=cv2.INTER_AREA,
+        )
+        grid = [tuple(item) for item in grid_hsv.reshape(-1, 3).tolist()]
 
         # Image hash : Calculate hash of image
         image_pil = Image.fromarray(image)
         dhash = imagehash.dhash(image_pil, hash_size=6)
-        dhash_normalized = int(str(dhash), 16) / (16**9)
+        dhash_normalized = int(str(dhash), 16) / (1 << DhashBits)
 
         return Visuals(
             imagepath=imagepath,
@@ -149,24 +210,121 @@ class Visuals:
         )
 
 
+def ReadImageReduced(imagepath: str) -> tuple[Optional[np.ndarray], int, int]:
+    """
+    Read image with reduced resolution when format allows it
+    (JPEG DCT scaling), otherwise read full resolution image.
+
+    Returns
+    -------
+    tuple
+        Image (or None), original width and height.
+    """
+    # Check : Only JPEG supports reduced resolution decoding
+    if not imagepath.lower().endswith((".jpg", ".jpeg")):
+        image = cv2.imread(imagepath)
+        if image is None:
+            return None, 0, 0
+
+        height, width = image.shape[0:2]
+        return image, width, height
+
+    # Image size : Read only header
+    try:
+        with Image.open(imagepath) as image_pil:
+            width, height = image_pil.size
+            # EXIF orientation : Rotated images are read transposed
+            if image_pil.getexif().get(ExifOrientation, 1) in (5, 6, 7, 8):
+                width, height = height, width
+    except Exception:
+        return None, 0, 0
+
+    image = cv2.imread(imagepath, ReducedFlags[GetReducedFactor(width, height)])
+    if image is None:
+        return None, 0, 0
+
+    return image, width, height
+
+
+def GetReducedFactor(width: int, height: int) -> int:
+    """Biggest reduction factor keeping enough pixels for grid and hash."""
+    for factor in (8, 4, 2):
+        if min(width, height) // factor >= ReducedMinSize:
+            return factor
+
+    return 1
+
+
+def ReduceImage(imagepath: str, image: np.ndarray) -> tuple[np.ndarray, int, int]:
+    """
+    Reduce already decoded image same as reduced resolution reading,
+    so visuals are the same for decoded and read images.
+
+    Returns
+    -------
+    tuple
+        Image, original width and height.
+    """
+    height, width = image.shape[0:2]
+    if not imagepath.lower().endswith((".jpg", ".jpeg")):
+        return image, width, height
+
+    factor = GetReducedFactor(width, height)
+    if factor == 1:
+        return image, width, height
+
+    size = (-(-width // factor), -(-height // factor))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), width, height
+
+
 @dataclass
 class VisualsDuplicates:
-    """Dataclass for visuals duplicates finder."""
-
-    # Dictionary with hashes : visuals
-    visuals: dict = field(init=True, default_factory=dict)
+    """
+    Dataclass for visuals duplicates finder.
+
+    - Duplicate : same dhash and same mean HSV as earlier image,
+    - near duplicate : dhash within Hamming distance and mean HSV
+      within tolerance, e.g. re-encoded, resized or cropped copy,
+    - duplicates share cluster ID (duplicateGroup) of first image.
+    """
+
+    # Maximal Hamming distance of near duplicates dhash
+    maxDistance: int = field(init=True, default=2)
+    # Index of integer dhashes, ID is position in visuals list
+    index: HammingIndex = field(init=False)
+    # Added visuals by index ID
+    visuals: list = field(init=False, default_factory=list)
 
     def __post_init__(self):
         """Post initiliatizaton."""
+        self.index = HammingIndex(bits=DhashBits, maxDistance=self.maxDistance)
 
-    def Add(self, visuals: Visuals):
-        """Add visuals to dictionary."""
+    def Add(self, visuals: Visuals) -> bool:
+        """Add visuals to index, True if it's duplicate of earlier image."""
         # Check : Invalid visuals
         if visuals is None:
-            return
+            return False
+
+        # Cluster : Join cluster of nearest earlier duplicate
+        visuals.duplicateGroup = -1
+        found = self.FindDuplicate(visuals)
+        if found is not None:
+            other = self.visuals[found]
+            if other.duplicateGroup < 0:
+                other.duplicateGroup = found
+            visuals.duplicateGroup = other.duplicateGroup
+
+        self.index.Add(visuals.dhash_int)
+        self.visuals.append(visuals)
+        return found is not None
+
+    def FindDuplicate(self, visuals: Visuals) -> Optional[int]:
+        """Returns ID of nearest earlier visuals which visuals duplicates."""
+        for index, _ in self.index.Query(visuals.dhash_int):
+            if visuals.IsSimilar(self.visuals[index]):
+                return index
 
-        # Add visuals to dictionary
-        self.visuals[visuals.dhash] = visuals
+        return None
 
     def IsDuplicate(self, visuals: Visuals) -> bool:
         """Check if visuals is duplicate of other image."""
@@ -174,14 +332,318 @@ class VisualsDuplicates:
         if visuals is None:
             return False
 
-        # Check : Duplicate
-        if visuals.dhash not in self.visuals:
+        return self.FindDuplicate(visuals) is not None
+
+
+class VisualsStore:
+    """
+    Columnar store of directory visuals, instead of json file per image.
+
+    - '.yaya.visuals.npy' : memory mapped grids array (N, 20, 20, 3),
+    - '.yaya.visuals.npz' : names, widths, heights and dhashes arrays,
+    - visuals of stored images hold views into memory mapped grids,
+    - new images are appended at the end of grids array, whole store is
+      rewritten only if images were removed.
+    """
+
+    # Store filename inside images directory
+    filename: str = ".yaya.visuals"
+    # Number of rows copied at once while rewriting store
+    copy_rows: int = 4096
+
+    def __init__(self):
+        """Constructor."""
+        self._dirpath: Optional[str] = None
+        # Stored : Filename -> row of arrays
+        self._rows: dict[str, int] = {}
+        self._grids: Optional[np.ndarray] = None
+        self._widths: Optional[np.ndarray] = None
+        self._heights: Optional[np.ndarray] = None
+        self._dhashes: Optional[np.ndarray] = None
+        # Not saved : Filename -> visuals
+        self._pending: dict[str, Visuals] = {}
+        # Not saved : Removed filenames
+        self._removed: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True if store is opened."""
+        return self._dirpath is not None
+
+    @property
+    def grids_path(self) -> str:
+        """Path of grids array file."""
+        return f"{self._dirpath}{self.filename}.npy"
+
+    @property
+    def meta_path(self) -> str:
+        """Path of names, sizes and hashes arrays file."""
+        return f"{self._dirpath}{self.filename}.npz"
+
+    def Open(self, dirpath: str) -> None:
+        """
+        Open store of directory.
+
+        Parameters
+        ----------
+        dirpath : str
+            Directory path with '/' at the end.
+        """
+        self.Close()
+        self._dirpath = dirpath
+        self.__load()
+
+    def Close(self) -> None:
+        """Save and close store."""
+        if not self.is_open:
+            return
+
+        self.Save()
+        self._dirpath = None
+        self.__reset()
+
+    def Get(self, imagepath: str) -> Optional[Visuals]:
+        """Returns stored visuals of image, grid is view of store."""
+        name = os.path.basename(imagepath)
+        with self._lock:
+            if name in self._pending:
+                return self._pending[name]
+
+            row = self._rows.get(name)
+            if (row is None) or (name in self._removed):
+                return None
+
+            return Visuals(
+                imagepath=imagepath,
+                width=int(self._widths[row]),
+                height=int(self._heights[row]),
+                grid=self._grids[row],
+                dhash=float(self._dhashes[row]),
+            )
+
+    def Put(self, visuals: Visuals) -> None:
+        """Store visuals of image, saved on Save/Close."""
+        # Check : Empty visuals of not readable image
+        grid = np.asarray(visuals.grid, dtype=np.float32)
+        if (visuals.imagepath is None) or (grid.size != GridSize * GridSize * 3):
+            return
+
+        grid = grid.reshape((GridSize, GridSize, 3))
+        name = os.path.basename(visuals.imagepath)
+        with self._lock:
+            # Check : Unchanged stored visuals
+            row = self._rows.get(name)
+            if (
+                (row is not None)
+                and (name not in self._pending)
+                and (name not in self._removed)
+                and (self._widths[row] == visuals.width)
+                and (self._heights[row] == visuals.height)
+                and (self._dhashes[row] == visuals.dhash)
+                and np.array_equal(self._grids[row], grid, equal_nan=True)
+            ):
+                return
+
+            visuals.grid = grid
+            self._pending[name] = visuals
+            self._removed.discard(name)
+
+    def Prune(self, names: list[str]) -> None:
+        """Remove visuals of images not found in names."""
+        names = set(names)
+        with self._lock:
+            self._removed = set(self._rows).difference(names)
+            for name in set(self._pending).difference(names):
+                self._pending.pop(name)
+
+    def Save(self) -> None:
+        """Save not saved changes."""
+        if (not self.is_open) or ((not self._pending) and (not self._removed)):
+            return
+
+        with self._lock:
+            try:
+                # Updated : Only stored rows changed, write in place
+                if (not self._removed) and all(
+                    name in self._rows for name in self._pending
+                ):
+                    self.__saveInPlace()
+                # Added : New rows appended, stored rows changed in place
+                elif self._removed or (not self.__saveAppend()):
+                    self.__saveRewrite()
+            except (OSError, ValueError) as e:
+                logging.error("(VisualsStore) Cannot save `%s`! %s", self._dirpath, e)
+                return
+
+            # Visuals : Saved grids as views of store
+            pending = self._pending
+            self.__load()
+            for name, visuals in pending.items():
+                visuals.grid = self._grids[self._rows[name]]
+
+        logging.info("(VisualsStore) Saved %u visuals.", len(pending))
+
+    def __reset(self) -> None:
+        """Reset loaded arrays and not saved changes."""
+        self._rows = {}
+        self._grids = None
+        self._widths = np.zeros(0, dtype=np.int64)
+        self._heights = np.zeros(0, dtype=np.int64)
+        self._dhashes = np.zeros(0, dtype=np.float64)
+        self._pending = {}
+        self._removed = set()
+
+    def __load(self) -> None:
+        """Load stored arrays, grids are memory mapped."""
+        self.__reset()
+        if not (os.path.exists(self.grids_path) and os.path.exists(self.meta_path)):
+            return
+
+        try:
+            grids = np.load(self.grids_path, mmap_mode="r")
+            with np.load(self.meta_path) as meta:
+                names = meta["names"].tolist()
+                widths, heights = meta["widths"], meta["heights"]
+                dhashes = meta["dhashes"]
+        except (OSError, ValueError, KeyError) as e:
+            logging.error("(VisualsStore) Invalid store `%s`! %s", self._dirpath, e)
+            return
+
+        # Check : Consistent arrays
+        if (grids.shape[1:] != (GridSize, GridSize, 3)) or not (
+            len(grids) == len(names) == len(widths) == len(heights) == len(dhashes)
+        ):
+            logging.error("(VisualsStore) Invalid store `%s`!", self._dirpath)
+            return
+
+        self._rows = {name: row for row, name in enumerate(names)}
+        self._grids = grids
+        self._widths, self._heights, self._dhashes = widths, heights, dhashes
+
+    def __saveMeta(self, path: str, names: list[str], rows: list) -> None:
+        """Save names, sizes and hashes arrays of rows (index or visuals)."""
+        widths = np.zeros(len(rows), dtype=np.int64)
+        heights = np.zeros(len(rows), dtype=np.int64)
+        dhashes = np.zeros(len(rows), dtype=np.float64)
+        for index, row in enumerate(rows):
+            if isinstance(row, Visuals):
+                widths[index], heights[index] = row.width, row.height
+                dhashes[index] = row.dhash
+            else:
+                widths[index], heights[index] = self._widths[row], self._heights[row]
+                dhashes[index] = self._dhashes[row]
+
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                names=np.array(names, dtype=str),
+                widths=widths,
+                heights=heights,
+                dhashes=dhashes,
+            )
+
+    def __saveInPlace(self) -> None:
+        """Write updated rows into existing store."""
+        grids = np.load(self.grids_path, mmap_mode="r+")
+        for name, visuals in self._pending.items():
+            grids[self._rows[name]] = visuals.grid
+        grids.flush()
+        del grids
+
+        names = list(self._rows)
+        rows = [self._pending.get(name, row) for name, row in self._rows.items()]
+        self.__saveMeta(self.meta_path + ".tmp", names, rows)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+
+    def __saveAppend(self) -> bool:
+        """Append new rows at the end of existing store, True if saved,
+        False if grids array header cannot be updated in place."""
+        if (self._grids is None) or (not os.path.exists(self.grids_path)):
             return False
 
-        # Check : HSV
-        other = self.visuals[visuals.dhash]
-        return (
-            (visuals.hue == other.hue)
-            and (visuals.saturation == other.saturation)
-            and (visuals.brightness == other.brightness)
+        added = [name for name in self._pending if name not in self._rows]
+        rowSize = GridSize * GridSize * 3 * np.dtype(np.float32).itemsize
+        with open(self.grids_path, "r+b") as f:
+            # Header : Same array of stored rows
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, isFortran, dtype = np.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, isFortran, dtype = np.lib.format.read_array_header_2_0(f)
+            else:
+                return False
+            offset = f.tell()
+            if (
+                isFortran
+                or (dtype != np.float32)
+                or (shape != (len(self._rows), GridSize, GridSize, 3))
+            ):
+                return False
+
+            # Header : New shape must fit in place (numpy pads header)
+            header = io.BytesIO()
+            headerData = {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                "fortran_order": False,
+                "shape": (len(self._rows) + len(added), GridSize, GridSize, 3),
+            }
+            if version == (1, 0):
+                np.lib.format.write_array_header_1_0(header, headerData)
+            else:
+                np.lib.format.write_array_header_2_0(header, headerData)
+            if len(header.getvalue()) != offset:
+                return False
+
+            # Rows : Changed in place, new at the end, then header
+            for name, visuals in self._pending.items():
+                row = self._rows.get(name)
+                if row is None:
+                    continue
+                f.seek(offset + row * rowSize)
+                f.write(np.ascontiguousarray(visuals.grid, dtype=np.float32).tobytes())
+            f.seek(offset + len(self._rows) * rowSize)
+            for name in added:
+                grid = self._pending[name].grid
+                f.write(np.ascontiguousarray(grid, dtype=np.float32).tobytes())
+            f.truncate()
+            f.flush()
+            f.seek(0)
+            f.write(header.getvalue())
+
+        names = list(self._rows) + added
+        rows = [self._pending.get(name, row) for name, row in self._rows.items()]
+        rows += [self._pending[name] for name in added]
+        self.__saveMeta(self.meta_path + ".tmp", names, rows)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
+        return True
+
+    def __saveRewrite(self) -> None:
+        """Write new store with kept stored rows and not saved visuals."""
+        kept = [
+            name
+            for name in self._rows
+            if (name not in self._removed) and (name not in self._pending)
+        ]
+        names = kept + list(self._pending)
+        rows = [self._rows[name] for name in kept] + list(self._pending.values())
+
+        grids = np.lib.format.open_memmap(
+            self.grids_path + ".tmp",
+            mode="w+",
+            dtype=np.float32,
+            shape=(len(names), GridSize, GridSize, 3),
         )
+        # Kept : Copy stored rows in parts
+        for start in range(0, len(kept), self.copy_rows):
+            part = rows[start : start + self.copy_rows]
+            grids[start : start + len(part)] = self._grids[part]
+        # Pending : Copy not saved visuals
+        for index, visuals in enumerate(self._pending.values(), start=len(kept)):
+            grids[index] = visuals.grid
+        grids.flush()
+        del grids
+
+        self.__saveMeta(self.meta_path + ".tmp", names, rows)
+        os.replace(self.grids_path + ".tmp", self.grids_path)
+        os.replace(self.meta_path + ".tmp", self.meta_path)
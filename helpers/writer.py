@@ -0,0 +1,189 @@
+"""
+    Atomic file writes and buffered background writer of small files.
+
+    - WriteAtomic : temporary file in same directory, then os.replace(),
+    - BufferedWriter : writes are queued and coalesced by path, written
+      atomically by background thread in batches,
+    - pending data can be read back by Get() before it is written,
+    - Flush() is barrier which waits for all writes (and fsync).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional, Union
+
+
+def WriteAtomic(path: str, data: Union[bytes, str], fsync: bool = False) -> bool:
+    """Write file atomically by rename of temporary file, True if written."""
+    if isinstance(data, str):
+        data = data.encode()
+
+    dirpath, filename = os.path.split(path)
+    tmppath = os.path.join(
+        dirpath, f".{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        with open(tmppath, "wb") as file:
+            file.write(data)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(tmppath, path)
+    except OSError as e:
+        logging.error("(WriteAtomic) Writing `%s` failed! %s", path, e)
+        if os.path.exists(tmppath):
+            os.remove(tmppath)
+        return False
+
+    return True
+
+
+def SyncDirectory(dirpath: str) -> None:
+    """Fsync directory entries (renames), if supported by platform."""
+    try:
+        fd = os.open(dirpath or ".", os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BufferedWriter:
+    """Buffered background writer of small files."""
+
+    def __init__(self, interval: float = 0.2):
+        """
+        Constructor
+
+        Parameters
+        ----------
+        interval : float
+            Interval [s] of collecting writes into single batch.
+        """
+        self.interval = interval
+        # Path -> data, queued and not yet written
+        self._pending: dict[str, bytes] = {}
+        # Path -> data, batch being written
+        self._writing: dict[str, bytes] = {}
+        # Written paths, not synchronized to disk
+        self._not_synced: set[str] = set()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._is_closed = False
+        # Number of waiting Flush() calls
+        self._flushes = 0
+
+    def __len__(self) -> int:
+        """Returns number of not written files."""
+        with self._condition:
+            return len(self._pending) + len(self._writing)
+
+    def Write(self, path: str, data: Union[bytes, str]) -> None:
+        """Queue write of file, previous not written data is replaced."""
+        if isinstance(data, str):
+            data = data.encode()
+
+        with self._condition:
+            # Check : Closed writer, write in calling thread
+            if self._is_closed:
+                WriteAtomic(path, data)
+                return
+
+            self._pending[path] = data
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.__run, name="BufferedWriter", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify_all()
+
+    def Get(self, path: str) -> Optional[bytes]:
+        """Returns not written data of file, None if nothing queued."""
+        with self._condition:
+            data = self._pending.get(path)
+            if data is None:
+                data = self._writing.get(path)
+            return data
+
+    def Discard(self, path: str) -> None:
+        """Discard queued write of file, e.g. before file removal."""
+        with self._condition:
+            self._pending.pop(path, None)
+            # Barrier : File in written batch must be written before removal
+            while path in self._writing:
+                self._condition.wait()
+
+    def Flush(self, fsync: bool = True) -> None:
+        """Wait until all queued files are written, optionally fsync them."""
+        with self._condition:
+            self._flushes += 1
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                self._condition.wait()
+            self._flushes -= 1
+
+            paths = self._not_synced
+            self._not_synced = set()
+
+        if not fsync:
+            return
+
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        for dirpath in {os.path.dirname(path) for path in paths}:
+            SyncDirectory(dirpath)
+
+    def Close(self) -> None:
+        """Flush all files and stop background thread."""
+        self.Flush(fsync=True)
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify_all()
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None:
+            thread.join()
+
+    def __run(self) -> None:
+        """Background thread, writes batches of queued files."""
+        while True:
+            with self._condition:
+                while (not self._pending) and (not self._is_closed):
+                    self._condition.wait()
+
+                if (not self._pending) and self._is_closed:
+                    return
+
+                # Batch : Collect more writes for short interval, unless flushed
+                deadline = time.monotonic() + self.interval
+                while (not self._flushes) and (not self._is_closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                self._writing, self._pending = self._pending, {}
+
+            for path, data in self._writing.items():
+                WriteAtomic(path, data)
+
+            with self._condition:
+                self._not_synced.update(self._writing.keys())
+                self._writing = {}
+                self._condition.notify_all()
@@ -0,0 +1,44 @@
+"""
+Test file for the annotation_table module.
+"""
+
+import pickle
+
+import numpy as np
+
+import engine.annote as annote
+from engine.annotation_table import AnnotationTable
+from engine.annote_enums import AnnoteAuthorType, AnnoteEvaluation
+
+
+def test_annotation_table_views():
+    """Views of table rows behave as source Annote objects."""
+    annote.Init(["car", "person"])
+    annotations = [
+        annote.fromTxtAnnote((1, (0.1, 0.2, 0.3, 0.4))),
+        annote.fromDetection(("car", 90.0, (0.5, 0.5, 0.7, 0.9))),
+        annote.fromDetection(("truck", 40.0, (0.0, 0.0, 1.0, 1.0))),
+    ]
+    annotations[0].SetEvalution(AnnoteEvaluation.TruePositive, 0.75, 90.0)
+    annotations[0].update_hsv_from_grid(np.full((20, 20, 3), 0.5))
+
+    table = AnnotationTable.fromAnnotes(annotations)
+    table = pickle.loads(pickle.dumps(table))
+    assert len(table) == 3
+
+    for item, view in zip(annotations, table):
+        assert view.classNumber == item.classNumber
+        assert view.className == item.className
+        assert view.authorType == item.authorType
+        assert view.evalution == item.evalution
+        assert np.allclose(view.box, item.box)
+        assert np.isclose(view.confidence, item.confidence)
+        assert np.isclose(view.hue, item.hue)
+        assert np.isclose(view.area, item.area)
+
+    # View : Writes go to table row
+    table[-1].SetClassNumber(1)
+    assert table[2].className == "person"
+    assert table[2].GetAuthorType() == AnnoteAuthorType.byDetector
+    assert [item.className for item in table.toAnnotes()] == ["person", "car", "person"]
+    assert table.class_numbers == {0, 1}
@@ -0,0 +1,71 @@
+"""
+Test file for the annoter module.
+"""
+
+import cv2
+import numpy as np
+
+import engine.annote as annote
+from engine.annoter import Annoter
+
+
+def WriteImage(path, seed: int) -> None:
+    """Write random image of seed."""
+    rng = np.random.default_rng(seed)
+    cv2.imwrite(str(path), rng.integers(0, 255, (64, 96, 3), dtype=np.uint8))
+
+
+def Names(files: list[dict]) -> list[str]:
+    """Returns names of file entries."""
+    return [fileEntry["Name"] for fileEntry in files]
+
+
+def test_annoter_update_files(tmp_path, monkeypatch):
+    """Changed directory files are added if included, removed and scanned
+    again, entries with changed duplicate state are updated."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    annote.Init(["car", "person"])
+    WriteImage(tmp_path / "image0.png", 0)
+    WriteImage(tmp_path / "image1.png", 1)
+    (tmp_path / "image1.txt").write_text("0 0.500000 0.500000 0.200000 0.200000\n")
+    # Duplicate : Same image content as first one
+    WriteImage(tmp_path / "image2.png", 0)
+
+    annoter = Annoter(
+        None,
+        None,
+        noDetector=True,
+        sortMethod=Annoter.SortByAlphabet,
+        isOnlyNewFiles=True,
+        detectionCache=False,
+        thumbnails=False,
+    )
+    annoter.OpenLocation(f"{tmp_path}/")
+    assert Names(annoter.files) == ["image0.png", "image2.png"]
+    assert annoter.files[1]["Visuals"].isDuplicate
+
+    # Added : Only files passing filters, annotated file is not new
+    WriteImage(tmp_path / "image3.png", 3)
+    WriteImage(tmp_path / "image4.png", 4)
+    (tmp_path / "image4.txt").write_text("1 0.500000 0.500000 0.200000 0.200000\n")
+    added, removed, updated = annoter.UpdateFiles(
+        {"image3.png", "image4.png", "image4.txt"}
+    )
+    assert (Names(added), removed, updated) == (["image3.png"], [], [])
+    assert Names(annoter.files) == ["image0.png", "image2.png", "image3.png"]
+
+    # Rescan : Changed image is scanned again
+    previous = annoter.files[2]
+    WriteImage(tmp_path / "image3.png", 5)
+    added, removed, updated = annoter.UpdateFiles({"image3.png"})
+    assert (added, removed, Names(updated)) == ([], [], ["image3.png"])
+    assert updated[0] is not previous
+    assert updated[0]["ID"] == previous["ID"]
+
+    # Removed : Duplicate of removed image is not duplicate anymore
+    (tmp_path / "image0.png").unlink()
+    added, removed, updated = annoter.UpdateFiles({"image0.png"})
+    assert (added, Names(removed)) == ([], ["image0.png"])
+    assert Names(updated) == ["image2.png"]
+    assert not updated[0]["Visuals"].isDuplicate
+    assert annoter.summary.files == 2
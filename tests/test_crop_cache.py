@@ -0,0 +1,32 @@
+"""
+Test file for the crop_cache module.
+"""
+
+import cv2
+import numpy as np
+
+from engine.crop_cache import CropCache
+
+
+def test_crop_cache_reuse(tmp_path):
+    """Crops are keyed by content, reused from disk and scaled down."""
+    imagepath = tmp_path / "image.png"
+    cv2.imwrite(str(imagepath), np.full((100, 200, 3), 128, dtype=np.uint8))
+
+    cache = CropCache(directory=str(tmp_path / "crops"))
+    data = cache.Get(str(imagepath), (10, 10, 60, 40))
+    crop = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert crop.shape == (30, 50, 3)
+    assert len(list((tmp_path / "crops").iterdir())) == 1
+
+    # Next session : Crop read from disk, source image not decoded
+    cache = CropCache(directory=str(tmp_path / "crops"))
+    assert cache.Get(str(imagepath), (10, 10, 60, 40)) == data
+    assert len(cache.images) == 0
+
+    # Thumbnail : Whole image scaled down to maximal width
+    data = cache.Get(str(imagepath), maxWidth=100)
+    thumbnail = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert thumbnail.shape == (50, 100, 3)
+    assert cache.Get(str(tmp_path / "missing.png")) is None
+    assert cache.Get(str(imagepath), (300, 300, 400, 400)) is None
@@ -0,0 +1,56 @@
+"""
+Test file for the dataset module.
+"""
+
+import time
+
+from engine.dataset import Dataset
+
+
+def test_dataset_bulk_and_coalesced_save(tmp_path):
+    """Dataset keeps order, bulk changes and saves coalesced changes."""
+    path = str(tmp_path / "validation.txt")
+    (tmp_path / "validation.txt").write_text("a.png\nb.png\n")
+
+    dataset = Dataset(save_interval=3600)
+    dataset.load(path)
+    assert len(dataset) == 2
+    assert dataset.is_inside("b.png") and not dataset.is_inside("c.png")
+
+    assert dataset.add_many(["c.png", "a.png", "d.png"]) == 2
+    assert dataset.remove_many(["b.png", "x.png"]) == 1
+    assert list(dataset) == ["a.png", "c.png", "d.png"]
+
+    # Flush : First save at once, next within interval coalesced
+    dataset.flush()
+    assert not dataset.is_not_saved()
+    dataset.remove("c.png")
+    dataset.flush()
+    assert dataset.is_not_saved()
+    assert (tmp_path / "validation.txt").read_text() == "a.png\nc.png\nd.png\n"
+
+    dataset.flush(force=True)
+    assert (tmp_path / "validation.txt").read_text() == "a.png\nd.png\n"
+
+    # Load : Replaces previous paths
+    dataset.load(str(tmp_path / "missing.txt"))
+    assert len(dataset) == 0
+
+
+def test_dataset_deferred_save(tmp_path):
+    """Change skipped by flush is saved at end of interval."""
+    path = tmp_path / "validation.txt"
+    dataset = Dataset(save_interval=0.2)
+    dataset.load(str(path))
+    dataset.add("a.png")
+    dataset.flush()
+    dataset.add("b.png")
+    dataset.flush()
+    assert path.read_text() == "a.png\n"
+
+    # Deferred : Saved without another flush
+    for _ in range(50):
+        if not dataset.is_not_saved():
+            break
+        time.sleep(0.05)
+    assert path.read_text() == "a.png\nb.png\n"
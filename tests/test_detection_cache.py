@@ -0,0 +1,49 @@
+"""
+Test file for the detection_cache module.
+"""
+
+import json
+import shutil
+import sqlite3
+
+from engine.detection_cache import DetectionCache
+
+
+def test_detection_cache_content_key(tmp_path):
+    """Detections are keyed by content, persisted and evicted by size."""
+    imagepath = tmp_path / "image.png"
+    imagepath.write_bytes(b"image")
+    shutil.copy(imagepath, tmp_path / "copy.png")
+    detections = [("car", 90.0, (0.1, 0.1, 0.2, 0.2))]
+    settings = ("model", 0.4, 0.45, "Nms", 0)
+
+    cache = DetectionCache()
+    assert cache.Open(str(tmp_path / "cache" / "detections.db"))
+    key = DetectionCache.Key(str(imagepath), *settings)
+    cache.Put(key, detections)
+    cache.Close()
+
+    # Reopened : Same content hits, other settings or content misses
+    assert cache.Open(str(tmp_path / "cache" / "detections.db"))
+    copyKey = DetectionCache.Key(str(tmp_path / "copy.png"), *settings)
+    assert cache.Get(copyKey) == detections
+    otherKey = DetectionCache.Key(str(imagepath), "model", 0.5, 0.45, "Nms", 0)
+    assert cache.Get(otherKey) is None
+    assert DetectionCache.Key(str(tmp_path / "missing.png"), *settings) is None
+    imagepath.write_bytes(b"changed")
+    assert cache.Get(DetectionCache.Key(str(imagepath), *settings)) is None
+
+    # Eviction : Least recently used are removed above maximal size
+    cache.maxSize = cache.size * 3 // 2
+    cache.Put("other", detections)
+    assert cache.Get(key) is None
+    assert cache.Get("other") == detections
+    cache.Close()
+
+    # Data only : Stored detections are JSON, not pickle
+    connection = sqlite3.connect(str(tmp_path / "cache" / "detections.db"))
+    (data,) = connection.execute(
+        "SELECT detections FROM detections WHERE key = 'other'"
+    ).fetchone()
+    connection.close()
+    assert json.loads(data) == [["car", 90.0, [0.1, 0.1, 0.2, 0.2]]]
@@ -0,0 +1,43 @@
+"""
+Test file for the detection_worker module.
+"""
+
+import threading
+
+from engine.detection_worker import DetectionWorker
+
+
+def test_detection_worker_drops_stale_requests():
+    """Only result of latest request is delivered."""
+    results = []
+    worker = DetectionWorker(callback=lambda requestID, result: results.append(result))
+    started, release = threading.Event(), threading.Event()
+
+    def slow() -> str:
+        started.set()
+        release.wait()
+        return "slow"
+
+    # Stale : Running request is superseded, queued one is replaced
+    worker.Submit(slow)
+    started.wait()
+    worker.Submit(lambda: "replaced")
+    requestID = worker.Submit(lambda: "latest")
+    assert worker.is_busy
+    release.set()
+    worker.Wait()
+    assert results == ["latest"]
+    assert worker.IsCurrent(requestID)
+
+    # Cancel : Result of cancelled request is not delivered
+    started.clear()
+    release.clear()
+    requestID = worker.Submit(slow)
+    started.wait()
+    worker.Cancel()
+    release.set()
+    worker.Wait()
+    assert results == ["latest"]
+    assert not worker.IsCurrent(requestID)
+    assert not worker.is_busy
+    worker.Close()
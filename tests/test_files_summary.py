@@ -0,0 +1,46 @@
+"""
+Test file for the files summary module.
+"""
+
+import pytest
+
+from engine.files_summary import FilesSummary
+from helpers.metrics import Metrics
+from views.ViewImagesSummary import Summary
+
+
+def FileEntry(fileID: int, isAnnotation: bool, isValidation: bool, tp: int):
+    """Returns minimal file entry."""
+    metrics = Metrics(All=10, TP=tp, FP=10 - tp, FN=1, LTP=tp)
+    return {
+        "ID": fileID,
+        "IsAnnotation": isAnnotation,
+        "IsValidation": isValidation,
+        "Metrics": metrics,
+    }
+
+
+def test_files_summary_incremental():
+    """Added, changed and removed entries match summary counted again."""
+    files = [FileEntry(i, i % 2 == 0, i % 3 == 0, i) for i in range(6)]
+    summary = FilesSummary(files)
+    assert (summary.files, summary.annotated, summary.validation) == (6, 3, 2)
+
+    # Change : Entry counted again, not added twice
+    files[1]["IsAnnotation"] = True
+    files[1]["Metrics"] = FileEntry(1, True, False, 9)["Metrics"]
+    summary.Update(files[1])
+    # Remove : Entry subtracted
+    summary.Remove(files.pop(0))
+    # Update : Not counted entry is ignored
+    summary.Update(FileEntry(99, True, True, 10))
+
+    expected = Summary()
+    for fileEntry in files:
+        expected.Add(fileEntry)
+    assert (summary.files, summary.annotated, summary.validation) == (5, 3, 1)
+    assert summary.correct == pytest.approx(expected.correct)
+    assert summary.correct_bboxes == pytest.approx(expected.correct_bboxes)
+    assert summary.precision == pytest.approx(expected.precision)
+    assert summary.recall == pytest.approx(expected.recall)
+    assert summary.new_detections == expected.new_detections
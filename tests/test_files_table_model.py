@@ -0,0 +1,96 @@
+"""
+Test file for the table models and KeysSortProxyModel.
+"""
+
+import os
+from types import SimpleNamespace
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from engine.annote import Annote
+from Gui.models.BoxesTableModel import BoxesTableModel
+from Gui.models.FilesTableModel import FilesTableModel
+from Gui.models.KeysSortProxyModel import KeysSortProxyModel
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def ProxyIDs(proxy: KeysSortProxyModel) -> list:
+    """Returns rows data (file IDs) in proxy rows order."""
+    return [proxy.index(row, 0).data(Qt.UserRole) for row in range(proxy.rowCount())]
+
+
+def test_files_table_model_sort_filter():
+    """Rows are sorted by keys, filtered and follow model changes."""
+    app = QApplication.instance() or QApplication([])
+    model = FilesTableModel()
+    proxy = KeysSortProxyModel()
+    proxy.setSourceModel(model)
+    model.SetFiles([{"ID": i, "Name": n} for i, n in enumerate(["c", "a", "b"])])
+
+    proxy.sort(0, Qt.AscendingOrder)
+    assert ProxyIDs(proxy) == [1, 2, 0]
+    model.AppendFiles([{"ID": 3, "Name": "0"}])
+    assert ProxyIDs(proxy) == [3, 1, 2, 0]
+
+    proxy.SetFilter(lambda row: model.files[row]["Name"] != "a")
+    assert ProxyIDs(proxy) == [3, 2, 0]
+    assert not proxy.mapFromSource(model.index(model.RowOfID(1), 0)).isValid()
+
+    model.RemoveFiles([{"ID": 0}])
+    model.UpdateFile({"ID": 3, "Name": "z"})
+    assert ProxyIDs(proxy) == [2, 3]
+    assert model.RowOfID(3) == 2
+
+    # Remove : Many rows in one pass, proxy is reset once
+    resets = []
+    proxy.modelReset.connect(lambda: resets.append(True))
+    model.RemoveFiles([{"ID": 2}, {"ID": 1}, {"ID": 99}])
+    assert (ProxyIDs(proxy), len(resets)) == ([3], 1)
+    assert (model.RowOfID(3), model.SortKeys(0).shape) == (0, (1,))
+    assert app is not None
+
+
+def test_boxes_table_model_rows():
+    """Box rows are merged in sorting order, filtered, removed and updated
+    by files."""
+    app = QApplication.instance() or QApplication([])
+    model = BoxesTableModel()
+    proxy = KeysSortProxyModel()
+    proxy.setSourceModel(model)
+    proxy.sort(6, Qt.DescendingOrder)
+
+    def FileEntry(fileID: int, widths: list[float]) -> dict:
+        """Returns file entry with boxes of widths."""
+        return {
+            "ID": fileID,
+            "Name": f"image{fileID}",
+            "Path": "",
+            "Visuals": SimpleNamespace(width=100, height=100),
+            "Annotations": [Annote((0, 0, w, 0.5), classNumber=0) for w in widths],
+        }
+
+    model.AppendFiles([FileEntry(0, [0.1, 0.3]), FileEntry(1, [])])
+    model.AppendFiles([FileEntry(2, [0.2, 0.4])])
+    assert model.rowCount() == 4
+    assert ProxyIDs(proxy) == [(2, 1), (0, 1), (2, 0), (0, 0)]
+
+    proxy.SetRowsFilter(model.FilesFilter(lambda fileEntry: fileEntry["ID"] != 0))
+    assert ProxyIDs(proxy) == [(2, 1), (2, 0)]
+    proxy.sort(0, Qt.AscendingOrder)
+    assert proxy.index(0, 0).data(Qt.DisplayRole) == "image2_0"
+
+    # Remove, update : Rows of removed and changed files, filter evaluated again
+    model.RemoveFiles([{"ID": 0}])
+    model.UpdateFile(FileEntry(1, [0.5]))
+    model.UpdateFile(FileEntry(2, [0.6]))
+    proxy.sort(6, Qt.DescendingOrder)
+    assert model.rowCount() == 2
+    assert ProxyIDs(proxy) == [(2, 0), (1, 0)]
+    assert [model.FileAt(row)["ID"] for row in range(2)] == [1, 2]
+    proxy.SetRowsFilter(model.FilesFilter(lambda fileEntry: fileEntry["ID"] != 1))
+    model.RemoveFiles([{"ID": 99}, {"ID": 1}])
+    assert ProxyIDs(proxy) == [(2, 0)]
+    assert model.RowItems(0)[0].text() == "image2_0"
+    assert app is not None
@@ -0,0 +1,41 @@
+"""
+Test file for the frame cache module.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+from engine.frame_cache import FrameCache
+
+
+def test_frame_cache_lru_and_changes(tmp_path):
+    """Frames are decoded once, dropped above capacity and on file change."""
+    rng = np.random.default_rng(0)
+    filepaths = []
+    for index in range(3):
+        filepath = str(tmp_path / f"image{index}.png")
+        cv2.imwrite(filepath, rng.integers(0, 255, (16, 16, 3), dtype=np.uint8))
+        filepaths.append(filepath)
+
+    cache = FrameCache(capacity=2)
+    first = cache.Read(filepaths[0])
+    assert not first.flags.writeable
+    assert cache.Read(filepaths[0]) is first
+
+    # Capacity : Least recently used frame dropped
+    cache.Read(filepaths[1])
+    cache.Read(filepaths[2])
+    assert len(cache) == 2
+    assert cache.Get(filepaths[0]) is None
+
+    # Change : Modified image file is decoded again
+    frame = cache.Read(filepaths[2])
+    cv2.imwrite(filepaths[2], np.zeros((8, 8, 3), dtype=np.uint8))
+    os.utime(filepaths[2], ns=(0, 0))
+    assert cache.Get(filepaths[2]) is None
+    assert cache.Read(filepaths[2]).shape != frame.shape
+
+    # Missing : Not readable image
+    assert cache.Read(str(tmp_path / "missing.png")) is None
@@ -0,0 +1,88 @@
+"""
+Test file for the metrics module.
+"""
+
+import numpy as np
+
+import engine.annote as annote
+from helpers import boxes, prefilters
+from helpers.metrics import EvaluateMetrics, MatchGreedy, MatchHungarian
+
+
+def EvaluateReference(annotations, detections, minConfidence=0.5, minIOU=0.5):
+    """Reference greedy matching with sorted possibilities."""
+    detections = [item for item in detections if (item.confidence > minConfidence)]
+    indexes = {id(item): index for index, item in enumerate(detections)}
+    matches, evaluations = [], []
+    for index, annotation in enumerate(annotations):
+        possibilities = sorted(
+            [(boxes.iou(annotation.box, item.box), item) for item in detections],
+            key=lambda x: x[0],
+            reverse=True,
+        )
+        if len(possibilities) and (possibilities[0][0] >= minIOU):
+            iou, detection = possibilities[0]
+            matches.append((index, indexes[id(detection)]))
+            evaluations.append((annotation.classNumber == detection.classNumber, iou))
+            detections.remove(detection)
+        else:
+            evaluations.append((None, 0))
+
+    unmatched = prefilters.filter_iou_by_confidence(detections, annotations)
+    return matches, evaluations, len(unmatched)
+
+
+def CreateAnnotations(rng, count: int) -> list:
+    """Random clustered annotations of two classes."""
+    annotations = []
+    for _ in range(count):
+        x, y = rng.integers(0, 5, 2) * 0.18 + rng.normal(0, 0.02, 2)
+        w, h = 0.15 + rng.normal(0, 0.02, 2)
+        annotations.append(
+            annote.Annote(
+                (x, y, x + w, y + h),
+                classNumber=int(rng.integers(0, 2)),
+                confidence=float(rng.uniform(0, 1)),
+            )
+        )
+
+    return annotations
+
+
+def test_evaluate_metrics_same_as_reference():
+    """Greedy matching gives same matches, evaluations and counts."""
+    annote.Init(["car", "person"])
+    rng = np.random.default_rng(0)
+    for count in (1, 3, 20, 80):
+        annotations = CreateAnnotations(rng, count)
+        detections = CreateAnnotations(rng, count + 5)
+
+        matches, evaluations, unmatched = EvaluateReference(annotations, detections)
+        metrics = EvaluateMetrics(annotations, detections)
+
+        assert [tuple(pair) for pair in metrics.matches.tolist()] == matches
+        assert [
+            (annotation.evaluation_iou, annotation.evalution)
+            for annotation in annotations
+        ] == [
+            (
+                iou,
+                annote.AnnoteEvaluation.FalseNegative
+                if isLabel is None
+                else annote.AnnoteEvaluation.TruePositiveLabel
+                if isLabel
+                else annote.AnnoteEvaluation.TruePositive,
+            )
+            for isLabel, iou in evaluations
+        ]
+        assert metrics.TP == len(matches)
+        assert metrics.FN == count - len(matches)
+        assert metrics.FP == unmatched
+
+
+def test_match_hungarian():
+    """Hungarian matching maximizes sum of IOU, greedy takes first best."""
+    ious = np.array([[0.9, 0.8], [0.85, 0.0]])
+    assert MatchGreedy(ious) == [(0, 0)]
+    assert MatchHungarian(ious) == [(0, 1), (1, 0)]
+    assert MatchGreedy(np.zeros((2, 0))) == []
@@ -0,0 +1,42 @@
+"""
+Test file for the prefetcher module.
+"""
+
+import cv2
+import numpy as np
+
+from engine.frame_cache import FrameCache
+from engine.prefetcher import Prefetcher
+
+
+def test_prefetcher_frames_and_detections(tmp_path):
+    """Prefetched frames and detections are served from memory."""
+    filepaths = []
+    for index in range(3):
+        filepath = str(tmp_path / f"image{index}.png")
+        cv2.imwrite(filepath, np.full((16, 16, 3), index, dtype=np.uint8))
+        filepaths.append(filepath)
+
+    calls = []
+
+    def detect(frame: np.ndarray, filepath: str) -> list:
+        calls.append(int(frame[0, 0, 0]))
+        return [("car", 90.0, (0.1, 0.1, 0.2, 0.2))]
+
+    frameCache = FrameCache(capacity=8)
+    prefetcher = Prefetcher(frameCache, workers=2)
+    prefetcher.Prefetch(filepaths[1:], detect=detect, detectKey="settings")
+
+    # Detections : Wait for prefetch of image, other settings are not used
+    assert prefetcher.GetDetections(filepaths[1], "settings") is not None
+    assert prefetcher.GetDetections(filepaths[2], "settings") is not None
+    assert prefetcher.GetDetections(filepaths[1], "other") is None
+    assert sorted(calls) == [1, 2]
+    assert len(frameCache) == 2
+    assert frameCache.Get(filepaths[0]) is None
+
+    # Prefetch again : Detections of same settings are not computed again
+    prefetcher.Prefetch(filepaths[1:2], detect=detect, detectKey="settings")
+    assert prefetcher.GetDetections(filepaths[1], "settings") is not None
+    prefetcher.Close()
+    assert sorted(calls) == [1, 2]
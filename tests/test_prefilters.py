@@ -0,0 +1,71 @@
+"""
+Test file for the prefilters module.
+"""
+
+import numpy as np
+
+import engine.annote as annote
+from helpers.boxes import iou
+from helpers.prefilters import filter_iou_by_confidence
+
+
+def FilterReference(annotations1, annotations2, maxIOU: float = 0.70):
+    """Reference filter with IOU of every pair."""
+    results = np.zeros([len(annotations1), len(annotations2)], dtype=np.float32)
+    for i, annote1 in enumerate(annotations1):
+        for j, annote2 in enumerate(annotations2):
+            if annote1 != annote2:
+                results[i, j] = iou(annote1.GetBox(), annote2.GetBox())
+
+    passed = []
+    for i, item in enumerate(annotations1):
+        isFiltered = False
+        for j in range(len(annotations2)):
+            if (results[i, j] >= maxIOU) and (
+                item.GetConfidence() <= annotations2[j].GetConfidence()
+            ):
+                isFiltered = True
+                annotations2[j].confidence = item.confidence
+                break
+
+        if not isFiltered:
+            passed.append(item)
+
+    return passed
+
+
+def CreateAnnotations(rng, count: int) -> list:
+    """Random clustered annotations."""
+    annotations = []
+    for _ in range(count):
+        x, y = rng.integers(0, 4, 2) * 0.2 + rng.normal(0, 0.01, 2)
+        w, h = 0.15 + rng.normal(0, 0.01, 2)
+        confidence = float(rng.choice([40.0, 60.0, 90.0, rng.uniform(0, 100)]))
+        annotations.append(
+            annote.Annote((x, y, x + w, y + h), classNumber=0, confidence=confidence)
+        )
+
+    return annotations
+
+
+def test_filter_iou_by_confidence_same_as_reference():
+    """Filter passes same annotations and writes same confidences back."""
+    annote.Init(["car"])
+    rng = np.random.default_rng(0)
+    for count in (0, 1, 5, 40, 200):
+        for isSameList in (True, False):
+            first = CreateAnnotations(rng, count)
+            other = CreateAnnotations(rng, count // 2)
+            second = first if isSameList else first[: count // 2] + other
+            confidences = [item.confidence for item in first + other]
+
+            expected = FilterReference(first, second)
+            expectedConfidences = [item.confidence for item in first + other]
+
+            # Restore : Confidences changed by reference filter
+            for item, confidence in zip(first + other, confidences):
+                item.confidence = confidence
+
+            passed = filter_iou_by_confidence(first, second)
+            assert [id(item) for item in passed] == [id(item) for item in expected]
+            assert [item.confidence for item in first + other] == expectedConfidences
@@ -0,0 +1,212 @@
+"""
+Test file for the scanner module.
+"""
+
+import pickle
+import sqlite3
+
+import cv2
+import numpy as np
+
+import engine.annote as annote
+from engine.scan_index import ScanIndex
+from engine.scanner import MarkDuplicates, Scanner, ScanMode
+from helpers.visuals import VisualsStore
+
+
+def CreateDirectory(path, count: int = 6):
+    """Create directory with images, annotations and detections."""
+    annote.Init(["car", "person"])
+    rng = np.random.default_rng(0)
+    filenames = []
+    for index in range(count):
+        filename = f"image{index}.png"
+        image = rng.integers(0, 255, (64, 96, 3), dtype=np.uint8)
+        cv2.imwrite(str(path / filename), image)
+        (path / f"image{index}.txt").write_text(
+            "0 0.500000 0.500000 0.200000 0.200000\n"
+            + "1 0.250000 0.250000 0.100000 0.100000\n"
+        )
+        (path / f"image{index}.detector").write_text(
+            "car 90.00 0.510000 0.500000 0.200000 0.200000\n"
+            + "person 40.00 0.700000 0.700000 0.100000 0.100000\n"
+        )
+        filenames.append(filename)
+
+    # Duplicate : Same image content as first one
+    cv2.imwrite(str(path / "image_copy.png"), cv2.imread(str(path / filenames[0])))
+    filenames.append("image_copy.png")
+    return filenames
+
+
+def EntrySummary(fileEntry: dict) -> tuple:
+    """Comparable summary of file entry."""
+    metrics = fileEntry["Metrics"]
+    return (
+        fileEntry["Name"],
+        fileEntry["ID"],
+        fileEntry["IsAnnotation"],
+        len(fileEntry["Annotations"]),
+        len(fileEntry["Detections"]),
+        len(fileEntry["Detections_original"]),
+        (metrics.TP, metrics.FP, metrics.FN, metrics.LTP),
+        fileEntry["Visuals"].dhash,
+        fileEntry["Visuals"].isDuplicate,
+    )
+
+
+def test_scan_parallel_same_as_serial(tmp_path):
+    """Parallel scan creates same file entries in same order."""
+    filenames = CreateDirectory(tmp_path)
+    dirpath = f"{tmp_path}/"
+
+    results = []
+    for scanner in (
+        Scanner(workers=1),
+        Scanner(workers=3, mode=ScanMode.Threads),
+        Scanner(workers=2, mode=ScanMode.Processes),
+    ):
+        files = list(scanner.Scan(dirpath, filenames))
+        MarkDuplicates(files)
+        results.append([EntrySummary(fileEntry) for fileEntry in files])
+
+    assert results[0] == results[1] == results[2]
+    assert [item[0] for item in results[0]] == filenames
+    assert results[0][-1][-1]
+
+
+def test_scan_detect_callback(tmp_path):
+    """Detector callback results are used instead of detector file."""
+    filenames = CreateDirectory(tmp_path, count=2)
+    dirpath = f"{tmp_path}/"
+
+    for scanner in (Scanner(workers=1), Scanner(workers=2, mode=ScanMode.Threads)):
+        files = list(
+            scanner.Scan(
+                dirpath,
+                filenames,
+                detect=lambda filepaths: [[] for _ in filepaths],
+                detectBatch=2,
+            )
+        )
+        assert [fileEntry["Name"] for fileEntry in files] == filenames
+        assert all(len(fileEntry["Detections_original"]) == 0 for fileEntry in files)
+
+
+def test_scan_index_reuse(tmp_path):
+    """Unchanged files are restored from index, changed are scanned again."""
+    filenames = CreateDirectory(tmp_path, count=3)
+    dirpath = f"{tmp_path}/"
+    scanner = Scanner(workers=1)
+
+    # First scan : Fill index
+    scanIndex = ScanIndex()
+    assert scanIndex.Open(dirpath, meta="test")
+    first = list(scanner.Scan(dirpath, filenames, scanIndex=scanIndex))
+    scanIndex.Close()
+
+    # Change : Remove annotations of one file
+    (tmp_path / "image1.txt").write_text("")
+
+    # Second scan : Reuse index
+    scanIndex = ScanIndex()
+    assert scanIndex.Open(dirpath, meta="test")
+    assert scanIndex.Get("image0.png", "invalid") is None
+    second = list(scanner.Scan(dirpath, filenames, scanIndex=scanIndex))
+    scanIndex.Close()
+
+    assert [EntrySummary(entry) for entry in first[2:]] == [
+        EntrySummary(entry) for entry in second[2:]
+    ]
+    assert len(first[1]["Annotations"]) == 2
+    assert len(second[1]["Annotations"]) == 0
+    for key in ("Annotations", "Detections", "Detections_original"):
+        assert np.array_equal(first[2][key].boxes, second[2][key].boxes)
+    assert np.array_equal(first[2]["Metrics"].matches, second[2]["Metrics"].matches)
+    assert np.allclose(
+        first[2]["Visuals"].numpy_grid, second[2]["Visuals"].numpy_grid
+    )
+
+    # Moved directory : Entries restored with paths of new directory
+    moved = tmp_path / "moved"
+    moved.mkdir()
+    for path in tmp_path.iterdir():
+        if path.is_file():
+            path.rename(moved / path.name)
+    dirpath = f"{moved}/"
+    scanIndex = ScanIndex()
+    assert scanIndex.Open(dirpath, meta="test")
+    third = list(scanner.Scan(dirpath, filenames, scanIndex=scanIndex))
+    signature = ScanIndex.Signature(dirpath + "image0.png", [".txt", ".detector"])
+    assert "Path" not in scanIndex.Get("image0.png", signature)
+    scanIndex.Close()
+    assert [entry["Path"] for entry in third] == [dirpath + f for f in filenames]
+    assert [entry["Name"] for entry in third] == filenames
+    assert [EntrySummary(entry) for entry in third] == [
+        EntrySummary(entry) for entry in second
+    ]
+
+    # Data only : Pickled entry is not loaded
+    connection = sqlite3.connect(dirpath + ScanIndex.filename)
+    connection.execute(
+        "UPDATE entries SET arrays = ? WHERE name = 'image2.png'",
+        (pickle.dumps(np.array([object()], dtype=object)),),
+    )
+    connection.commit()
+    connection.close()
+    scanIndex = ScanIndex()
+    assert scanIndex.Open(dirpath, meta="test")
+    for name, isLoaded in (("image0.png", True), ("image2.png", False)):
+        signature = ScanIndex.Signature(dirpath + name, [".txt", ".detector"])
+        assert (scanIndex.Get(name, signature) is not None) == isLoaded
+    scanIndex.Close()
+
+
+def test_scan_visuals_store(tmp_path):
+    """Visuals store gives same file entries as json visuals files."""
+    filenames = CreateDirectory(tmp_path, count=3)
+    dirpath = f"{tmp_path}/"
+    scanner = Scanner(workers=2, mode=ScanMode.Processes)
+
+    expected = list(Scanner(workers=1).Scan(dirpath, filenames))
+    MarkDuplicates(expected)
+
+    visualsStore = VisualsStore()
+    for _ in range(2):
+        visualsStore.Open(dirpath)
+        files = list(scanner.Scan(dirpath, filenames, visualsStore=visualsStore))
+        visualsStore.Close()
+        MarkDuplicates(files)
+        assert [EntrySummary(entry) for entry in files] == [
+            EntrySummary(entry) for entry in expected
+        ]
+
+
+def test_scan_entry_without_annote_objects(tmp_path):
+    """Scanned file entry keeps arrays and scalars, no Annote objects."""
+    filenames = CreateDirectory(tmp_path, count=1)
+    fileEntry = next(Scanner(workers=1).Scan(f"{tmp_path}/", filenames))
+    assert fileEntry["Metrics"].TP == 1
+
+    def Referenced(value, seen: set) -> list:
+        """Returns objects referenced from value, recursively."""
+        if id(value) in seen:
+            return []
+        seen.add(id(value))
+        if isinstance(value, dict):
+            children = list(value.values())
+        elif isinstance(value, (list, tuple, set)):
+            children = list(value)
+        elif hasattr(value, "__dict__") or hasattr(value, "__slots__"):
+            children = list(getattr(value, "__dict__", {}).values())
+            for slot in getattr(type(value), "__slots__", ()):
+                children.append(getattr(value, slot, None))
+        else:
+            children = []
+
+        return [value] + [
+            item for child in children for item in Referenced(child, seen)
+        ]
+
+    referenced = Referenced(fileEntry, set())
+    assert not any(isinstance(item, annote.Annote) for item in referenced)
@@ -0,0 +1,63 @@
+"""
+Test file for the textAnnotations module.
+"""
+
+import numpy as np
+
+import helpers.boxes as boxes
+from helpers.textAnnotations import (
+    ReadAnnotations,
+    ReadDetections,
+    ReadManyAnnotationsArrays,
+    ReadManyDetectionsArrays,
+    ToDetections,
+)
+
+
+def test_read_many_annotations(tmp_path):
+    """Bulk reader gives same boxes as Bbox2Rect, tolerates whitespace."""
+    (tmp_path / "a.txt").write_text(
+        "0 0.500000 0.500000 0.200000 0.200000 \n\n1 0.3 0.4 0.1 0.2\n  \n"
+    )
+    (tmp_path / "b.txt").write_text("")
+    (tmp_path / "c.txt").write_text("1 0.1 0.1 0.1 0.1 extra\n0 0.2\n")
+    (tmp_path / "a.detector").write_text(
+        "car 90.00 0.5 0.5 0.2 0.2\nperson 40.0 0.3 0.4 0.1 0.2"
+    )
+    imagepaths = [str(tmp_path / name) for name in ("a.png", "b.png", "c.png", "x.png")]
+
+    for workers in (1, 3):
+        arrays = ReadManyAnnotationsArrays(imagepaths, workers=workers)
+        classes, rects = arrays[0]
+        assert classes.tolist() == [0, 1]
+        assert np.array_equal(rects[1], boxes.Bbox2Rect((0.3, 0.4, 0.1, 0.2)))
+        assert len(arrays[1][0]) == 0
+        assert arrays[2][0].tolist() == [1]
+        assert arrays[3] is None
+
+    detections = ReadManyDetectionsArrays(imagepaths, extension=".detector")
+    assert ToDetections(detections[0]) == ReadDetections(imagepaths[0], ".detector")
+    assert [name for name, _, _ in ToDetections(detections[0])] == ["car", "person"]
+    assert detections[1] is None
+    box = boxes.Bbox2Rect((0.5, 0.5, 0.2, 0.2))
+    assert ReadAnnotations(imagepaths[0])[0] == (0, box)
+
+
+def test_read_many_annotations_invalid_lines(tmp_path):
+    """Invalid lines are dropped per line, other files are parsed."""
+    # Shifted : Extra token and too short line, same tokens total
+    (tmp_path / "a.txt").write_text("0 .1 .2 .3 .4 .5\n0 .1 .2 .3\n1 .5 .5 .2 .2\n")
+    (tmp_path / "b.txt").write_text("1 .5 .5 .2 .2\nx .1 .1 .1 .1\n0 .3 .3 .1 .1")
+    (tmp_path / "c.txt").write_text("0 .5 .5 .2 .2\n")
+    # Class numbers : Not integer or out of int16 range, not cast
+    (tmp_path / "d.txt").write_text(
+        "1.7 .5 .5 .2 .2\n40000 .5 .5 .2 .2\n2 .1 .1 .1 .1\n"
+    )
+    imagepaths = [str(tmp_path / n) for n in ("a.png", "b.png", "c.png", "d.png")]
+
+    arrays = ReadManyAnnotationsArrays(imagepaths)
+    assert arrays[0][0].tolist() == [0, 1]
+    assert np.array_equal(arrays[0][1][1], boxes.Bbox2Rect((0.5, 0.5, 0.2, 0.2)))
+    assert arrays[1][0].tolist() == [1, 0]
+    assert arrays[2][0].tolist() == [0]
+    assert arrays[3][0].tolist() == [2]
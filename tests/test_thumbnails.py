@@ -0,0 +1,48 @@
+"""
+Test file for the thumbnails module.
+"""
+
+import io
+import os
+
+import numpy as np
+from PIL import Image
+
+from engine.thumbnails import ThumbnailGenerator, ThumbnailLevels, ThumbnailStore
+
+
+def test_thumbnails_pyramid(tmp_path, monkeypatch):
+    """Thumbnails of all levels are generated, stored and keyed by mtime."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    imagepath = str(tmp_path / "image.jpg")
+    Image.fromarray(np.zeros((600, 1000, 3), dtype=np.uint8)).save(imagepath)
+    dirpath = str(tmp_path) + "/"
+
+    store = ThumbnailStore()
+    assert store.Open(dirpath)
+    generated = []
+    generator = ThumbnailGenerator(store, callback=generated.append)
+    generator.Generate([imagepath, str(tmp_path / "missing.jpg")])
+    generator.Prioritize([imagepath])
+    generator.Wait()
+    generator.Close()
+    store.Close()
+    assert generated == [imagepath]
+    # Pack : In cache directory, images directory not changed
+    assert os.path.isfile(ThumbnailStore.GetPath(dirpath))
+    assert sorted(os.listdir(tmp_path)) == ["cache", "image.jpg"]
+
+    # Reopened : Levels sizes, longer side scaled down
+    assert store.Open(dirpath)
+    assert store.IsValid(imagepath)
+    for level in ThumbnailLevels:
+        with Image.open(io.BytesIO(store.Get(imagepath, level))) as thumbnail:
+            assert max(thumbnail.size) == level
+
+    # Image changed : Thumbnails not valid, pruned when image removed
+    os.utime(imagepath, ns=(0, 0))
+    assert store.Get(imagepath, ThumbnailLevels[0]) is None
+    store.Prune([])
+    os.utime(imagepath)
+    assert not store.IsValid(imagepath)
+    store.Close()
@@ -0,0 +1,157 @@
+"""
+Test file for the visuals module.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+from helpers.hamming_index import HammingIndex
+from helpers.visuals import Visuals, VisualsDuplicates, VisualsStore
+
+
+def test_visuals_grid_reduced_jpeg(tmp_path):
+    """Reduced JPEG decoding keeps original size and grid of mean HSV."""
+    # Image : Blocks of colors, 1280x960 decoded with reduction
+    image = np.zeros((960, 1280, 3), dtype=np.uint8)
+    image[:480, :640] = (255, 0, 0)
+    image[:480, 640:] = (0, 255, 0)
+    image[480:, :640] = (0, 0, 255)
+    image[480:, 640:] = (200, 200, 200)
+    imagepath = str(tmp_path / "image.jpg")
+    cv2.imwrite(imagepath, image, [cv2.IMWRITE_JPEG_QUALITY, 100])
+
+    visuals = Visuals.Create(imagepath)
+    grid = visuals.numpy_grid
+
+    # Reference : Mean HSV of every grid part of full image
+    image_hsv = cv2.cvtColor(cv2.imread(imagepath), cv2.COLOR_BGR2HSV)
+    reference = image_hsv.reshape(20, 48, 20, 64, 3).mean(axis=(1, 3))
+
+    assert (visuals.width, visuals.height) == (1280, 960)
+    assert len(visuals.grid) == 400
+    assert np.abs(grid - reference).max() < 5.0
+
+
+def test_visuals_store_migrate_reopen(tmp_path):
+    """Json visuals are migrated to store and read back as store views."""
+    rng = np.random.default_rng(0)
+    imagepaths = []
+    for index in range(3):
+        imagepath = str(tmp_path / f"image{index}.png")
+        cv2.imwrite(imagepath, rng.integers(0, 255, (60, 80, 3), dtype=np.uint8))
+        imagepaths.append(imagepath)
+
+    # Json : Visuals of first image saved as json file
+    Visuals.LoadCreate(imagepaths[0])
+    assert (tmp_path / "image0.visuals.json").exists()
+
+    # Store : Migrate json, create rest without json files
+    store = VisualsStore()
+    store.Open(f"{tmp_path}/")
+    created = [Visuals.LoadCreate(imagepath, store=store) for imagepath in imagepaths]
+    store.Close()
+    assert not (tmp_path / "image1.visuals.json").exists()
+
+    # Reopen : Same visuals, grids are views of memory mapped store
+    store.Open(f"{tmp_path}/")
+    for imagepath, visuals in zip(imagepaths, created):
+        loaded = store.Get(imagepath)
+        assert isinstance(loaded.grid.base, np.memmap)
+        assert (loaded.width, loaded.height) == (80, 60)
+        assert loaded.dhash == visuals.dhash
+        assert np.allclose(loaded.numpy_grid, visuals.numpy_grid)
+
+    # Prune : Removed image is not stored after rewrite
+    store.Prune(["image0.png", "image2.png"])
+    store.Close()
+    store.Open(f"{tmp_path}/")
+    assert store.Get(imagepaths[1]) is None
+    assert store.Get(imagepaths[2]).dhash == created[2].dhash
+    store.Close()
+
+
+def test_visuals_store_append(tmp_path):
+    """New visuals are appended to store file, not rewritten."""
+    rng = np.random.default_rng(0)
+    imagepaths = []
+    for index in range(4):
+        imagepath = str(tmp_path / f"image{index}.png")
+        cv2.imwrite(imagepath, rng.integers(0, 255, (60, 80, 3), dtype=np.uint8))
+        imagepaths.append(imagepath)
+
+    store = VisualsStore()
+    store.Open(f"{tmp_path}/")
+    created = [Visuals.LoadCreate(path, store=store) for path in imagepaths[:3]]
+    store.Close()
+    inode = os.stat(tmp_path / ".yaya.visuals.npy").st_ino
+
+    # Append : New image and changed stored one, same grids file
+    store.Open(f"{tmp_path}/")
+    created.append(Visuals.LoadCreate(imagepaths[3], store=store))
+    changed = Visuals.Create(imagepaths[0])
+    changed.grid = np.zeros((20, 20, 3), dtype=np.float32)
+    store.Put(changed)
+    store.Close()
+    assert os.stat(tmp_path / ".yaya.visuals.npy").st_ino == inode
+
+    store.Open(f"{tmp_path}/")
+    for imagepath, visuals in zip(imagepaths[1:], created[1:]):
+        assert np.allclose(store.Get(imagepath).numpy_grid, visuals.numpy_grid)
+    assert not store.Get(imagepaths[0]).numpy_grid.any()
+    store.Close()
+
+
+def test_visuals_near_duplicates(tmp_path):
+    """Re-encoded and resized copies are clustered with original image."""
+    rng = np.random.default_rng(0)
+    image = cv2.resize(
+        rng.integers(0, 255, (12, 16, 3), dtype=np.uint8),
+        (320, 240),
+        interpolation=cv2.INTER_LINEAR,
+    )
+    other = cv2.resize(
+        rng.integers(0, 255, (12, 16, 3), dtype=np.uint8),
+        (320, 240),
+        interpolation=cv2.INTER_LINEAR,
+    )
+    copies = {
+        "image.png": image,
+        "other.png": other,
+        "image_q.jpg": image,
+        "image_r.png": cv2.resize(image, (256, 192), interpolation=cv2.INTER_AREA),
+    }
+
+    duplicates = VisualsDuplicates()
+    found = {}
+    for filename, content in copies.items():
+        imagepath = str(tmp_path / filename)
+        cv2.imwrite(imagepath, content, [cv2.IMWRITE_JPEG_QUALITY, 70])
+        visuals = Visuals.Create(imagepath)
+        visuals.isDuplicate = duplicates.Add(visuals)
+        found[filename] = visuals
+
+    assert [visuals.isDuplicate for visuals in found.values()] == [
+        False,
+        False,
+        True,
+        True,
+    ]
+    assert found["image.png"].duplicateGroup == found["image_r.png"].duplicateGroup == 0
+    assert found["other.png"].duplicateGroup == -1
+
+
+def test_hamming_index_query():
+    """Index returns same hashes as brute force search."""
+    rng = np.random.default_rng(0)
+    hashes = rng.integers(0, 1 << 36, 5000, dtype=np.uint64)
+    index = HammingIndex(bits=36, maxDistance=3)
+    for value in hashes.tolist():
+        index.Add(value)
+
+    for value in hashes[:20].tolist():
+        query = value ^ 0b1001
+        distances = [bin(query ^ other).count("1") for other in hashes.tolist()]
+        expected = [(i, d) for i, d in enumerate(distances) if d <= 3]
+        assert sorted(index.Query(query)) == expected
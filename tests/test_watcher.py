@@ -0,0 +1,26 @@
+"""
+Test file for the watcher module.
+"""
+
+from engine.watcher import DirectoryWatcher
+
+
+def test_watcher_changes(tmp_path):
+    """Watcher reports added, modified and removed files."""
+    (tmp_path / "image.txt").write_text("0 0.5 0.5 0.2 0.2\n")
+    (tmp_path / "removed.txt").write_text("")
+
+    watcher = DirectoryWatcher(f"{tmp_path}/", poll_interval=0)
+    watcher.Start()
+    assert watcher.Poll() == set()
+
+    (tmp_path / "image.txt").write_text("1 0.5 0.5 0.2 0.2\n")
+    (tmp_path / "added.png").write_bytes(b"")
+    (tmp_path / "removed.txt").unlink()
+    assert watcher.Poll() == {"image.txt", "added.png", "removed.txt"}
+
+    # Own files : Index and its journal are not changes
+    (tmp_path / ".yaya.index").write_bytes(b"index")
+    (tmp_path / ".yaya.index-wal").write_bytes(b"")
+    assert watcher.Poll() == set()
+    watcher.Stop()
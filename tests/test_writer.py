@@ -0,0 +1,36 @@
+"""
+Test file for the writer module.
+"""
+
+import os
+
+from helpers.textAnnotations import ReadAnnotationsArrays, SaveAnnotations
+from helpers.writer import BufferedWriter, WriteAtomic
+
+
+def test_buffered_writer(tmp_path):
+    """Queued writes are readable at once and written after flush."""
+    writer = BufferedWriter(interval=10.0)
+    imagepath = str(tmp_path / "image.png")
+    path = str(tmp_path / "image.txt")
+
+    SaveAnnotations(imagepath, [(0, (0.1, 0.1, 0.3, 0.3))], writer=writer)
+    SaveAnnotations(imagepath, [(1, (0.1, 0.1, 0.3, 0.3))], writer=writer)
+    assert ReadAnnotationsArrays(imagepath, writer=writer)[0].tolist() == [1]
+
+    # Flush : Barrier, last data is written without temporary files
+    writer.Flush()
+    assert len(writer) == 0
+    assert ReadAnnotationsArrays(imagepath)[0].tolist() == [1]
+    assert sorted(os.listdir(tmp_path)) == ["image.txt"]
+
+    # Discard : Queued write is dropped
+    writer.Write(path, "")
+    writer.Discard(path)
+    writer.Close()
+    assert ReadAnnotationsArrays(imagepath)[0].tolist() == [1]
+
+    # Closed : Writes in calling thread
+    writer.Write(path, "")
+    assert os.path.getsize(path) == 0
+    assert WriteAtomic(str(tmp_path / "missing" / "file.txt"), "") is False
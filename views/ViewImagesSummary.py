@@ -85,6 +85,11 @@ class ViewImagesSummary:
         for fileEntry in files:
             summary.Add(fileEntry)
 
+        ViewImagesSummary.ViewSummary(label, summary)
+
+    @staticmethod
+    def ViewSummary(label: QLabel, summary: Summary):
+        ''' View already created summary.'''
         # View files summary.
         text = ''
         text += f'Avg correctness is **{summary.correct:2.2f}%** (only boxes {summary.correct_bboxes:2.2f}%).\n'
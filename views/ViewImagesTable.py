@@ -1,49 +1,47 @@
 """
-    View of images QTableWidget.
+    View of images QTableView.
 """
 
 from PyQt5 import QtCore
-from PyQt5.QtWidgets import QTableWidget
-from tqdm import tqdm
+from PyQt5.QtWidgets import QHeaderView, QTableView
 
-from views.ViewImagesTableRow import ViewImagesTableRow
+from Gui.models.FilesTableModel import FilesTableModel
+from Gui.models.KeysSortProxyModel import KeysSortProxyModel
 
 
 class ViewImagesTable:
 
     @staticmethod
-    def View(
-        table: QTableWidget,
-        files: list,
-    ):
-        """View images in table."""
-        # Check : Files, correct None
-        if files is None:
-            files = []
-
-        # Get translations
-        _translate = QtCore.QCoreApplication.translate
-
-        # Update GUI data
-        table.clear()
-        labels = _translate(
-            "ViewImagesTable",
-            "Name;ImSize;Annotated;Validation;Correct;Classes;Time;Hue;Saturation;Brightness;ImHash;"
-            + "Size;New dets;CorrectBbox;Precision;Recall;Errors;"
-            + "Match.Confidence;Det.WorstConfidence",
-        ).split(";")
-        table.setSortingEnabled(False)
-        table.setColumnCount(len(labels))
-        table.setHorizontalHeaderLabels(labels)
-        table.setRowCount(len(files))
-
-        # Rows : View each row in a loop
-        for rowIndex, fileEntry in enumerate(tqdm(files, desc="Table view creation")):
-            ViewImagesTableRow.View(table, rowIndex, fileEntry)
-
-        # GUI - Enable sorting again
-        table.setIconSize(QtCore.QSize(96, 59))
-        table.setColumnWidth(0, 100)
+    def Setup(table: QTableView, model: FilesTableModel) -> KeysSortProxyModel:
+        """Setup table view of files model, returns sorting proxy."""
+        proxy = KeysSortProxyModel(table)
+        proxy.setSourceModel(model)
+        table.setModel(proxy)
+
+        # Rows : Fixed height, not measured for every row
+        header = table.verticalHeader()
+        header.setSectionResizeMode(QHeaderView.Fixed)
+        header.setDefaultSectionSize(44)
+        # Columns : Resized to contents of first rows, not all rows
+        table.horizontalHeader().setResizeContentsPrecision(128)
         table.setSortingEnabled(True)
+        return proxy
+
+    @staticmethod
+    def Resize(table: QTableView):
+        """Resize columns to contents of shown rows."""
+        table.setIconSize(QtCore.QSize(96, 59))
         table.resizeColumnsToContents()
-        table.resizeRowsToContents()
+
+    @staticmethod
+    def VisibleRows(table: QTableView) -> range:
+        """Returns rows visible in table viewport."""
+        first = table.rowAt(0)
+        if first < 0:
+            return range(0)
+
+        last = table.rowAt(table.viewport().height() - 1)
+        if last < 0:
+            last = table.model().rowCount() - 1
+
+        return range(first, last + 1)
@@ -8,6 +8,7 @@ import engine.annote as annote
 from Detectors import CreateDetector, GetDetectorLabels, ListDetectors
 from Detectors.common.Detector import Detector
 from engine.annoter import Annoter
+from engine.scanner import ScanMode
 from helpers.files import FixPath, GetFileLocation
 from MainWindow import MainWindowGui
 
@@ -54,6 +55,16 @@ def main():
         required=False,
         help="Detector default NMS threshold",
     )
+    parser.add_argument(
+        "-db",
+        "--detectorBatch",
+        type=int,
+        nargs="?",
+        const=8,
+        default=1,
+        required=False,
+        help="Detector batch size for forced detector processing - default 1",
+    )
     parser.add_argument(
         "-nd",
         "--noDetector",
@@ -75,6 +86,65 @@ def main():
         required=False,
         help="Force detector for every file.",
     )
+    parser.add_argument(
+        "-sw",
+        "--scanWorkers",
+        type=int,
+        nargs="?",
+        const=os.cpu_count(),
+        default=1,
+        required=False,
+        help="Number of workers scanning directory files - default 1 (serial)",
+    )
+    parser.add_argument(
+        "-st",
+        "--scanThreads",
+        action="store_true",
+        required=False,
+        help="Scan directory files with threads instead of processes.",
+    )
+    parser.add_argument(
+        "-ni",
+        "--noScanIndex",
+        action="store_true",
+        required=False,
+        help="Disable persistent scan index of directory files.",
+    )
+    parser.add_argument(
+        "-ndc",
+        "--noDetectionCache",
+        action="store_true",
+        required=False,
+        help="Disable persistent cache of detector results.",
+    )
+    parser.add_argument(
+        "-nth",
+        "--noThumbnails",
+        action="store_true",
+        required=False,
+        help="Disable persistent thumbnails of directory images.",
+    )
+    parser.add_argument(
+        "-vs",
+        "--visualsStore",
+        action="store_true",
+        required=False,
+        help="Store visuals of directory in single columnar file, not json per image.",
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        required=False,
+        help="Watch opened directory and update changed files.",
+    )
+    parser.add_argument(
+        "-p",
+        "--progressive",
+        action="store_true",
+        required=False,
+        help="Load directory files in background and view them as they arrive.",
+    )
     parser.add_argument(
         "-v",
         "--verbose",
@@ -120,7 +190,9 @@ def main():
     # Check : Detectors exists
     elif noDetector is False:
         scriptPath = os.path.dirname(os.path.realpath(__file__))
-        detector = CreateDetector(args.detector, path=scriptPath)
+        detector = CreateDetector(
+            args.detector, path=scriptPath, batchSize=args.detectorBatch
+        )
         if detector is None:
             logging.error("Wrong detector!")
             return
@@ -145,6 +217,12 @@ def main():
         forceDetector=forceDetector,
         detectorConfidence=args.detectorConfidence,
         detectorNms=args.detectorNms,
+        scanWorkers=args.scanWorkers,
+        scanMode=ScanMode.Threads if args.scanThreads else ScanMode.Processes,
+        scanIndex=not args.noScanIndex,
+        visualsStore=args.visualsStore,
+        detectionCache=not args.noDetectionCache,
+        thumbnails=not args.noThumbnails,
     )
 
     # Start QtGui
@@ -30,6 +30,8 @@ parser.add_argument('-on', '--onlyNewFiles', action='store_true',
                     required=False, help='Process only files without detections file.')
 parser.add_argument('-sh', '--showcase', action='store_true',
                     required=False, help='Creates visual showcase report')
+parser.add_argument('-w', '--workers', type=int, nargs='?', const=8, default=1,
+                    required=False, help='Number of concurrent annotations files readers (network storage).')
 parser.add_argument('-v', '--verbose', action='store_true',
                     required=False, help='Show verbose finded and processed data')
 args = parser.parse_args()
@@ -12,8 +12,8 @@ from helpers.files import FixPath, GetExtension, GetFileLocation, GetFilename
 import matplotlib.pyplot as plt
 import matplotlib
 from PIL import Image
-from helpers.textAnnotations import ReadAnnotations, SaveAnnotations,\
-    IsExistsImage, GetImageFilepath
+from helpers.textAnnotations import ReadManyAnnotationsArrays, SaveAnnotations,\
+    ToAnnotations, IsExistsImage, GetImageFilepath
 from Decorators.DecoratorDistributionShowcase import DecoratorDistributionShowcase
 from helpers.boxes import GetWidth, GetHeight
 
@@ -46,6 +46,8 @@ class Distribution:
         self.isShowcase = args.showcase
         # Excluded files
         self.excluded = ['dataset.txt', 'train.txt']
+        # Number of concurrent annotations files readers
+        self.workers = args.workers
         # Statistics dataframe of all annotations
         self.distribution = {
             'Directory': [],
@@ -69,59 +71,63 @@ class Distribution:
     def Process(self, dirpath):
         ''' Process files list.'''
         dirpath = FixPath(dirpath)
+        # Annotations files of directory
+        filepaths = [filepath for filepath in os.listdir(dirpath)
+                     if (filepath not in self.excluded) and (GetExtension(filepath) == '.txt')]
+        # Read all annotations files at once
+        arrays = ReadManyAnnotationsArrays([dirpath+filepath for filepath in filepaths],
+                                           workers=self.workers)
         # For every file
-        for filepath in os.listdir(dirpath):
-            # Check if annotation's
-            if (filepath not in self.excluded) and (GetExtension(filepath) == '.txt'):
-                # Open annotations files
-                annotations = ReadAnnotations(dirpath+filepath)
-
-                # Correct all annotations
-                correctedAnnotations = [self.__CorrectAnnotationRect(
-                    entry) for entry in annotations]
-
-                # Delete all annotations with class `number`
-                if (self.delete is not None):
-                    correctedAnnotations = [
-                        entry for entry in correctedAnnotations if (entry[0] != self.delete)]
-
-                # Rename annotations if enabled
-                correctedAnnotations = [self.__RenameAnnotation(
-                    entry) for entry in correctedAnnotations]
-
-                # If annotaions were wrong then correct file
-                if (annotations != correctedAnnotations):
-                    annotations = correctedAnnotations
-                    SaveAnnotations(dirpath+filepath, annotations)
-                # Add annotations to distribution
-                for entry in annotations:
-                    self.AddAnnotationToDistribution(dirpath, filepath, entry)
-
-                # TODO verify annotations
-
-                # Do extra verify of images
-                if (self.verifyImages is True):
-                    # If exists image
-                    if (IsExistsImage(dirpath+filepath) is True):
-                        path = GetImageFilepath(dirpath+filepath)
-
-                        # Check file size
-                        if (os.stat(path).st_size == 0):
-                            logging.error('Image %s size equal to zero!', path)
-                        else:
+        for filepath, fileArrays in zip(filepaths, arrays):
+            # Open annotations files
+            annotations = ToAnnotations(fileArrays)
+
+            # Correct all annotations
+            correctedAnnotations = [self.__CorrectAnnotationRect(
+                entry) for entry in annotations]
+
+            # Delete all annotations with class `number`
+            if (self.delete is not None):
+                correctedAnnotations = [
+                    entry for entry in correctedAnnotations if (entry[0] != self.delete)]
+
+            # Rename annotations if enabled
+            correctedAnnotations = [self.__RenameAnnotation(
+                entry) for entry in correctedAnnotations]
+
+            # If annotaions were wrong then correct file
+            if (annotations != correctedAnnotations):
+                annotations = correctedAnnotations
+                SaveAnnotations(dirpath+filepath, annotations)
+            # Add annotations to distribution
+            for entry in annotations:
+                self.AddAnnotationToDistribution(dirpath, filepath, entry)
+
+            # TODO verify annotations
+
+            # Do extra verify of images
+            if (self.verifyImages is True):
+                # If exists image
+                if (IsExistsImage(dirpath+filepath) is True):
+                    path = GetImageFilepath(dirpath+filepath)
+
+                    # Check file size
+                    if (os.stat(path).st_size == 0):
+                        logging.error('Image %s size equal to zero!', path)
+                    else:
+                        try:
+                            # Check if image is readable
+                            v_image = Image.open(path)
                             try:
-                                # Check if image is readable
-                                v_image = Image.open(path)
-                                try:
-                                    # Check internal content
-                                    v_image.verify()
-                                except:
-                                    logging.error('Image %s damaged!', path)
+                                # Check internal content
+                                v_image.verify()
                             except:
-                                logging.error('Image %s not openable!', path)
-                    else:
-                        logging.error(
-                            'Not existing image for %s.', dirpath+filepath)
+                                logging.error('Image %s damaged!', path)
+                        except:
+                            logging.error('Image %s not openable!', path)
+                else:
+                    logging.error(
+                        'Not existing image for %s.', dirpath+filepath)
 
         logging.info('(Distribution) Processed distribution. Found:')
         logging.info(self.labels)